@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from rebrand import RECIPE_PATH, RebrandingTool, load_recipe, run_rebrand
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Bump when the shape of the JSON report changes
+RESULT_VERSION = 1
+
+SECTIONS = ['devops', 'kubernetes', 'linux', 'career', 'airflow', 'ansible']
+TOKEN = 'emerald'
+
+MDX_PAGE = """export const metadata = {{
+  title: 'Article {n}',
+  description: 'Synthetic article {n} for rebrand benchmarks.',
+}}
+
+# Article {n}
+
+{paragraphs}
+
+<Aside>
+  Generated aside {n}.
+</Aside>
+
+// generated: {n}
+"""
+
+JSX_COMPONENT = """import clsx from 'clsx'
+
+{marker}
+export function Component{n}() {{
+  return (
+    <div className="{color}">
+      <span>Component {n}</span>
+    </div>
+  )
+}}
+{marker_end}
+// generated: {n}
+"""
+
+def _paragraphs(rng, with_token):
+    words = ['kubernetes', 'cluster', 'deploy', 'pipeline', 'linux', 'kernel', 'network', 'storage']
+    paragraphs = []
+    for _ in range(rng.randint(3, 8)):
+        sentence = ' '.join(rng.choice(words) for _ in range(rng.randint(40, 80)))
+        if with_token and rng.random() < 0.5:
+            sentence += f' text-{TOKEN}-500'
+        paragraphs.append(sentence.capitalize() + '.')
+    if with_token:
+        paragraphs.append(f'<p className="text-{TOKEN}-400">Highlighted</p>')
+    return '\n\n'.join(paragraphs)
+
+def generate_tree(root, files, density, seed=0):
+    # ~70% MDX articles, the rest components; `density` of them carry the token
+    rng = random.Random(seed)
+    components = []
+    for n in range(files):
+        with_token = rng.random() < density
+        if n % 10 < 7:
+            section = SECTIONS[n % len(SECTIONS)]
+            path = os.path.join(root, 'src', 'app', section, f'article_{n}', 'page.mdx')
+            content = MDX_PAGE.format(n=n, paragraphs=_paragraphs(rng, with_token))
+        else:
+            path = os.path.join(root, 'src', 'components', f'Component{n}.jsx')
+            content = JSX_COMPONENT.format(
+                n=n,
+                color=f'text-{TOKEN}-500' if with_token else 'text-zinc-500',
+                marker='{/* block-start */}',
+                marker_end='{/* block-end */}',
+            )
+            components.append(os.path.relpath(path, root))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return components
+
+def seed_recipe_targets(root):
+    # Copy the files the recipe edits so run_rebrand has real targets
+    for step in load_recipe(RECIPE_PATH).steps:
+        for op in step.ops:
+            if op.path is None or op.kind == 'delete_path':
+                continue
+            src = os.path.join(REPO_ROOT, op.path)
+            if os.path.isfile(src):
+                dst = os.path.join(root, op.path)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                shutil.copyfile(src, dst)
+
+def _time(func):
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+def benchmarks(jobs):
+    def per_component(method, *args):
+        def run(tree, components):
+            tool = RebrandingTool(tree)
+            for file_path in components:
+                getattr(tool, method)(file_path, *args)
+        return run
+
+    def global_replace(mode_jobs):
+        return lambda tree, components: RebrandingTool(tree, jobs=mode_jobs).replace_global(TOKEN, 'red')
+
+    def full_run(mode_jobs):
+        return lambda tree, components: run_rebrand(tree, jobs=mode_jobs, incremental=True)
+
+    # (name, mode, untimed setup or None, timed benchmark)
+    return [
+        ('replace_global', 'sequential', None, global_replace(1)),
+        ('replace_global', f'parallel-{jobs}', None, global_replace(jobs)),
+        ('replace_in_file', 'sequential', None, per_component(
+            'replace_in_file', r'export function (\w+)\(\) \{[\s\S]*?\n\}',
+            'export function Replaced() {\n  return null\n}')),
+        ('delete_line', 'sequential', None, per_component('delete_line', r'^// generated')),
+        ('delete_block', 'sequential', None, per_component('delete_block', '{/* block-start */}', '{/* block-end */}')),
+        ('comment_block', 'sequential', None, per_component('comment_block', '<div', '</div>')),
+        ('run_rebrand', 'cold', None, full_run(1)),
+        ('run_rebrand', f'cold-parallel-{jobs}', None, full_run(jobs)),
+        # Second run over an already rebranded tree, which the manifest should make cheap
+        ('run_rebrand', 'incremental', full_run(1), full_run(1)),
+    ]
+
+def run_benchmarks(sizes, density, repeat, jobs, only=None, seed=0):
+    results = []
+    work = tempfile.mkdtemp(prefix='rebrand-bench-')
+    try:
+        for files in sizes:
+            base = os.path.join(work, f'base-{files}')
+            components = generate_tree(base, files, density, seed)
+            seed_recipe_targets(base)
+            for name, mode, setup, bench in benchmarks(jobs):
+                if only and name not in only:
+                    continue
+                timings = []
+                for _ in range(repeat):
+                    tree = os.path.join(work, 'tree')
+                    shutil.rmtree(tree, ignore_errors=True)
+                    shutil.copytree(base, tree)
+                    if setup is not None:
+                        _time(lambda: setup(tree, components))
+                    timings.append(_time(lambda: bench(tree, components)))
+                result = {
+                    'name': name,
+                    'mode': mode,
+                    'files': files,
+                    'density': density,
+                    'repeat': repeat,
+                    'min_s': round(min(timings), 6),
+                    'mean_s': round(sum(timings) / len(timings), 6),
+                }
+                results.append(result)
+                print(f"{name:<16} {mode:<20} {files:>7} files  "
+                      f"min {result['min_s'] * 1000:9.1f}ms  mean {result['mean_s'] * 1000:9.1f}ms",
+                      file=sys.stderr)
+            shutil.rmtree(base)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark RebrandingTool operations on synthetic trees.')
+    parser.add_argument('--files', type=int, nargs='+', default=[1000], help='tree sizes to generate (default: 1000)')
+    parser.add_argument('--density', type=float, default=0.1, help='fraction of files containing the brand token')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark; min and mean are reported')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='workers for the parallel modes')
+    parser.add_argument('--only', nargs='+', help='benchmark names to run')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.files, args.density, args.repeat, args.jobs, args.only, args.seed)
+    report = {
+        'version': RESULT_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True) + '\n'
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# Deploy manifest for the static export. Every file in out/ is hashed on a
+# process pool and compared with the manifest of the previous deploy, giving
+# the added, changed and removed paths that an upload or a CDN invalidation
+# actually needs to touch. The new manifest is written to a pending file and
+# only replaces the previous one on `--commit`, run once the upload has
+# succeeded, so a failed or skipped upload is listed again next time.
+import argparse
+import errno
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fsutil import Scanner, replacing
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Outside out/ so they survive the next build wiping it: the manifest of the
+# last deploy, and the one computed for the deploy in progress
+MANIFEST_PATH = os.path.join(REPO_ROOT, '.rebrand', 'deploy', 'manifest.json')
+PENDING_PATH = os.path.join(REPO_ROOT, '.rebrand', 'deploy', 'pending.json')
+
+MANIFEST_VERSION = 1
+
+CHUNK_SIZE = 1 << 20
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest(), os.path.getsize(path)
+
+def build_manifest(root='out', jobs=1):
+    # Keys are '/'-separated paths relative to root, as they appear in URLs
+    files = sorted(Scanner(root, gitignore=False).scan())
+    paths = [os.path.join(root, file) for file in files]
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            hashes = list(pool.map(_hash_file, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    else:
+        hashes = [_hash_file(path) for path in paths]
+    return {file.replace(os.sep, '/'): {'sha256': digest, 'size': size}
+            for file, (digest, size) in zip(files, hashes)}
+
+def load_manifest(path):
+    # A missing or outdated manifest means everything counts as added
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('files', {}) if data.get('version') == MANIFEST_VERSION else {}
+
+def save_manifest(path, files):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with replacing(path, 'w') as f:
+        json.dump({'version': MANIFEST_VERSION, 'files': files}, f, indent=1, sort_keys=True)
+        f.write('\n')
+        f.changed = True
+
+def diff_manifests(previous, current):
+    added = sorted(set(current) - set(previous))
+    removed = sorted(set(previous) - set(current))
+    changed = sorted(file for file in set(current) & set(previous)
+                     if current[file]['sha256'] != previous[file]['sha256'])
+    return {'added': added, 'changed': changed, 'removed': removed}
+
+def _link(source, target):
+    # Hard links cost no copy; across filesystems fall back to one
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.lexists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+        shutil.copy2(source, target)
+
+def _prune_dirs(path, stop):
+    # Drop directories a removal left empty, up to stop
+    parent = os.path.dirname(path)
+    while os.path.abspath(parent) != os.path.abspath(stop):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+
+def stage(root, stage_dir, current):
+    # Brings stage_dir in line with root, checking what stage_dir actually
+    # holds rather than trusting a manifest: an uncommitted run may have left
+    # other bytes or extra files in it. A file whose size and hash already
+    # match current is left alone, so it keeps the inode and mtime of the
+    # deploy that introduced it and a size+mtime sync (rsync, aws s3 sync)
+    # skips it; anything else is hard-linked from root, and files current does
+    # not list are removed. The build recreates root rather than editing files
+    # in place, so a link never sees a later build's bytes
+    linked = unstaged = 0
+    for file, entry in current.items():
+        source = os.path.join(root, *file.split('/'))
+        target = os.path.join(stage_dir, *file.split('/'))
+        try:
+            same = os.path.samefile(source, target) or (
+                os.path.isfile(target) and _hash_file(target) == (entry['sha256'], entry['size']))
+        except OSError:
+            same = False
+        if not same:
+            _link(source, target)
+            linked += 1
+    if os.path.isdir(stage_dir):
+        for file in list(Scanner(stage_dir, gitignore=False).scan()):
+            if file.replace(os.sep, '/') not in current:
+                target = os.path.join(stage_dir, file)
+                os.remove(target)
+                _prune_dirs(target, stage_dir)
+                unstaged += 1
+    return linked, unstaged
+
+def deploy_manifest(root='out', jobs=1, previous_path=MANIFEST_PATH, pending_path=PENDING_PATH,
+                    changes_path=None, stage_dir=None):
+    start = time.perf_counter()
+    previous = load_manifest(previous_path)
+    current = build_manifest(root, jobs)
+    changes = diff_manifests(previous, current)
+    if changes_path:
+        os.makedirs(os.path.dirname(os.path.abspath(changes_path)), exist_ok=True)
+        with replacing(changes_path, 'w') as f:
+            json.dump(changes, f, indent=2)
+            f.write('\n')
+            f.changed = True
+    linked, unstaged = stage(root, stage_dir, current) if stage_dir else (0, 0)
+    save_manifest(pending_path, current)
+
+    for kind, sign in (('added', '+'), ('changed', '~'), ('removed', '-')):
+        for file in changes[kind]:
+            print(f"{sign} {file}")
+    unchanged = len(current) - len(changes['added']) - len(changes['changed'])
+    print(f"Deploy manifest for {len(current)} file(s): {len(changes['added'])} added, "
+          f"{len(changes['changed'])} changed, {len(changes['removed'])} removed, {unchanged} unchanged"
+          f"{f', {linked} staged, {unstaged} unstaged' if stage_dir else ''} in {time.perf_counter() - start:.2f}s")
+    if not previous:
+        print(f"No previous manifest at {previous_path}; every file counts as added", file=sys.stderr)
+    return changes
+
+def commit_manifest(pending_path=PENDING_PATH, manifest_path=MANIFEST_PATH):
+    # The upload went through: the pending manifest becomes the one the next
+    # run diffs against
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    os.replace(pending_path, manifest_path)
+    print(f"Committed {pending_path} as {manifest_path}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Hash the static export and list what changed since the last deploy.')
+    parser.add_argument('root', nargs='?', default='out', help='export directory (default: out)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help='manifest of the previous deploy')
+    parser.add_argument('--pending', default=PENDING_PATH, help='where to write the new manifest until --commit')
+    parser.add_argument('--commit', action='store_true',
+                        help='after a successful upload, replace --manifest with --pending; nothing is hashed')
+    parser.add_argument('--changes', help='write the added/changed/removed lists here as JSON')
+    parser.add_argument('--stage', help='directory to keep in sync with the export using hard links')
+    args = parser.parse_args(argv)
+    if args.commit:
+        if not os.path.isfile(args.pending):
+            parser.error(f"no pending manifest at {args.pending}; run without --commit first")
+        commit_manifest(args.pending, args.manifest)
+        return
+    if not os.path.isdir(args.root):
+        parser.error(f"{args.root} is not a directory; run the build first")
+    if args.stage and os.path.abspath(args.stage).startswith(os.path.abspath(args.root) + os.sep):
+        parser.error('--stage must be outside the export directory')
+    deploy_manifest(args.root, max(args.jobs, 1), args.manifest, args.pending, args.changes, args.stage)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# File helpers shared by rebrand.py, precompress.py and deploy_manifest.py:
+# atomic replacement through a temp file, content hashes and the Scanner that
+# enumerates a tree. Importing this module has no side effects, so the build
+# scripts can use it without pulling in the rebrand tool.
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache
+
+# Threads listing directories for Scanner
+SCAN_WORKERS = 8
+
+# Files created through a temp file get the mode open(path, 'w') would give
+# them. Reading the umask means setting it, so that happens on the first new
+# file rather than at import.
+@lru_cache(maxsize=None)
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+def temp_for(path):
+    return tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.' + os.path.basename(path) + '.')
+
+def rename_over(tmp, path, times=None):
+    if os.path.exists(path):
+        shutil.copymode(path, tmp)
+    else:
+        os.chmod(tmp, 0o666 & ~_umask())
+    os.replace(tmp, path)
+    if times is not None:
+        os.utime(path, ns=times)
+
+@contextmanager
+def replacing(path, mode='wb'):
+    # Yields a temp file next to path (following symlinks); it replaces path
+    # only if the block sets .changed, otherwise it is discarded
+    path = os.path.realpath(path)
+    fd, tmp = temp_for(path)
+    try:
+        with os.fdopen(fd, mode) as out:
+            out.changed = False
+            yield out
+        if out.changed:
+            rename_over(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def content_digest(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8', 'surrogateescape')
+    return hashlib.sha256(data).hexdigest()
+
+def glob_regex(pattern):
+    # gitignore glob syntax over '/'-separated paths: '*' and '?' stay within
+    # one component, '**' spans any number of them
+    out, i = [], 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+            continue
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            body = pattern[i + 1:end]
+            out.append('[' + ('^' + body[1:] if body[:1] == '!' else body) + ']')
+            i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+def compile_globs(patterns):
+    # One regex for a list of globs; a glob without a slash matches a name at
+    # any depth, one with a slash is anchored to the root of the scan
+    parts = []
+    for pattern in patterns:
+        anchored = '/' in pattern.rstrip('/')
+        body = glob_regex(pattern.strip('/'))
+        parts.append(body if anchored else '(?:.*/)?' + body)
+    return re.compile('(?:' + '|'.join(parts) + r')\Z') if parts else None
+
+# Rules of one .gitignore file, matched against paths relative to its directory
+class _IgnoreRules:
+    def __init__(self, base, text):
+        self.base = base
+        self.rules = []     # (regex, negated, directories only)
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated or line.startswith('\\'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            if line.strip('/'):
+                self.rules.append((compile_globs([line]), negated, dir_only))
+
+    def match(self, rel, is_dir):
+        # True (ignored), False (re-included by a '!' rule) or None (no rule)
+        if self.base:
+            rel = rel[len(self.base) + 1:]
+        result = None
+        for regex, negated, dir_only in self.rules:
+            if (is_dir or not dir_only) and regex.match(rel):
+                result = not negated
+        return result
+
+# File enumeration for replace_global. Directories are listed with os.scandir on
+# a thread pool, pruned by exclude globs and by every .gitignore on the way
+# down, and files are kept if they match an include glob. With a cache path,
+# each directory's listing is saved with its mtime and reused while the mtime
+# is unchanged, so a rerun only lists the directories that gained or lost
+# entries. Paths are yielded relative to root, in no particular order.
+class Scanner:
+    def __init__(self, root, include=None, exclude=(), gitignore=True, cache_path=None, workers=SCAN_WORKERS):
+        self.root = root
+        self.include = compile_globs(include) if include else None
+        self.exclude = compile_globs(exclude)
+        self.gitignore = gitignore
+        self.cache_path = cache_path
+        self.workers = workers
+        self.config = content_digest(repr((sorted(include or ()), sorted(exclude), gitignore)))
+        self.cache = {}
+        self.listed = 0
+        self.reused = 0
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get('dirs', {}) if data.get('config') == self.config else {}
+
+    def _save_cache(self, dirs):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with replacing(self.cache_path, 'w') as f:
+            json.dump({'version': 1, 'config': self.config, 'dirs': dirs}, f, sort_keys=True)
+            f.write('\n')
+            f.changed = True
+
+    def _list(self, rel_dir, dirs_out):
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.cache.get(rel_dir)
+        if cached is not None and cached['mtime_ns'] == mtime:
+            files, dirs = cached['files'], cached['dirs']
+            self.reused += 1
+        else:
+            files, dirs = [], []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    # Like os.walk: symlinked directories are not followed
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            dirs.append(entry.name)
+                    else:
+                        files.append(entry.name)
+            self.listed += 1
+        dirs_out[rel_dir] = {'mtime_ns': mtime, 'files': files, 'dirs': dirs}
+        rules = None
+        if self.gitignore and '.gitignore' in files:
+            with open(os.path.join(path, '.gitignore'), 'r', encoding='utf-8', errors='replace') as f:
+                rules = _IgnoreRules(rel_dir, f.read())
+        return files, dirs, rules
+
+    def _ignored(self, rel, is_dir, rules):
+        if self.exclude is not None and self.exclude.match(rel):
+            return True
+        ignored = False
+        for rule_set in rules:
+            result = rule_set.match(rel, is_dir)
+            if result is not None:
+                ignored = result
+        return ignored
+
+    def scan(self):
+        self.cache = self._load_cache() if self.cache_path else {}
+        dirs_out = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = {pool.submit(self._list, '', dirs_out): ('', ())}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rel_dir, rules = running.pop(future)
+                    files, dirs, own = future.result()
+                    if own is not None:
+                        rules = rules + (own,)
+                    for name in dirs:
+                        rel = f"{rel_dir}/{name}" if rel_dir else name
+                        if name != '.git' and not self._ignored(rel, True, rules):
+                            running[pool.submit(self._list, rel, dirs_out)] = (rel, rules)
+                    for name in files:
+                        rel = f"{rel_dir}/{name}" if rel_dir else name
+                        if (self.include is None or self.include.match(rel)) and not self._ignored(rel, False, rules):
+                            yield rel.replace('/', os.sep)
+        if self.cache_path:
+            self._save_cache(dirs_out)
@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+# Structure-aware patching for the JS/JSX/MDX-adjacent sources the rebrand
+# recipe edits. One linear scan tokenizes a file -- strings, template literals,
+# comments, regex literals and JSX (tags, attributes, text children) included --
+# and indexes its top-level imports and declarations and every JSX opening tag
+# by offset, so edits splice exact spans instead of running whole-file regexes.
+
+import re
+
+# Keywords after which '/' starts a regex and '<' starts JSX
+_EXPR_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+                  'throw', 'yield', 'await', 'instanceof', 'default', 'export'}
+
+# Tokens that cannot end a statement, so a line break after them does not either
+_CONTINUES = {'=', '=>', ',', '.', '?.', '?', ':', '+', '-', '*', '/', '%', '&&', '||', '??',
+              '&', '|', '^', '<', '>', '!', '~', '...'}
+
+# Tokens that continue the previous line's statement when they start a line
+_CONTINUED_BY = {'.', '?.', '?', ':', '+', '-', '*', '/', '%', '&&', '||', '??', '&', '|', '^',
+                 '=', '=>', ',', '(', '[', '`', '<', '>', 'instanceof', 'in'}
+
+_PUNCTUATORS = ('...', '===', '!==', '**=', '<<=', '>>=', '&&=', '||=', '??=', '=>', '==', '!=', '<=',
+                '>=', '&&', '||', '??', '?.', '++', '--', '+=', '-=', '*=', '/=', '%=', '&=', '|=',
+                '^=', '**', '<<', '>>')
+
+class Token:
+    def __init__(self, kind, start, end, depth, newline):
+        self.kind = kind        # name, number, string, template, regex, jsx, open, close, punct
+        self.start = start
+        self.end = end
+        self.depth = depth      # bracket depth; an open and its close share it
+        self.newline = newline  # a line break precedes the token
+
+class Import:
+    def __init__(self, start, end, source):
+        self.start = start
+        self.end = end
+        self.source = source
+
+class Declaration:
+    def __init__(self, name, kind, start, end, exported):
+        self.name = name
+        self.kind = kind        # function, class, const, let or var
+        self.start = start
+        self.end = end
+        self.exported = exported
+
+class Attribute:
+    def __init__(self, name, start, end):
+        self.name = name        # spreads are named by their text, e.g. '{...props}'
+        self.start = start
+        self.end = end
+
+class JsxTag:
+    def __init__(self, name, start, end, attributes):
+        self.name = name
+        self.start = start
+        self.end = end          # just past the closing '>' or '/>'
+        self.attributes = attributes
+
+    def attribute(self, name):
+        return next((a for a in self.attributes if a.name == name), None)
+
+def _is_name_char(c):
+    return c.isalnum() or c in '_$'
+
+class SourceIndex:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = []
+        self.tags = []
+        self.imports = []
+        self.declarations = []
+        self._scan_js(0, top=True)
+        self.tags.sort(key=lambda tag: tag.start)
+        self._index_statements()
+
+    def token_text(self, token):
+        return self.text[token.start:token.end]
+
+    def declaration(self, name):
+        return next((d for d in self.declarations if d.name == name), None)
+
+    def directives_end(self):
+        # Offset after leading directives such as 'use client', where a file
+        # without imports gets its first one
+        end = 0
+        for token in self.tokens:
+            if token.kind == 'string' and token.depth == 0 and (end == 0 or token.newline):
+                end = token.end
+            elif self.text[token.start:token.end] == ';' and end == token.start:
+                end = token.end
+            else:
+                break
+        return end
+
+    def find_tag(self, name, having=None):
+        # First opening tag called name, optionally one that has attribute having
+        return next((tag for tag in self.tags
+                     if tag.name == name and (having is None or tag.attribute(having) is not None)), None)
+
+    # Scanning
+
+    def _expression_allowed(self, prev):
+        if prev is None:
+            return True
+        kind, value = prev
+        if kind == 'name':
+            return value in _EXPR_KEYWORDS
+        if kind == 'close':
+            return False
+        return kind in ('open', 'punct')
+
+    def _scan_js(self, i, top=False):
+        # Scans JS from i. Nested scans (template ${}, JSX {}) stop after the '}'
+        # that closes them and return its end; tokens are only kept at the top.
+        text, n = self.text, len(self.text)
+        depth, prev, newline = 0, None, False
+        while i < n:
+            c = text[i]
+            if c == '\n':
+                newline = True
+                i += 1
+                continue
+            if c.isspace():
+                i += 1
+                continue
+            if text.startswith('//', i):
+                end = text.find('\n', i)
+                i = n if end < 0 else end
+                continue
+            if text.startswith('/*', i):
+                end = text.find('*/', i + 2)
+                i = n if end < 0 else end + 2
+                continue
+
+            start, token_depth = i, depth
+            if c in '\'"':
+                i, kind = self._string(i), 'string'
+            elif c == '`':
+                i, kind = self._template(i), 'template'
+            elif c.isdigit() or (c == '.' and text[i + 1:i + 2].isdigit()):
+                i += 1
+                while i < n and (_is_name_char(text[i]) or text[i] == '.'):
+                    i += 1
+                kind = 'number'
+            elif _is_name_char(c):
+                i += 1
+                while i < n and _is_name_char(text[i]):
+                    i += 1
+                kind = 'name'
+            elif c == '/' and self._expression_allowed(prev):
+                i, kind = self._regex(i), 'regex'
+            elif c == '<' and self._expression_allowed(prev) and (
+                    text[i + 1:i + 2] == '>' or _is_name_char(text[i + 1:i + 2] or ' ')):
+                i, kind = self._jsx(i), 'jsx'
+            elif c in '([{':
+                i, kind = i + 1, 'open'
+                depth += 1
+            elif c in ')]}':
+                if depth == 0:
+                    if not top and c == '}':
+                        return i + 1
+                else:
+                    depth -= 1
+                i, kind, token_depth = i + 1, 'close', depth
+            else:
+                op = next((p for p in _PUNCTUATORS if text.startswith(p, i)), c)
+                i, kind = i + len(op), 'punct'
+            if top:
+                self.tokens.append(Token(kind, start, i, token_depth, newline))
+            prev, newline = (kind, text[start:i]), False
+        return i
+
+    def _string(self, i):
+        text, quote = self.text, self.text[i]
+        i += 1
+        while i < len(text):
+            c = text[i]
+            if c == '\\':
+                i += 2
+                continue
+            if c == quote:
+                return i + 1
+            if c == '\n':
+                return i
+            i += 1
+        return len(text)
+
+    def _template(self, i):
+        text = self.text
+        i += 1
+        while i < len(text):
+            c = text[i]
+            if c == '\\':
+                i += 2
+            elif c == '`':
+                return i + 1
+            elif text.startswith('${', i):
+                i = self._scan_js(i + 2)
+            else:
+                i += 1
+        return len(text)
+
+    def _regex(self, i):
+        text, in_class = self.text, False
+        i += 1
+        while i < len(text):
+            c = text[i]
+            if c == '\\':
+                i += 2
+                continue
+            if c == '\n':
+                return i
+            if c == '[':
+                in_class = True
+            elif c == ']':
+                in_class = False
+            elif c == '/' and not in_class:
+                i += 1
+                break
+            i += 1
+        while i < len(text) and _is_name_char(text[i]):
+            i += 1
+        return i
+
+    def _skip_space(self, i):
+        text = self.text
+        while i < len(text):
+            if text[i].isspace():
+                i += 1
+            elif text.startswith('/*', i):
+                end = text.find('*/', i + 2)
+                i = len(text) if end < 0 else end + 2
+            elif text.startswith('//', i):
+                end = text.find('\n', i)
+                i = len(text) if end < 0 else end
+            else:
+                break
+        return i
+
+    def _jsx(self, start):
+        # One element from its '<': the opening tag and its attributes, then the
+        # children (text, {expressions}, nested elements) up to the closing tag
+        text, n = self.text, len(self.text)
+        i = start + 1
+        while i < n and (_is_name_char(text[i]) or text[i] in '.:-'):
+            i += 1
+        name = text[start + 1:i]
+        attributes = []
+        while True:
+            i = self._skip_space(i)
+            if i >= n:
+                return n
+            if text.startswith('/>', i):
+                self.tags.append(JsxTag(name, start, i + 2, attributes))
+                return i + 2
+            if text[i] == '>':
+                i += 1
+                break
+            a = i
+            if text[i] == '{':
+                i = self._scan_js(i + 1)
+                attributes.append(Attribute(text[a:i], a, i))
+                continue
+            while i < n and (_is_name_char(text[i]) or text[i] in ':-'):
+                i += 1
+            if i == a:
+                i += 1      # stray character; keep going rather than loop
+                continue
+            attr_name = text[a:i]
+            j = self._skip_space(i)
+            if text.startswith('=', j):
+                j = self._skip_space(j + 1)
+                if j < n and text[j] in '\'"':
+                    end = text.find(text[j], j + 1)
+                    i = n if end < 0 else end + 1
+                elif text.startswith('{', j):
+                    i = self._scan_js(j + 1)
+                elif text.startswith('<', j):
+                    i = self._jsx(j)
+            attributes.append(Attribute(attr_name, a, i))
+        self.tags.append(JsxTag(name, start, i, attributes))
+
+        while i < n:
+            if text.startswith('</', i):
+                end = text.find('>', i)
+                return n if end < 0 else end + 1
+            if text[i] == '<':
+                i = self._jsx(i)
+            elif text[i] == '{':
+                i = self._scan_js(i + 1)
+            else:
+                i += 1
+        return n
+
+    # Statements
+
+    def _statement_end(self, k):
+        # Index of the last token of the statement starting at tokens[k]: a ';'
+        # at depth 0, or a line break outside every bracket where automatic
+        # semicolon insertion would end it. A closing bracket never starts a
+        # new statement, it belongs to the one still open.
+        tokens, text = self.tokens, self.text
+        j = k
+        while j < len(tokens):
+            token = tokens[j]
+            value = text[token.start:token.end]
+            if token.depth == 0 and value == ';':
+                return j
+            following = tokens[j + 1] if j + 1 < len(tokens) else None
+            if following is None:
+                return j
+            depth_after = token.depth + (token.kind == 'open')
+            if (depth_after == 0 and following.newline and following.kind != 'close'
+                    and value not in _CONTINUES
+                    and text[following.start:following.end] not in _CONTINUED_BY):
+                return j
+            j += 1
+        return len(tokens) - 1
+
+    def _block_end(self, k):
+        # Index of the '}' closing the first depth-0 '{' at or after tokens[k];
+        # for functions the parameter list is skipped first
+        tokens, text = self.tokens, self.text
+        j = k
+        while j < len(tokens) and not (tokens[j].depth == 0 and text[tokens[j].start] == '{'
+                                       and tokens[j].kind == 'open'):
+            j += 1
+        while j + 1 < len(tokens) and tokens[j + 1].depth > 0:
+            j += 1
+        return min(j + 1, len(tokens) - 1)
+
+    def _index_statements(self):
+        tokens, text = self.tokens, self.text
+
+        def value(j):
+            return text[tokens[j].start:tokens[j].end] if j < len(tokens) else None
+
+        k = 0
+        while k < len(tokens):
+            start, exported = k, False
+            if value(k) == 'import' and value(k + 1) not in ('(', '.'):
+                end = self._statement_end(k)
+                source = next((text[t.start + 1:t.end - 1] for t in tokens[k:end + 1] if t.kind == 'string'), None)
+                self.imports.append(Import(tokens[start].start, tokens[end].end, source))
+                k = end + 1
+                continue
+            if value(k) == 'export':
+                exported = True
+                k += 1
+                if value(k) == 'default':
+                    k += 1
+            if value(k) == 'async' and value(k + 1) == 'function':
+                k += 1
+            keyword = value(k)
+            if keyword in ('function', 'class'):
+                name_index = k + 1 + (value(k + 1) == '*')
+                name = value(name_index) if name_index < len(tokens) and tokens[name_index].kind == 'name' else 'default'
+                if keyword == 'function':
+                    # Skip the parameter list so destructured defaults do not
+                    # look like the body
+                    j = name_index
+                    while j < len(tokens) and not (tokens[j].depth == 0 and value(j) == '('):
+                        j += 1
+                    while j + 1 < len(tokens) and tokens[j + 1].depth > 0:
+                        j += 1
+                    end = self._block_end(j + 2)
+                else:
+                    end = self._block_end(name_index)
+                self.declarations.append(Declaration(name, keyword, tokens[start].start, tokens[end].end, exported))
+                k = end + 1
+                continue
+            end = self._statement_end(start)
+            if keyword in ('const', 'let', 'var') and k + 1 < len(tokens) and tokens[k + 1].kind == 'name':
+                self.declarations.append(Declaration(value(k + 1), keyword, tokens[start].start,
+                                                     tokens[end].end, exported))
+            k = end + 1
+
+def splice(text, edits):
+    # Applies (start, end, replacement) edits, which must not overlap
+    out, last = [], 0
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1])):
+        if start < last:
+            raise ValueError(f"overlapping edits at offset {start}")
+        out.append(text[last:start])
+        out.append(replacement)
+        last = end
+    out.append(text[last:])
+    return ''.join(out)
+
+def _line_indent(text, offset):
+    line_start = text.rfind('\n', 0, offset) + 1
+    indent = line_start
+    while indent < offset and text[indent] in ' \t':
+        indent += 1
+    return text[line_start:indent], indent == offset
+
+def attribute_edit(text, tag, attribute, after=None, before=None):
+    # (start, end, replacement) inserting attribute (e.g. 'data-nosnippet' or
+    # 'id="x"') into tag next to an anchor attribute, or after the last one.
+    # Attributes laid out one per line get their own line.
+    anchor = tag.attribute(after or before) if (after or before) else (tag.attributes[-1] if tag.attributes else None)
+    if anchor is None:
+        name_end = tag.start + 1 + len(tag.name)
+        return name_end, name_end, ' ' + attribute
+    indent, own_line = _line_indent(text, anchor.start)
+    if before is not None:
+        separator = '\n' + indent if own_line else ' '
+        return anchor.start, anchor.start, attribute + separator
+    separator = '\n' + indent if own_line else ' '
+    return anchor.end, anchor.end, separator + attribute
+
+# Imports
+
+# Line length past which merged imports are written one specifier per line
+PRINT_WIDTH = 80
+
+_IMPORT = re.compile(r"import\s+(?P<clause>[^'\"]*?)\s*\bfrom\s*(?P<quote>['\"])(?P<source>[^'\"]*)(?P=quote)\s*(?P<semi>;?)\s*\Z")
+
+# Import statements this does not rewrite on purpose: side-effect and type-only
+_OPAQUE_IMPORT = re.compile(r"import\s*(?:['\"]|type\s)")
+
+# A comment outside the statement's string literals
+_COMMENT = re.compile(r"""(['"])(?:\\.|(?!\1).)*\1|(?P<comment>//|/\*)""")
+
+def _has_comment(statement):
+    return any(m.group('comment') for m in _COMMENT.finditer(statement))
+
+def _local_name(specifier):
+    return specifier.split()[-1]
+
+class ImportClause:
+    def __init__(self, default=None, namespace=None, named=(), quote="'", semicolon=False):
+        self.default = default
+        self.namespace = namespace
+        self.named = list(named)
+        self.quote = quote
+        self.semicolon = semicolon
+
+    @classmethod
+    def parse(cls, statement):
+        # None for side-effect imports and anything this does not understand,
+        # which includes statements with comments: they could not be rewritten
+        # without losing them
+        if _has_comment(statement):
+            return None
+        match = _IMPORT.match(statement)
+        if match is None or match.group('clause').startswith('type '):
+            return None
+        clause = match.group('clause')
+        named = []
+        if '{' in clause:
+            head, _, rest = clause.partition('{')
+            body, _, _ = rest.partition('}')
+            named = [' '.join(s.split()) for s in body.split(',') if s.strip()]
+            clause = head
+        default = namespace = None
+        for part in (p.strip() for p in clause.split(',')):
+            if part.startswith('*'):
+                namespace = part.split()[-1]
+            elif part:
+                default = part
+        return cls(default, namespace, named, match.group('quote'), bool(match.group('semi')))
+
+    def names(self):
+        names = {_local_name(s) for s in self.named}
+        if self.default:
+            names.add(self.default)
+        return names
+
+    def add(self, specifier):
+        # False when the binding is already imported
+        if _local_name(specifier) in self.names():
+            return False
+        if specifier.split()[0] == 'default' and self.default is None:
+            self.default = _local_name(specifier)
+        else:
+            self.named.append(specifier)
+        return True
+
+    def render(self, source):
+        head = [p for p in (self.default, f"* as {self.namespace}" if self.namespace else None) if p]
+        tail = f"from {self.quote}{source}{self.quote}{';' if self.semicolon else ''}"
+        if not self.named:
+            return f"import {', '.join(head)} {tail}"
+        line = f"import {', '.join(head + ['{ ' + ', '.join(self.named) + ' }'])} {tail}"
+        if len(line) <= PRINT_WIDTH:
+            return line
+        return (f"import {', '.join(head + ['{'])}\n" + ''.join(f"  {s},\n" for s in self.named) + f"}} {tail}")
+
+def _line_span(text, start, end):
+    # The span of a whole statement line, newline included
+    if text[end:end + 1] == '\n':
+        end += 1
+    return start, end
+
+def import_edits(text, index, requests, after=None):
+    # Edits that make every (source, [specifier, ...]) request hold: missing
+    # specifiers are merged into the first mergeable import of the module (other
+    # imports of it are folded in and removed), or a new import is added after
+    # the import of `after` (else after the last import). Returns (edits,
+    # changed sources, unparsed sources); edits and changed are empty when
+    # every binding is already imported. A module with an import this cannot
+    # parse is left out of the edits and reported in unparsed, since it may
+    # already provide the bindings.
+    edits, added, changed, unparsed = [], [], [], []
+    style = next((c for c in (ImportClause.parse(text[i.start:i.end]) for i in index.imports) if c), ImportClause())
+    for source, specifiers in requests:
+        statements = [(i, ImportClause.parse(text[i.start:i.end])) for i in index.imports if i.source == source]
+        if any(c is None and not _OPAQUE_IMPORT.match(text[i.start:i.end]) for i, c in statements):
+            unparsed.append(source)
+            continue
+        mergeable = [(i, c) for i, c in statements if c is not None and c.namespace is None]
+        if not mergeable:
+            clause = ImportClause(quote=style.quote, semicolon=style.semicolon)
+            for specifier in specifiers:
+                clause.add(specifier)
+            added.append(clause.render(source))
+            changed.append(source)
+            continue
+        (target, clause), others = mergeable[0], mergeable[1:]
+        dirty = False
+        for statement, other in others:
+            if other.default and clause.default and other.default != clause.default:
+                continue
+            for specifier in other.named + ([f"default as {other.default}"] if other.default else []):
+                clause.add(specifier)
+            edits.append(_line_span(text, statement.start, statement.end) + ('',))
+            dirty = True
+        for specifier in specifiers:
+            dirty = clause.add(specifier) or dirty
+        if dirty:
+            edits.append((target.start, target.end, clause.render(source)))
+            changed.append(source)
+
+    if added:
+        anchor = next((i for i in index.imports if i.source == after), None) if after else None
+        if anchor is None and index.imports:
+            anchor = index.imports[-1]
+        if anchor is not None:
+            edits.append((anchor.end, anchor.end, ''.join('\n' + s for s in added)))
+        else:
+            at = index.directives_end()
+            text_added = '\n'.join(added)
+            edits.append((at, at, '\n\n' + text_added if at else text_added + '\n\n'))
+    return edits, changed, unparsed
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# Precompression of the static export, for web servers that serve a .gz/.br
+# file next to the original as is (nginx gzip_static, a CDN upload step). The
+# build does not run it: GitHub Pages compresses on its own and ignores such
+# files, so run `npm run precompress` after `npm run build` when deploying
+# elsewhere. Every HTML, JS, CSS, JSON and XML file in out/ gets a .gz (and a
+# .br when a brotli module is installed) next to it. Files are compressed on a
+# process pool; small files and files that barely shrink are left alone.
+# Compressed bytes are kept in a content-addressed store keyed by the source's
+# hash, so a rerun only compresses the files whose content actually changed.
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fsutil import Scanner, content_digest, replacing
+
+try:
+    import brotli
+except ModuleNotFoundError:  # optional; without it only .gz files are written
+    try:
+        import brotlicffi as brotli
+    except ModuleNotFoundError:
+        brotli = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Store of compressed outputs and their index, outside out/ so it survives the
+# next build wiping it
+CACHE_DIR = os.path.join(REPO_ROOT, '.rebrand', 'precompress')
+
+INCLUDE = ('*.html', '*.js', '*.css', '*.json', '*.xml')
+
+# Sitemaps are gzipped by gzip-sitemaps.mjs, whose .gz files are published
+# whatever their size, so leave them to it
+EXCLUDE = ('sitemap*.xml',)
+
+# Below this size the bytes saved do not pay for serving a second variant
+MIN_SIZE = 1024
+
+# An encoding is only kept if it is at most this fraction of the original
+MAX_RATIO = 0.9
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Bump when the compression settings change so stored outputs are not reused
+CACHE_VERSION = 1
+
+def _encoders(names):
+    encoders = {}
+    if 'gz' in names:
+        # mtime=0 keeps the output a pure function of the input
+        encoders['gz'] = lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if 'br' in names and brotli is not None:
+        encoders['br'] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+    return encoders
+
+# Worker state, set once per process by _init_worker
+_worker = {}
+
+def _init_worker(store, poor, names, min_size, max_ratio):
+    _worker.update(store=store, poor=poor, encoders=_encoders(names), min_size=min_size, max_ratio=max_ratio)
+
+def _install(data, target, source_stat):
+    with replacing(target) as out:
+        out.write(data)
+        out.changed = True
+    os.utime(target, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+
+def _compress_file(path):
+    # Returns (source hash, size, {encoding: (status, output size)}) where
+    # status is 'written', 'reused', 'poor' or 'small'; for 'poor' the size is
+    # replaced by the ratio that was measured
+    store, poor = _worker['store'], _worker['poor']
+    st = os.stat(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = content_digest(data)
+    results = {}
+    for name, encode in _worker['encoders'].items():
+        target = f"{path}.{name}"
+        stored = os.path.join(store, f"{digest}.{name}")
+        if len(data) < _worker['min_size']:
+            results[name] = ('small', 0)
+        elif poor.get(f"{digest}.{name}", 0) > _worker['max_ratio']:
+            results[name] = ('poor', poor[f"{digest}.{name}"])
+        elif os.path.exists(stored) and os.path.getsize(stored) > len(data) * _worker['max_ratio']:
+            results[name] = ('poor', os.path.getsize(stored) / len(data))
+        elif os.path.exists(stored):
+            size = os.path.getsize(stored)
+            try:
+                current = os.stat(target)
+                fresh = current.st_size == size and current.st_mtime_ns == st.st_mtime_ns
+            except FileNotFoundError:
+                fresh = False
+            if not fresh:
+                with open(stored, 'rb') as f:
+                    _install(f.read(), target, st)
+            results[name] = ('reused', size)
+            continue
+        else:
+            compressed = encode(data)
+            if len(compressed) <= len(data) * _worker['max_ratio']:
+                _install(compressed, stored, st)
+                _install(compressed, target, st)
+                results[name] = ('written', len(compressed))
+                continue
+            results[name] = ('poor', len(compressed) / len(data))
+        # Not worth serving compressed: drop a stale output from an earlier run
+        if os.path.exists(target):
+            os.remove(target)
+    return digest, len(data), results
+
+def _load_index(path):
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('poor', {}) if data.get('version') == CACHE_VERSION else {}
+
+def precompress(root='out', jobs=1, min_size=MIN_SIZE, max_ratio=MAX_RATIO, encodings=('gz', 'br'),
+                cache_dir=CACHE_DIR):
+    encoders = _encoders(encodings)
+    if 'br' in encodings and 'br' not in encoders:
+        print("brotli is not installed; writing .gz files only", file=sys.stderr)
+    store = os.path.join(cache_dir, 'store')
+    index_path = os.path.join(cache_dir, 'index.json')
+    os.makedirs(store, exist_ok=True)
+    poor = _load_index(index_path)
+
+    start = time.perf_counter()
+    files = sorted(Scanner(root, INCLUDE, EXCLUDE, gitignore=False).scan())
+    paths = [os.path.join(root, file) for file in files]
+    init = (store, poor, tuple(encoders), min_size, max_ratio)
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=init) as pool:
+            results = list(pool.map(_compress_file, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+    else:
+        _init_worker(*init)
+        results = [_compress_file(path) for path in paths]
+
+    # Keep only what this build used, so the store tracks the current site
+    used, new_poor = set(), {}
+    counts = {'written': 0, 'reused': 0, 'poor': 0, 'small': 0}
+    read = written = 0
+    for file, (digest, size, outcome) in zip(files, results):
+        read += size
+        for name, (status, out_size) in outcome.items():
+            counts[status] += 1
+            if status in ('written', 'reused'):
+                written += out_size
+                used.add(f"{digest}.{name}")
+            elif status == 'poor':
+                # Remembered with its ratio, so a looser --max-ratio retries it
+                new_poor[f"{digest}.{name}"] = round(out_size, 4)
+            if status == 'written':
+                print(f"Compressed {file}.{name} ({out_size / size:.0%} of {size} bytes)")
+    for entry in os.listdir(store):
+        if entry not in used:
+            os.remove(os.path.join(store, entry))
+    with replacing(index_path, 'w') as f:
+        json.dump({'version': CACHE_VERSION, 'poor': new_poor}, f, sort_keys=True)
+        f.write('\n')
+        f.changed = True
+
+    seconds = time.perf_counter() - start
+    print(f"Precompressed {len(files)} file(s) into {', '.join('.' + n for n in encoders) or 'nothing'}: "
+          f"{counts['written']} written, {counts['reused']} reused, "
+          f"{counts['poor'] + counts['small']} skipped ({counts['small']} too small, {counts['poor']} poor ratio) "
+          f"in {seconds:.2f}s")
+    return {'files': len(files), 'bytes_read': read, 'bytes_written': written, 'seconds': round(seconds, 6), **counts}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Precompress the static export for serving as .gz/.br files.')
+    parser.add_argument('root', nargs='?', default='out', help='export directory (default: out)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--min-size', type=int, default=MIN_SIZE,
+                        help=f'leave files smaller than this many bytes alone (default: {MIN_SIZE})')
+    parser.add_argument('--max-ratio', type=float, default=MAX_RATIO,
+                        help=f'keep an encoding only at or below this fraction of the original (default: {MAX_RATIO})')
+    parser.add_argument('--no-brotli', action='store_true', help='write .gz files only')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='store of compressed outputs reused across builds')
+    parser.add_argument('--clear-cache', action='store_true', help='recompress everything')
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.root):
+        parser.error(f"{args.root} is not a directory; run the build first")
+    if args.clear_cache:
+        shutil.rmtree(args.cache_dir, ignore_errors=True)
+    precompress(args.root, max(args.jobs, 1), args.min_size, args.max_ratio,
+                ('gz',) if args.no_brotli else ('gz', 'br'), args.cache_dir)
+
+if __name__ == '__main__':
+    main()
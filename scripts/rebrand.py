@@ -1,1751 +1,2334 @@
 #!/usr/bin/env python3
+import argparse
+import base64
+import codecs
+import difflib
+import hashlib
+import io
+import json
+import mmap
 import os
 import re
 import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timezone
+from functools import wraps
+
+from fsutil import Scanner, compile_globs, content_digest, rename_over, replacing, temp_for
+from jsx_patch import SourceIndex, attribute_edit, import_edits, splice
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
+# Declarative recipe run by run_rebrand; templates are resolved next to it
+RECIPE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recipe', 'rebrand.toml')
+
+# Per-file record of the last staged run, relative to the tree root
+MANIFEST_PATH = os.path.join('.rebrand', 'manifest.json')
+
+# Where delete_paths(trash=True) moves trees before reclaiming them in the
+# background, relative to the tree root
+TRASH_PATH = os.path.join('.rebrand', 'trash')
+
+# Threads removing directory trees; unlink releases the GIL so these overlap
+DELETE_WORKERS = 8
+
+# File list cache for replace_global's Scanner, relative to the tree root
+SCAN_CACHE_PATH = os.path.join('.rebrand', 'files.json')
+
+# What replace_global rewrites, unless the caller passes its own excludes
+GLOBAL_INCLUDE = ('*.js', '*.jsx', '*.ts', '*.tsx', '*.css', '*.md', '*.mdx', '*.json')
+GLOBAL_EXCLUDE = ('.git', '.next', 'node_modules', 'out', '.vscode', 'scripts', '.rebrand')
+
+# Extracted search sections keyed by page content hash, relative to the tree
+# root; bump SEARCH_INDEX_VERSION when extraction or the shard manifest changes
+SEARCH_CACHE_PATH = os.path.join('.rebrand', 'search.json')
+SEARCH_INDEX_VERSION = 3
+
+# Format of the articles.json files index_articles writes; articles.js only
+# reads the version it knows
+ARTICLE_INDEX_VERSION = 2
+
+# Files handed to a worker per task when replace_global runs in parallel
+GLOBAL_BATCH_SIZE = 64
+
+# How the tool decodes the files it edits as text. Undecodable bytes survive the
+# round trip (surrogateescape) instead of raising under a C/POSIX locale. The
+# newline policy applies to decoded files: 'lf' and 'crlf' normalize line
+# endings on read and write them back in that style, 'keep' leaves them alone.
+ENCODING = 'utf-8'
+NEWLINE = 'lf'
+NEWLINES = ('keep', 'lf', 'crlf')
+
+# Files at least this large are substituted as bytes (through mmap, or in
+# fixed-size chunks for literal tokens) and written through a temp file, so
+# peak memory does not grow with the file. This only covers direct edits:
+# replace_global in the unstaged Phase 1 (package-lock.json is the largest file
+# it rewrites) and replace_in_file outside a staged phase. Staged phases keep
+# every file in memory regardless. Override with --large-file-size.
+LARGE_FILE_SIZE = 256 << 10
+STREAM_CHUNK_SIZE = 1 << 20
+
+def _is_large(path, threshold=LARGE_FILE_SIZE):
+    # Never true for an empty file, which mmap cannot map
+    try:
+        size = os.path.getsize(path)
+        return size > 0 and size >= threshold
+    except OSError:
+        return False
+
+def _remove_trees(paths, workers=DELETE_WORKERS):
+    # The entries of every tree are fanned out over a thread pool, so one large
+    # directory does not serialize the delete; the emptied roots go last
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for path in paths:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        futures.append(pool.submit(shutil.rmtree, entry.path))
+                    else:
+                        futures.append(pool.submit(os.unlink, entry.path))
+        for future in futures:
+            future.result()
+    for path in paths:
+        os.rmdir(path)
+
+def _byte_safe(encoding):
+    # Encodings where a literal's bytes can only match on character boundaries,
+    # so literals can be replaced without decoding
+    name = codecs.lookup(encoding).name
+    return name in ('utf-8', 'ascii') or name.startswith(('iso8859', 'cp125', 'latin'))
+
+def _decode(data, encoding=ENCODING, newline=NEWLINE):
+    text = data.decode(encoding, 'surrogateescape')
+    if newline != 'keep' and '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def _encode(text, encoding=ENCODING, newline=NEWLINE):
+    if newline == 'crlf':
+        text = text.replace('\n', '\r\n')
+    return text.encode(encoding, 'surrogateescape')
+
+def _literal_pattern(table, patterns=None):
+    # One alternation for the whole table (str or bytes keys); longest tokens
+    # first so overlapping keys resolve the same way on every run
+    keys = sorted(table, key=len, reverse=True)
+    sep = b'|' if isinstance(keys[0], bytes) else '|'
+    return (patterns or PATTERNS).get(sep.join(re.escape(k) for k in keys))
+
+def _stream_literals(path, table, pattern):
+    # Chunked literal substitution of a bytes table. Everything past the last
+    # complete match, up to len(longest token) - 1 bytes, is carried into the
+    # next chunk so tokens split across a chunk boundary are still found.
+    overlap = max(len(k) for k in table) - 1
+    with open(path, 'rb') as src, mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        size = len(data)
+        if pattern.search(data) is None:
+            return 'skipped', size, 0, 0
+    matches = 0
+    with open(path, 'rb') as src, replacing(path) as out:
+        carry = b''
+        while True:
+            chunk = src.read(STREAM_CHUNK_SIZE)
+            data = carry + chunk
+            limit = len(data) if not chunk else max(len(data) - overlap, 0)
+            last = 0
+            for m in pattern.finditer(data):
+                if m.start() >= limit:
+                    break
+                out.write(data[last:m.start()])
+                out.write(table[m.group(0)])
+                last = m.end()
+                matches += 1
+                out.changed = True
+            keep = max(last, limit)
+            out.write(data[last:keep])
+            carry = data[keep:]
+            if not chunk:
+                break
+        written = out.tell() if out.changed else 0
+    return 'updated' if matches else 'unchanged', size, written, matches
+
+def _mmap_sub(path, pattern, replacement):
+    # Regex substitution over a read-only mapping of the file; only the
+    # matched regions are ever materialized. Returns (matches, bytes written).
+    count = written = 0
+    with open(path, 'rb') as src, mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data, \
+            replacing(path) as out:
+        last = 0
+        for m in pattern.finditer(data):
+            out.write(data[last:m.start()])
+            out.write(m.expand(replacement))
+            last = m.end()
+            count += 1
+        out.write(data[last:])
+        out.changed = count > 0
+        if out.changed:
+            written = out.tell()
+    return count, written
+
+def _substitute_data(data, replacements, patterns=None, encoding=ENCODING):
+    # Literal substitution over a file's bytes; returns (new bytes, matches). In
+    # a byte-safe encoding the tokens are encoded once and replaced in the raw
+    # bytes, so the data is never decoded and only matched bytes change.
+    # Multi-byte encodings such as UTF-16 have to be matched as text; data that
+    # is not valid in the encoding cannot hold the tokens either.
+    if _byte_safe(encoding):
+        table = {k.encode(encoding): v.encode(encoding) for k, v in replacements.items()}
+        return _literal_pattern(table, patterns).subn(lambda m: table[m.group(0)], data)
+    try:
+        content = data.decode(encoding, 'surrogateescape')
+    except UnicodeDecodeError:
+        return data, 0
+    new_content, matches = _literal_pattern(replacements, patterns).subn(lambda m: replacements[m.group(0)], content)
+    if new_content == content:
+        return data, matches
+    return new_content.encode(encoding, 'surrogateescape'), matches
+
+# Literal substitution for one file. Returns (status, bytes read, bytes written,
+# matches) where status is 'skipped' when no token occurs, 'unchanged' or
+# 'updated'. Staged runs apply the same _substitute_data to the staged bytes.
+def _substitute_file(path, replacements, patterns=None, encoding=ENCODING, large_file_size=LARGE_FILE_SIZE):
+    if _byte_safe(encoding) and _is_large(path, large_file_size):
+        table = {k.encode(encoding): v.encode(encoding) for k, v in replacements.items()}
+        return _stream_literals(path, table, _literal_pattern(table, patterns))
+    with open(path, 'rb') as f:
+        data = f.read()
+    new_data, matches = _substitute_data(data, replacements, patterns, encoding)
+    if not matches:
+        return 'skipped', len(data), 0, 0
+    if new_data == data:
+        return 'unchanged', len(data), 0, matches
+    with replacing(path) as out:
+        out.write(new_data)
+        out.changed = True
+    return 'updated', len(data), len(new_data), matches
+
+def _substitute_files(paths, replacements, encoding=ENCODING, large_file_size=LARGE_FILE_SIZE):
+    return [_substitute_file(path, replacements, encoding=encoding, large_file_size=large_file_size)
+            for path in paths]
+
+def _fsync(paths):
+    for target in sorted(set(paths)):
+        try:
+            fd = os.open(target, os.O_RDONLY)
+        except OSError:
+            continue    # removed since, or a directory the platform cannot open
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+def _barrier(paths, dirs=()):
+    # fsync of every changed file and of the directories whose entries changed;
+    # unlike sync(2) this only waits for this tree's writes
+    _fsync(set(paths) | {os.path.dirname(p) or '.' for p in paths} | set(dirs))
+
+# Writes for a RebrandingTool. Every file is written to a temp file and renamed
+# over its target, so a crash never leaves one truncated; durability is paid
+# once per phase with a single barrier in sync() instead of once per write.
+# Deferred writes are only renamed into place by commit(), after their data is
+# fsynced, so the barrier then only has to cover their directories.
+class WriteBatch:
+    def __init__(self, durable=True):
+        self.durable = durable
+        self.changed = set()
+        self.renamed = set()
+        self.pending = []
+        self.barriers = 0
+
+    def write(self, path, content, defer=False, preserve_times=False):
+        # preserve_times keeps the target's atime/mtime when it already exists
+        path = os.path.realpath(path)
+        times = None
+        if preserve_times and os.path.exists(path):
+            st = os.stat(path)
+            times = (st.st_atime_ns, st.st_mtime_ns)
+        fd, tmp = temp_for(path)
+        try:
+            with os.fdopen(fd, 'wb' if isinstance(content, bytes) else 'w') as f:
+                f.write(content)
+                size = f.tell()
+            if defer:
+                self.pending.append((tmp, path, times))
+            else:
+                rename_over(tmp, path, times)
+                self.changed.add(path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return size
+
+    def add(self, path):
+        # Something changed at path (rewritten in place, replaced or removed)
+        self.changed.add(os.path.realpath(path))
+
+    def commit(self):
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        if self.durable:
+            _fsync(tmp for tmp, _, _ in pending)
+        for tmp, path, times in pending:
+            rename_over(tmp, path, times)
+            self.renamed.add(os.path.dirname(path))
+
+    def discard(self):
+        for tmp, _, _ in self.pending:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.pending = []
+
+    def sync(self):
+        changed, renamed = self.changed, self.renamed
+        self.changed, self.renamed = set(), set()
+        if self.durable and (changed or renamed):
+            _barrier(changed, renamed)
+            self.barriers += 1
+
+class PatternRegistry:
+    def __init__(self):
+        self.patterns = {}
+        self.compile_time = 0.0
+        self.match_time = 0.0
+
+    def get(self, pattern, flags=0):
+        key = (pattern, flags)
+        compiled = self.patterns.get(key)
+        if compiled is None:
+            start = time.perf_counter()
+            compiled = re.compile(pattern, flags)
+            self.compile_time += time.perf_counter() - start
+            self.patterns[key] = compiled
+        return compiled
+
+    @contextmanager
+    def matching(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.match_time += time.perf_counter() - start
+
+    def report(self):
+        print(f"Regex: {len(self.patterns)} pattern(s), "
+              f"compile {self.compile_time * 1000:.1f}ms, match {self.match_time * 1000:.1f}ms")
+
+PATTERNS = PatternRegistry()
+
+class _Span:
+    def __init__(self, name, category, step):
+        self.name = name
+        self.category = category
+        self.step = step
+        self.thread = threading.get_ident()
+        self.start = 0.0
+        self.duration = 0.0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.matches = 0
+        self.files = set()
+
+# Wall time, bytes read/written, regex matches and files touched for every
+# phase, step and operation of a RebrandingTool. Spans nest per thread and
+# counters are charged to every span open on the calling thread, so a phase
+# total includes the operations run inside it.
+class Profiler:
+    def __init__(self):
+        self.spans = []
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name, category='op', step=None):
+        span = _Span(name, category, step)
+        stack = self._stack()
+        stack.append(span)
+        span.start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - span.start
+            stack.pop()
+            with self._lock:
+                self.spans.append(span)
+
+    def count(self, bytes_read=0, bytes_written=0, matches=0, path=None):
+        for span in self._stack():
+            span.bytes_read += bytes_read
+            span.bytes_written += bytes_written
+            span.matches += matches
+            if path is not None:
+                span.files.add(path)
+
+    def hotspots(self):
+        # Spans aggregated by (category, name, step), slowest first
+        rows = {}
+        for span in self.spans:
+            key = (span.category, span.name, span.step)
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {'category': span.category, 'name': span.name, 'step': span.step,
+                                   'calls': 0, 'seconds': 0.0, 'bytes_read': 0, 'bytes_written': 0,
+                                   'matches': 0, 'files': set()}
+            row['calls'] += 1
+            row['seconds'] += span.duration
+            row['bytes_read'] += span.bytes_read
+            row['bytes_written'] += span.bytes_written
+            row['matches'] += span.matches
+            row['files'] |= span.files
+        rows = sorted(rows.values(), key=lambda row: row['seconds'], reverse=True)
+        for row in rows:
+            row['files'] = len(row['files'])
+        return rows
+
+    def report(self, limit=20, out=None):
+        rows = self.hotspots()
+        if not rows:
+            return
+        out = out or sys.stdout
+        print(f"\nHot spots (top {min(limit, len(rows))} of {len(rows)} by wall time):", file=out)
+        print(f"  {'category':<8} {'name':<36} {'step':<22} {'calls':>5} {'time ms':>9} "
+              f"{'read KB':>9} {'write KB':>9} {'matches':>7} {'files':>5}", file=out)
+        for row in rows[:limit]:
+            print(f"  {row['category']:<8} {row['name'][:36]:<36} {(row['step'] or '-')[:22]:<22} "
+                  f"{row['calls']:>5} {row['seconds'] * 1000:>9.1f} {row['bytes_read'] / 1024:>9.1f} "
+                  f"{row['bytes_written'] / 1024:>9.1f} {row['matches']:>7} {row['files']:>5}", file=out)
+
+    def write_json(self, path):
+        data = {
+            'version': 1,
+            'hotspots': self.hotspots(),
+            'spans': [{'name': s.name, 'category': s.category, 'step': s.step, 'thread': s.thread,
+                       'start': round(s.start - self.origin, 6), 'seconds': round(s.duration, 6),
+                       'bytes_read': s.bytes_read, 'bytes_written': s.bytes_written,
+                       'matches': s.matches, 'files': sorted(s.files)}
+                      for s in sorted(self.spans, key=lambda s: s.start)],
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.write('\n')
+
+    def write_trace(self, path):
+        # Chrome trace event format (chrome://tracing, Perfetto): one complete
+        # event per span, timestamps in microseconds
+        events = [{'name': s.name, 'cat': s.category, 'ph': 'X', 'pid': os.getpid(), 'tid': s.thread,
+                   'ts': round((s.start - self.origin) * 1e6, 3), 'dur': round(s.duration * 1e6, 3),
+                   'args': {'step': s.step, 'bytes_read': s.bytes_read, 'bytes_written': s.bytes_written,
+                            'matches': s.matches, 'files': len(s.files)}}
+                  for s in sorted(self.spans, key=lambda s: s.start)]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+            f.write('\n')
+
+def _profiled(name):
+    # Runs a RebrandingTool operation under a profiler span. Staged calls only
+    # queue edits; they are profiled when the workspace runs them on flush.
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.workspace is not None:
+                return method(self, *args, **kwargs)
+            with self.profiler.span(name, step=self.step.name if self.step is not None else None):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+# Persisted record of what the last staged run did to each file: the hash of the
+# content it found, of the edits it applied and of the content it left behind,
+# plus the size/mtime of the result. A file whose stat still matches and whose
+# edits are unchanged is skipped on the next run without being opened.
+class Manifest:
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.skipped = 0
+        if os.path.isfile(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f).get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable manifest {path} ({e})")
+
+    def _entry(self, file_path, step):
+        entry = self.entries.get(file_path)
+        return entry if entry and entry.get('step') == step else None
+
+    def unchanged(self, file_path, path, step):
+        entry = self._entry(file_path, step)
+        if entry is None:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns
+
+    def already_applied(self, file_path, step, input_hash):
+        entry = self._entry(file_path, step)
+        return entry is not None and entry.get('output') == input_hash
+
+    def record(self, file_path, path, step, input_hash, output_hash):
+        st = os.stat(path)
+        self.entries[file_path] = {
+            'input': input_hash,
+            'step': step,
+            'output': output_hash,
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+        }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with replacing(self.path, 'w') as f:
+            json.dump({'version': 1, 'files': self.entries}, f, indent=1, sort_keys=True)
+            f.write('\n')
+            f.changed = True
+
+def _is_under(path, parent):
+    return path == parent or path.startswith(parent + os.sep)
+
+def _overlaps(paths, others):
+    return any(_is_under(a, b) or _is_under(b, a) for a in paths for b in others)
+
+# DAG of units of work keyed by the files they read and write. A unit depends on
+# every earlier unit it conflicts with (one writes what the other reads or
+# writes), so units that share a file keep their order and the rest run
+# concurrently. Durations are measured so the critical path can be reported.
+class StepScheduler:
+    def __init__(self):
+        self.labels = []
+        self.tasks = []
+        self.deps = []
+        self.files = []
+        self.durations = []
+
+    def add(self, label, reads, writes, task):
+        reads, writes = set(reads), set(writes)
+        deps = {i for i, (r, w) in enumerate(self.files)
+                if _overlaps(writes, r | w) or _overlaps(reads, w)}
+        self.labels.append(label)
+        self.tasks.append(task)
+        self.deps.append(deps)
+        self.files.append((reads, writes))
+        self.durations.append(0.0)
+
+    def _timed(self, index):
+        start = time.perf_counter()
+        self.tasks[index]()
+        self.durations[index] = time.perf_counter() - start
+
+    def run(self, jobs):
+        if jobs <= 1 or len(self.tasks) <= 1:
+            for index in range(len(self.tasks)):
+                self._timed(index)
+            return
+
+        dependents = [[] for _ in self.tasks]
+        waiting = [set(deps) for deps in self.deps]
+        for index, deps in enumerate(self.deps):
+            for dep in deps:
+                dependents[dep].append(index)
+
+        ready = [i for i, deps in enumerate(waiting) if not deps]
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            running = {}
+            while ready or running:
+                for index in ready:
+                    running[pool.submit(self._timed, index)] = index
+                ready = []
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    future.result()
+                    for dependent in dependents[index]:
+                        waiting[dependent].discard(index)
+                        if not waiting[dependent]:
+                            ready.append(dependent)
+
+    def critical_path(self):
+        finish, previous = [], []
+        for index, deps in enumerate(self.deps):
+            before = max(deps, key=lambda d: finish[d], default=None)
+            finish.append(self.durations[index] + (finish[before] if before is not None else 0.0))
+            previous.append(before)
+        if not finish:
+            return [], 0.0
+        index = max(range(len(finish)), key=finish.__getitem__)
+        total, path = finish[index], []
+        while index is not None:
+            path.append(self.labels[index])
+            index = previous[index]
+        return path[::-1], total
+
+def _files_under(path, relative_path):
+    # Every file (or symlink) that removing path would take with it
+    if not os.path.lexists(path):
+        return []
+    if os.path.islink(path) or not os.path.isdir(path):
+        return [relative_path]
+    found = []
+    for root, dirs, files in os.walk(path):
+        links = [d for d in dirs if os.path.islink(os.path.join(root, d))]
+        for name in files + links:
+            found.append(os.path.join(relative_path, os.path.relpath(os.path.join(root, name), path)))
+    return found
+
+def _patch_lines(text):
+    # Lines split on '\n' only, so '\r' and other separators survive the diff
+    return re.findall(r'[^\n]*\n|[^\n]+\Z', text)
+
+def _git_blob_id(data):
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+def _git_literal(data):
+    # A 'literal' hunk of a git binary patch: zlib data in base85, up to 52
+    # bytes per line, each line prefixed with its length as A-Z / a-z
+    compressed = zlib.compress(data)
+    lines = [f"literal {len(data)}"]
+    for start in range(0, len(compressed), 52):
+        chunk = compressed[start:start + 52]
+        size = chr(ord('A') + len(chunk) - 1) if len(chunk) <= 26 else chr(ord('a') + len(chunk) - 27)
+        lines.append(size + base64.b85encode(chunk, pad=True).decode('ascii'))
+    return '\n'.join(lines) + '\n\n'
+
+def _file_patch(file_path, path, new):
+    # git-style patch turning the file at path into the bytes new (None removes it),
+    # applicable with `git apply` from the tree root
+    name = file_path.replace(os.sep, '/')
+    old, mode = None, '100644'
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        st = None
+    if st is not None and stat.S_ISLNK(st.st_mode):
+        old, mode = os.fsencode(os.readlink(path)), '120000'
+    elif st is not None:
+        with open(path, 'rb') as f:
+            old = f.read()
+        mode = '100755' if st.st_mode & 0o111 else '100644'
+
+    header = f"diff --git a/{name} b/{name}\n"
+    if old is None:
+        header += f"new file mode {mode}\n"
+    elif new is None:
+        header += f"deleted file mode {mode}\n"
+    try:
+        old_text = old.decode('utf-8') if old is not None else ''
+        new_text = new.decode('utf-8') if new is not None else ''
+    except UnicodeDecodeError:
+        new_data = new if new is not None else b''
+        return (header + f"index {_git_blob_id(old or b'')}..{_git_blob_id(new_data) if new is not None else '0' * 40}\n"
+                + "GIT binary patch\n" + _git_literal(new_data) + _git_literal(old or b''))
+
+    lines = difflib.unified_diff(_patch_lines(old_text), _patch_lines(new_text),
+                                 f"a/{name}" if old is not None else '/dev/null',
+                                 f"b/{name}" if new is not None else '/dev/null', lineterm='\n')
+    out = [header]
+    for line in lines:
+        out.append(line)
+        if not line.endswith('\n'):
+            out.append('\n\\ No newline at end of file\n')
+    return ''.join(out)
+
+class _StagedFile:
+    def __init__(self, file_path, path, missing, step_hash):
+        self.file_path = file_path
+        self.path = path
+        self.missing = missing
+        self.step_hash = step_hash
+        self.loaded = False
+        self.skip = False
+        self.preserve_times = False
+        self.content = None
+        self.original = None
+        self.input_hash = None
+
+# Staged edits for a RebrandingTool. Edits are queued per file and only run on
+# flush(), so each file is read at most once and written at most once, and
+# nothing touches the disk if the recipe fails halfway. On flush the recipe
+# steps that queued the edits are scheduled as a DAG over the files they touch.
+class Workspace:
+    def __init__(self, tool):
+        self.tool = tool
+        self.edits = {}     # file_path -> (starts_missing, [(edit, key, preserve_times, raw, step)])
+        self.deleted = []
+        self.delete_steps = {}
+        self.scheduler = None
+
+    def stage(self, file_path, edit, key, preserve_times=False, raw=False):
+        file_path = os.path.normpath(file_path)
+        if file_path not in self.edits:
+            missing = any(_is_under(file_path, d) for d in self.deleted)
+            self.edits[file_path] = (missing, [])
+        self.edits[file_path][1].append((edit, key, preserve_times, raw, self.tool.step))
+
+    def delete(self, relative_path):
+        relative_path = os.path.normpath(relative_path)
+        # Anything staged under a deleted path is superseded by the delete
+        for file_path in [p for p in self.edits if _is_under(p, relative_path)]:
+            del self.edits[file_path]
+        if relative_path not in self.deleted:
+            self.deleted.append(relative_path)
+            self.delete_steps[relative_path] = self.tool.step
+
+    def read(self, file_path, raw=False):
+        # What file_path will hold once the queued deletes and edits are
+        # flushed (None if it will not exist), as text or, with raw, as the
+        # exact bytes flush() would leave. The edits run on a copy with their
+        # messages dropped; nothing is recorded or written.
+        file_path = os.path.normpath(file_path)
+        missing, edits = self.edits.get(file_path, (any(_is_under(file_path, d) for d in self.deleted), []))
+        path = self.tool.resolve_path(file_path)
+        content = None if missing or not os.path.isfile(path) else self.tool._read(path, raw=True)
+        local = self.tool._local
+        messages, local.messages = getattr(local, 'messages', None), []
+        try:
+            for edit, _, _, edit_raw, _ in edits:
+                before = self._view(content, edit_raw)
+                after = edit(before)
+                if after != before:
+                    content = after
+        finally:
+            local.messages = messages
+        return self._view(content, raw)
+
+    def _view(self, content, raw):
+        # Staged content stays in the form its last edit produced: bytes for raw
+        # edits (literal replacements, which must not touch line endings), text
+        # for the rest; it is converted only when the next edit needs the other
+        if content is None:
+            return None
+        if raw:
+            return content if isinstance(content, bytes) else self.tool._encode(content)
+        return self.tool._decode(content) if isinstance(content, bytes) else content
+
+    def _dirty(self, staged_files):
+        # (staged, new bytes) for every file whose bytes the edits change
+        dirty = []
+        for staged in staged_files:
+            if staged.skip or staged.content is None:
+                continue
+            data = self._view(staged.content, True)
+            if data != staged.original:
+                dirty.append((staged, data))
+        return dirty
+
+    def _load(self, staged):
+        manifest = self.tool.manifest
+        staged.loaded = True
+        # The manifest describes what is on disk now, so it cannot vouch for a
+        # file that starts missing or sits under a delete queued in this flush
+        trusted = manifest is not None and not staged.missing and not any(
+            _is_under(staged.file_path, d) for d in self.deleted)
+        if trusted and manifest.unchanged(staged.file_path, staged.path, staged.step_hash):
+            staged.skip = True
+            return
+        if not staged.missing and os.path.isfile(staged.path):
+            staged.content = staged.original = self.tool._read(staged.path, raw=True)
+            staged.input_hash = content_digest(staged.content)
+        if (trusted and staged.content is not None
+                and manifest.already_applied(staged.file_path, staged.step_hash, staged.input_hash)):
+            staged.skip = True
+
+    def _run_unit(self, label, edits, messages):
+        profiler = self.tool.profiler
+        self.tool._local.messages = messages
+        try:
+            with profiler.span(label, 'step', label):
+                for staged, edit, key, preserve_times, raw, step in edits:
+                    with profiler.span(key[0], step=step.name if step is not None else None):
+                        if not staged.loaded:
+                            self._load(staged)
+                        if staged.skip:
+                            continue
+                        content = self._view(staged.content, raw)
+                        new_content = edit(content)
+                        staged.preserve_times = staged.preserve_times or preserve_times
+                        if new_content != content:
+                            staged.content = new_content
+                            profiler.count(path=staged.file_path)
+        finally:
+            self.tool._local.messages = None
+
+    def _run_edits(self):
+        # Group the queued edits into units: one per recipe step, or a single
+        # unit in staging order when edits were queued outside a step
+        staged_files, all_edits, units = [], [], {}
+        policy = (self.tool.encoding, self.tool.newline)
+        for file_path, (missing, edits) in self.edits.items():
+            step_hash = content_digest(repr([missing, policy] + [key for _, key, _, _, _ in edits]))
+            staged = _StagedFile(file_path, self.tool.resolve_path(file_path), missing, step_hash)
+            staged_files.append(staged)
+            for edit, key, preserve_times, raw, step in edits:
+                all_edits.append((staged, edit, key, preserve_times, raw, step))
+                units.setdefault(step, []).append((staged, edit, key, preserve_times, raw, step))
+        if None in units:
+            units = {None: all_edits}
+        order = sorted(units, key=lambda step: step.number if step is not None else 0)
+
+        scheduler = StepScheduler()
+        messages = {}
+        for step in order:
+            edits = units[step]
+            writes = {staged.file_path for staged, *_ in edits}
+            reads = set()
+            if step is not None:
+                writes |= set(step.writes)
+                reads = set(step.reads)
+            messages[step] = []
+            label = step.name if step is not None else 'staged edits'
+            scheduler.add(label, reads, writes,
+                          lambda label=label, edits=edits, out=messages[step]: self._run_unit(label, edits, out))
+        scheduler.run(self.tool.jobs)
+        for step in order:
+            for message in messages[step]:
+                print(message)
+        self.scheduler = scheduler if order != [None] else None
+        return staged_files
+
+    def _clear(self):
+        self.edits.clear()
+        self.deleted.clear()
+        self.delete_steps.clear()
+
+    def flush(self):
+        # Every edit runs and every new file is encoded before anything on disk
+        # changes, so a failing step leaves the tree untouched
+        staged_files = self._run_edits()
+        dirty = self._dirty(staged_files)
+
+        # Deletes queued by the same step go out as one bulk delete
+        groups = []
+        for relative_path in self.deleted:
+            step = self.delete_steps.get(relative_path)
+            if groups and groups[-1][0] is step:
+                groups[-1][1].append(relative_path)
+            else:
+                groups.append((step, [relative_path]))
+        for step, relative_paths in groups:
+            with self.tool.profiler.span('delete_path', step=step.name if step is not None else None):
+                self.tool._remove(relative_paths)
+
+        # Every dirty file goes to a temp file first; they are renamed into
+        # place together after one sync barrier
+        manifest = self.tool.manifest
+        try:
+            for staged, data in dirty:
+                self.tool._write(staged.path, data, defer=True, preserve_times=staged.preserve_times)
+            self.tool.writes.commit()
+        except BaseException:
+            self.tool.writes.discard()
+            raise
+
+        for staged in staged_files:
+            if staged.skip:
+                manifest.skipped += 1
+                if staged.content is not None:
+                    manifest.record(staged.file_path, staged.path, staged.step_hash,
+                                    staged.input_hash, staged.input_hash)
+            elif staged.content is not None and manifest is not None:
+                manifest.record(staged.file_path, staged.path, staged.step_hash,
+                                staged.input_hash, content_digest(self._view(staged.content, True)))
+
+        self._clear()
+        if manifest is not None:
+            manifest.save()
+        return len(dirty)
+
+    def diff(self):
+        # Patch text for everything flush() would change, produced one file at
+        # a time as the caller consumes it; nothing is written or removed
+        changed = {staged.file_path: data for staged, data in self._dirty(self._run_edits())}
+        removed = set()
+        for relative_path in self.deleted:
+            removed.update(_files_under(self.tool.resolve_path(relative_path), relative_path))
+        self._clear()
+        for file_path in sorted(set(changed) | removed):
+            yield _file_patch(file_path, self.tool.resolve_path(file_path), changed.get(file_path))
+
+# Article metadata for index_articles, read the way the MDX pipeline resolves
+# it: an explicit `export const metadata` wins over YAML frontmatter, and
+# remark-auto-metadata fills in the title from the first H1, the description
+# from the first paragraph after it and the dates. Only what this reading
+# reproduces exactly is indexed; anything else raises ValueError and the page
+# is left for the build to import.
+
+_FRONTMATTER = re.compile(r'\A---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)', re.DOTALL)
+_INLINE_MARKUP = [
+    (re.compile(r'!?\[([^\]]*)\]\([^)]*\)'), r'\1'),    # links and images keep their text
+    (re.compile(r'`([^`]*)`'), r'\1'),
+    (re.compile(r'(\*\*|__)(.+?)\1'), r'\2'),
+    (re.compile(r'(?<!\w)([*_])(.+?)\1(?!\w)'), r'\2'),
+    (re.compile(r'</?[A-Za-z][^>]*>'), ''),
+    (re.compile(r'\\([\\`*_{}\[\]()#+\-.!<>])'), r'\1'),
+]
+
+# Inline markup _plain_text does not resolve the way mdast-util-to-string
+# does: JSX, expressions, entities, escapes, tables, strikethrough, astral
+# characters (slice() counts UTF-16 units) and hard breaks
+_INEXACT_INLINE = re.compile(r'[<{}&\\|]|~~|[\U00010000-\U0010FFFF]|(?: {2}|\t)$')
+_BLOCK_MARKER = re.compile(r'(?:>|[-*+](?:\s|$)|\d+[.)](?:\s|$)|=+$|\|)')
+
+_JS_ESCAPE = re.compile(r'\\(u\{[0-9a-fA-F]{1,6}\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)', re.DOTALL)
+_JS_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v',
+               '\n': '', '\r\n': '', '\r': '', '\u2028': '', '\u2029': ''}
+_JS_NUMBER = re.compile(r'(?:(?:0|[1-9][\d_]*)(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE]\d+)?|0[xXoObB][\da-fA-F_]+')
+_JS_CONSTANTS = {'true': True, 'false': False, 'null': None}
+
+_YAML_KEY = re.compile(r'([A-Za-z_][\w-]*):(?:[ \t]+(.*)|[ \t]*$)')
+_YAML_ITEM = re.compile(r'[ \t]*-(?:[ \t]+(.*)|[ \t]*$)')
+_YAML_QUOTED = re.compile(r"""'((?:[^']|'')*)'|"([^"\\]*)"(?=[ \t]*(?:#|$))""")
+_YAML_NUMBER = re.compile(r'[-+]?(?:\d+|\.\d+|\d+\.\d*)(?:[eE][-+]?\d+)?|0o[0-7]+|0x[\da-fA-F]+')
+_YAML_CONSTANTS = {'~': None, 'null': None, 'Null': None, 'NULL': None, 'true': True, 'True': True,
+                   'TRUE': True, 'false': False, 'False': False, 'FALSE': False}
+
+def _js_string(body):
+    # Value of a string or template literal body
+    def unescape(m):
+        escape = m.group(1)
+        if escape[0] in 'ux' and len(escape) > 1:
+            return chr(int(escape.strip('ux{}'), 16))
+        if escape == '0' and not body[m.end():m.end() + 1].isdigit():
+            return '\0'
+        if escape.isdigit() or escape in ('u', 'x'):
+            raise ValueError(f"legacy escape \\{escape}")
+        return _JS_ESCAPES.get(escape, escape)
+    # Join \uD83D\uDE00-style surrogate pairs; a lone surrogate raises
+    return _JS_ESCAPE.sub(unescape, body).encode('utf-16', 'surrogatepass').decode('utf-16')
+
+def _exact_number(value, text):
+    # Numbers JSON carries to JS unchanged: integers within 2**53, finite floats
+    if not abs(value) <= 2 ** 53:
+        raise ValueError(f"number {text}")
+    return int(value) if value == int(value) else value
+
+def _js_number(text):
+    if not _JS_NUMBER.fullmatch(text):
+        raise ValueError(f"number {text}")
+    return _exact_number(int(text, 0) if text[:2].lower() in ('0x', '0o', '0b') else float(text), text)
+
+def _js_literal(index, tokens, k):
+    # The JSON value of the literal starting at tokens[k] and the index after
+    # it: strings, plain templates, numbers, true/false/null and arrays and
+    # objects of them. Identifiers, spreads, calls and computed, shorthand or
+    # method properties raise ValueError.
+    token, value = tokens[k], index.token_text(tokens[k])
+    if token.kind == 'string':
+        return _js_string(value[1:-1]), k + 1
+    if token.kind == 'template' and '${' not in value:
+        return _js_string(value[1:-1].replace('\r\n', '\n').replace('\r', '\n')), k + 1
+    if token.kind == 'number':
+        return _js_number(value), k + 1
+    if value in ('-', '+') and tokens[k + 1].kind == 'number':
+        number = _js_number(index.token_text(tokens[k + 1]))
+        return -number if value == '-' else number, k + 2
+    if token.kind == 'name' and value in _JS_CONSTANTS:
+        return _JS_CONSTANTS[value], k + 1
+    if value not in ('[', '{'):
+        raise ValueError(f"expression {value}")
+    close = ']' if value == '[' else '}'
+    items, data, k = [], {}, k + 1
+    while index.token_text(tokens[k]) != close:
+        if value == '[':
+            item, k = _js_literal(index, tokens, k)
+            items.append(item)
+        else:
+            key, name = tokens[k], index.token_text(tokens[k])
+            if key.kind == 'string':
+                name = _js_string(name[1:-1])
+            elif key.kind != 'name' and not (key.kind == 'number' and re.fullmatch(r'0|[1-9]\d*', name)):
+                raise ValueError(f"property {name}")
+            if name == '__proto__' or index.token_text(tokens[k + 1]) != ':':
+                raise ValueError(f"property {name}")
+            # A repeated key keeps its first position and its last value, as in JS
+            data[name], k = _js_literal(index, tokens, k + 2)
+        separator = index.token_text(tokens[k])
+        if separator == ',':
+            k += 1
+        elif separator != close:
+            raise ValueError(f"unexpected {separator}")
+    return items if value == '[' else data, k + 1
+
+def _esm_blocks(body):
+    # Top-level import/export blocks of an MDX body: paragraphs starting with
+    # either keyword at column 0, outside code fences
+    block, fence, blank = None, None, True
+    for line in body.splitlines() + ['']:
+        stripped = line.strip()
+        if block is not None:
+            if stripped:
+                block.append(line)
+                continue
+            yield '\n'.join(block)
+            block = None
+        if fence is not None:
+            if stripped.startswith(fence):
+                fence = None
+        elif stripped.startswith(('```', '~~~')):
+            fence = stripped[:3]
+        elif blank and re.match(r'(?:import|export)\b', line):
+            block = [line]
+        blank = not stripped
+
+def _metadata_export(body):
+    # The object of the page's `export const metadata = {...}`, None without one
+    for block in _esm_blocks(body):
+        index = SourceIndex(block)
+        declaration = index.declaration('metadata')
+        if declaration is None:
+            if any(t.kind == 'name' and index.token_text(t) == 'metadata' for t in index.tokens):
+                raise ValueError('metadata is not a plain const export')
+            continue
+        tokens = [t for t in index.tokens if declaration.start <= t.start < declaration.end]
+        if [index.token_text(t) for t in tokens[:4]] != ['export', 'const', 'metadata', '=']:
+            raise ValueError('metadata is not a plain const export')
+        metadata, k = _js_literal(index, tokens, 4)
+        if not isinstance(metadata, dict) or [index.token_text(t) for t in tokens[k:]] not in ([], [';']):
+            raise ValueError('metadata is not an object literal')
+        return metadata
+    return None
+
+def _yaml_scalar(value):
+    # One scalar under the YAML 1.2 core schema remark-mdx-frontmatter's
+    # parser uses; quoted strings without escapes, plain strings, numbers,
+    # booleans and null
+    value = value.strip()
+    if value[:1] in ('"', "'"):
+        match = _YAML_QUOTED.match(value)
+        rest = value[match.end():].strip() if match else '-'
+        if rest and not (rest.startswith('#') and value[match.end()].isspace()):
+            raise ValueError(f"quoted scalar {value}")
+        return match.group(1).replace("''", "'") if match.group(1) is not None else match.group(2)
+    value = '' if value.startswith('#') else re.sub(r'[ \t]+#.*', '', value)
+    if not value or value in _YAML_CONSTANTS:
+        return _YAML_CONSTANTS.get(value)
+    if value[0] in '[]{}&*!|>%@`,' or re.match(r'[-?:](?:\s|$)', value) or ': ' in value or value.endswith(':'):
+        raise ValueError(f"scalar {value}")
+    if _YAML_NUMBER.fullmatch(value):
+        return _exact_number(int(value, 0) if value[:2] in ('0o', '0x') else float(value), value)
+    if re.fullmatch(r'[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN)', value):
+        raise ValueError(f"scalar {value}")
+    return value
+
+def _frontmatter(text):
+    # The block-mapping subset articles use: `key: scalar` and `key:` followed
+    # by `- scalar` items
+    data, key = {}, None
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        item = _YAML_ITEM.match(line)
+        if item and key is not None:
+            if data[key] is None:
+                data[key] = []
+            data[key].append(_yaml_scalar(item.group(1) or ''))
+            continue
+        match = _YAML_KEY.match(line)
+        if not match or match.group(1) in data:
+            raise ValueError(f"frontmatter line {line!r}")
+        value = match.group(2) or ''
+        if value.strip() and not value.strip().startswith('#'):
+            data[match.group(1)], key = _yaml_scalar(value), None
+        else:
+            data[match.group(1)], key = None, match.group(1)
+    if not data:
+        raise ValueError('empty frontmatter')
+    return data
+
+def _plain_text(markdown):
+    for pattern, replacement in _INLINE_MARKUP:
+        markdown = pattern.sub(replacement, markdown)
+    return markdown
+
+def _title_and_description(body):
+    # First H1 and the first paragraph after it, skipping code fences, ESM
+    # and JSX blocks; list and quote markers are dropped as mdast would.
+    # exact is False when either may differ from what remark reads: markup
+    # around or inside them that this line-based reading does not resolve.
+    title, paragraph, fence, esm, blank, exact = None, [], None, False, True, True
+    for line in body.splitlines():
+        stripped = line.strip()
+        if fence is not None:
+            if stripped.startswith(fence):
+                fence = None
+            continue
+        if esm:
+            esm = bool(stripped)
+            continue
+        if stripped.startswith(('```', '~~~')):
+            if paragraph:
+                break
+            fence = stripped[:3]
+            continue
+        if blank and not paragraph and re.match(r'(?:import|export)\b', line):
+            esm = True
+            continue
+        blank = not stripped
+        if title is None:
+            if stripped.startswith('# '):
+                title = _plain_text(stripped[2:].strip().rstrip('#').strip())
+                exact = exact and not _INEXACT_INLINE.search(line)
+            elif stripped.startswith('<') or _BLOCK_MARKER.match(stripped):
+                # May hold an H1 of its own (JSX, quote, list, setext underline)
+                exact = False
+            continue
+        if not stripped or stripped.startswith(('#', '<', '|', 'import ', 'export ', '---', '***')):
+            if paragraph:
+                break
+            exact = exact and not stripped.startswith(('<', '|', 'import ', 'export '))
+            continue
+        marker = re.match(r'^(?:>\s*|[-*+]\s+|\d+[.)]\s+)+', stripped)
+        exact = exact and not marker and not _INEXACT_INLINE.search(line)
+        paragraph.append(stripped[marker.end():] if marker else stripped)
+    description = None
+    if paragraph:
+        description = _plain_text('\n'.join(paragraph))[:160].strip()
+        if len(description) == 160:
+            description += '...'
+    return title, description, exact
+
+def _utc_date(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).date().isoformat()
+
+def _article_metadata(path, dates=None, data=None):
+    # (blob id, metadata) of a page; metadata is None when the build may
+    # resolve it differently: a page this reading cannot reproduce, or one
+    # whose dates would come from file times (no index_dates entry for its
+    # current blob). data: the page's bytes when they differ from what is on
+    # disk or the page only exists in staging.
+    if data is None:
+        with open(path, 'rb') as f:
+            data = f.read()
+    blob = _git_blob_id(data)
+    if not (dates and len(dates) > 2 and dates[2] == blob):
+        return blob, None
+    try:
+        text = data.decode('utf-8')
+        match = _FRONTMATTER.match(text)
+        body = text[match.end():] if match else text
+        metadata = _metadata_export(body)
+        if metadata is not None and match:
+            raise ValueError('both frontmatter and a metadata export')
+        if metadata is None:
+            metadata = _frontmatter(match.group(1)) if match else {}
+        title, description, exact = _title_and_description(body)
+        if not exact and ('title' not in metadata or 'description' not in metadata):
+            raise ValueError('inexact title or description')
+    except (ValueError, IndexError):
+        return blob, None
+    created, modified = dates[:2]
+    for key, value in (('title', title), ('description', description), ('date', modified or created),
+                       ('dateCreated', created), ('dateModified', modified)):
+        if value and key not in metadata:
+            metadata[key] = value
+    return blob, metadata
+
+def _git_lines(root, args):
+    # NUL-separated records of a git command, streamed as they are produced
+    with subprocess.Popen(['git', *args], cwd=root, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+        rest = b''
+        for chunk in iter(lambda: proc.stdout.read(STREAM_CHUNK_SIZE), b''):
+            records = (rest + chunk).split(b'\0')
+            rest = records.pop()
+            for record in records:
+                yield os.fsdecode(record)
+        if rest:
+            yield os.fsdecode(rest)
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, ['git', *args])
+
+def _commit_dates(root, pathspecs):
+    # {path: [first, last, blob]} commit dates (UTC, YYYY-MM-DD) of the tracked
+    # files matching pathspecs, from one `git log --name-only` walk, with the
+    # git blob id each file has at HEAD: the dates only describe that content.
+    # Paths are relative to root and '/'-separated.
+    specs = ['--', *(f':(glob){spec}' for spec in pathspecs)]
+    tracked = set(_git_lines(root, ['ls-files', '-z', *specs]))
+    blobs = {}
+    for record in _git_lines(root, ['ls-tree', '-r', '-z', 'HEAD']):
+        info, _, name = record.partition('\t')
+        if name in tracked:
+            blobs[name] = info.split()[2]
+    dates, day = {}, None
+    for record in _git_lines(root, ['log', '--format=%x01%at', '-z', '--name-only', '--relative', *specs]):
+        if record.startswith('\x01'):
+            day = _utc_date(int(record[1:]))
+            continue
+        name = record.lstrip('\n')
+        if name not in blobs:
+            continue
+        span = dates.get(name)
+        if span is None:
+            dates[name] = [day, day, blobs[name]]
+        else:
+            span[0], span[1] = min(span[0], day), max(span[1], day)
+    return dates
+
+# Search sections for index_search, extracted the way extractSections in
+# src/mdx/search.mjs does: every h1/h2 opens a [title, hash, [content, ...]]
+# section (h1 without a hash, h2 with a slug unique within the page) and deeper
+# headings and paragraphs are appended to the open one. Code, ESM, tables and
+# JSX tag lines are not paragraphs; frontmatter is skipped.
+
+_ANNOTATION = re.compile(r'\{\{.*?\}\}|\{[^{}]*\}')
+_LIST_MARKER = re.compile(r'^(?:>\s*)*(?:[-*+]|\d+[.)])\s+')
+_HEADING = re.compile(r'(#{1,6})\s+(.*?)(?:\s+#+)?$')
+
+# Default options of @sindresorhus/slugify 2.x: its replacements, then
+# transliterate's diacritic stripping, then decamelize
+_SLUG_REPLACEMENTS = (('&', ' and '), ('\U0001F984', ' unicorn '), ('\u2665', ' love '))
+_DECAMELIZE = [
+    (re.compile(r'([A-Z]{2,})(\d+)'), r'\1 \2'),
+    (re.compile(r'([a-z\d]+)([A-Z]{2,})'), r'\1 \2'),
+    (re.compile(r'([a-z\d])([A-Z])'), r'\1 \2'),
+    # [a-rt-z] leaves plural acronyms such as APIs together
+    (re.compile(r'([A-Z]+)([A-Z][a-rt-z\d]+)'), r'\1 \2'),
+]
+
+def _slugify(text):
+    # slugify(text); None when characters outside ASCII remain after
+    # stripping diacritics, as transliterate's tables may map those to letters
+    text = unicodedata.normalize('NFC', text)
+    for old, new in _SLUG_REPLACEMENTS:
+        text = text.replace(old, new)
+    # \p{Diacritic} also covers the ASCII ^ and `
+    text = ''.join(c for c in unicodedata.normalize('NFD', text) if not unicodedata.combining(c) and c not in '^`')
+    text = unicodedata.normalize('NFC', text)
+    if not text.isascii():
+        return None
+    for pattern, replacement in _DECAMELIZE:
+        text = pattern.sub(replacement, text)
+    text = re.sub(r"([a-zA-Z\d]+)'([ts])(\s|$)", r'\1\2\3', text.lower())
+    text = re.sub(r'[^a-z\d]+', '-', text)
+    return re.sub(r'-{2,}', '-', text).strip('-')
+
+def _slug_counter():
+    # slugifyWithCounter(): repeated slugs get -2, -3, ... within one page
+    occurrences = {}
+
+    def countable(text):
+        slug = _slugify(text)
+        if not slug:
+            return slug
+        numberless = occurrences.get(re.sub(r'(?:-\d+?)+?$', '', slug), 0)
+        occurrences[slug] = occurrences.get(slug, 0) + 1
+        if occurrences[slug] >= 2 or numberless > 2:
+            slug = f"{slug}-{occurrences[slug]}"
+        return slug
+    return countable
+
+def _section_text(markdown):
+    return _plain_text(_ANNOTATION.sub('', markdown)).strip()
+
+def _page_sections(text):
+    # None when a heading's slug cannot be reproduced exactly
+    match = _FRONTMATTER.match(text)
+    if match:
+        text = text[match.end():]
+    sections, slugify, paragraph = [], _slug_counter(), []
+    fence = esm = None
+
+    def add_paragraph():
+        content = _section_text('\n'.join(paragraph))
+        if content and sections:
+            sections[-1][2].append(content)
+        paragraph.clear()
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if fence is not None:
+            if stripped.startswith(fence):
+                fence = None
+            continue
+        if esm:
+            esm = bool(stripped)
+            continue
+        heading = _HEADING.match(stripped)
+        tag = stripped.startswith('<') and stripped.endswith('>')
+        if not stripped or heading or tag or stripped.startswith(('```', '~~~', '|')) or _LIST_MARKER.match(stripped):
+            add_paragraph()
+        if not stripped or tag or stripped.startswith('|'):
+            continue
+        if stripped.startswith(('```', '~~~')):
+            fence = stripped[:3]
+        elif line.startswith(('import ', 'export ')) and not paragraph:
+            esm = True
+        elif heading:
+            depth, title = len(heading.group(1)), _section_text(heading.group(2))
+            if depth <= 2:
+                slug = slugify(title) if depth == 2 else None
+                if depth == 2 and slug is None:
+                    return None
+                sections.append([title, slug, []])
+            elif title and sections:
+                sections[-1][2].append(title)
+        else:
+            paragraph.append(_LIST_MARKER.sub('', stripped))
+    add_paragraph()
+    return sections
+
+def _search_shard(file_path):
+    # Pages are sharded by their top-level section; pages directly under the
+    # root go to 'index'
+    parts = file_path.split('/')
+    return parts[0] if len(parts) > 1 else 'index'
 
 class RebrandingTool:
-    def __init__(self, root_dir='.'):
+    def __init__(self, root_dir='.', jobs=1, patterns=None, incremental=False, durable=True, trash=False,
+                 dry_run=False, encoding=ENCODING, newline=NEWLINE, large_file_size=LARGE_FILE_SIZE):
+        if newline not in NEWLINES:
+            raise ValueError(f"unknown newline policy {newline!r} (expected one of {', '.join(NEWLINES)})")
         self.root_dir = root_dir
+        self.encoding = codecs.lookup(encoding).name
+        self.newline = newline
+        self.large_file_size = large_file_size
+        self.patterns = patterns if patterns is not None else PATTERNS
+        # jobs <= 0 means one worker per CPU
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.workspace = None
+        self.step = None
+        self._local = threading.local()
+        self.profiler = Profiler()
+        self.writes = WriteBatch(durable)
+        self.trash = trash
+        self.reclaiming = []
+        # Date indexes built by index_dates this run, by output path, so later
+        # steps see them even when the write is only staged
+        self.commit_dates = {}
+        # A dry run stages everything in one workspace that is never flushed;
+        # diff() reports what flushing it would change
+        self.dry_run = dry_run
+        if dry_run:
+            incremental = False
+            self.workspace = Workspace(self)
+        self.manifest = Manifest(self.resolve_path(MANIFEST_PATH)) if incremental else None
+        self.scan_cache = self.resolve_path(SCAN_CACHE_PATH) if incremental else None
+        self.search_cache = self.resolve_path(SEARCH_CACHE_PATH) if incremental else None
 
     def resolve_path(self, path):
         return os.path.join(self.root_dir, path)
 
-    def replace_in_file(self, file_path, search_pattern, replacement, flags=re.DOTALL, skip_hint=None):
-        path = self.resolve_path(file_path)
-        if not os.path.exists(path):
-            print(f"Warning: File {file_path} not found.")
+    def stage(self):
+        if self.workspace is None:
+            self.workspace = Workspace(self)
+
+    def flush(self):
+        if self.workspace is None or self.dry_run:
             return
+        workspace, self.workspace = self.workspace, None
+        with self.profiler.span('flush', 'phase'):
+            written = workspace.flush()
+            self.sync()
+        print(f"Flushed {written} staged file(s)")
+        if workspace.scheduler is not None:
+            path, total = workspace.scheduler.critical_path()
+            if path:
+                busy = sum(workspace.scheduler.durations)
+                print(f"Critical path: {' -> '.join(path)} "
+                      f"({total * 1000:.1f}ms of {busy * 1000:.1f}ms step time)")
+        if self.manifest is not None and self.manifest.skipped:
+            print(f"Skipped {self.manifest.skipped} file(s) unchanged since the last run")
+            self.manifest.skipped = 0
+
+    def diff(self):
+        # Lazily yields one git-style patch per file the staged edits would
+        # change, then leaves the workspace empty
+        workspace = self.workspace
+        if self.dry_run:
+            self.workspace = Workspace(self)
+        else:
+            self.workspace = None
+        return workspace.diff() if workspace is not None else iter(())
+
+    def write_diff(self, out):
+        changed = 0
+        with self.profiler.span('diff', 'phase'):
+            for patch in self.diff():
+                out.write(patch)
+                changed += 1
+        return changed
+
+    def sync(self):
+        # Durability barrier for everything written since the last one; run
+        # once per phase rather than per file
+        with self.profiler.span('sync', 'io'):
+            self.writes.sync()
+
+    def _log(self, message):
+        # Edits run on scheduler threads buffer their messages so output stays
+        # in recipe order
+        messages = getattr(self._local, 'messages', None)
+        if messages is None:
+            print(message)
+        else:
+            messages.append(message)
 
-        with open(path, 'r') as f:
-            content = f.read()
+    def _read(self, path, raw=False):
+        with open(path, 'rb') as f:
+            data = f.read()
+        self.profiler.count(bytes_read=len(data))
+        return data if raw else self._decode(data)
 
-        # Idempotency check: if hint (or first non-empty line of replacement) is in file, skip
-        hint = skip_hint if skip_hint else (replacement.split('\n')[0].strip() if replacement.strip() else None)
-        if hint and hint in content:
-            print(f"Skipping {file_path} - replacement (hint: '{hint}') already present.")
-            return
+    def _decode(self, data):
+        return _decode(data, self.encoding, self.newline)
 
-        new_content = re.sub(search_pattern, replacement, content, flags=flags)
-        if new_content != content:
-            with open(path, 'w') as f:
-                f.write(new_content)
-            print(f"Updated {file_path}")
-        else:
-            print(f"No changes for {file_path} (pattern not found)")
+    def _encode(self, content):
+        return _encode(content, self.encoding, self.newline)
 
-    def replace_global(self, search, replace, excludes=None):
-        if excludes is None:
-            excludes = {'.git', '.next', 'node_modules', 'out', '.vscode', 'scripts'}
-        
-        print(f"Global replacement: '{search}' -> '{replace}'")
-        for root, dirs, files in os.walk(self.root_dir):
-            dirs[:] = [d for d in dirs if d not in excludes]
-            for file in files:
-                if file.endswith(('.js', '.jsx', '.ts', '.tsx', '.css', '.md', '.mdx', '.json')):
-                    file_path = os.path.relpath(os.path.join(root, file), self.root_dir)
-                    self._simple_replace(file_path, search, replace)
-
-    def _simple_replace(self, file_path, search, replace):
-        path = self.resolve_path(file_path)
-        with open(path, 'r') as f:
-            content = f.read()
-        new_content = content.replace(search, replace)
-        if new_content != content:
-            with open(path, 'w') as f:
-                f.write(new_content)
-            print(f"Updated {file_path}")
-
-    def write_file(self, file_path, content):
-        path = self.resolve_path(file_path)
+    def _write(self, path, content, defer=False, preserve_times=False):
+        if isinstance(content, str):
+            content = self._encode(content)
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w') as f:
-            f.write(content)
-        print(f"Created/Updated {file_path}")
-
-    def delete_path(self, relative_path):
-        path = self.resolve_path(relative_path)
-        if os.path.exists(path):
-            if os.path.isdir(path):
-                shutil.rmtree(path)
-            else:
+        size = self.writes.write(path, content, defer, preserve_times)
+        self.profiler.count(bytes_written=size, path=os.path.relpath(path, self.root_dir))
+
+    def _remove(self, relative_paths, trash=None):
+        trash = self.trash if trash is None else trash
+        # Resolve the whole list in one pass: one lstat per path, and nothing
+        # that an earlier or later entry already covers is removed twice
+        found = []
+        for relative_path in dict.fromkeys(os.path.normpath(p) for p in relative_paths):
+            path = self.resolve_path(relative_path)
+            try:
+                is_dir = stat.S_ISDIR(os.lstat(path).st_mode)
+            except FileNotFoundError:
+                continue
+            found.append((relative_path, path, is_dir))
+        roots = [(path, is_dir) for relative_path, path, is_dir in found
+                 if not any(other != relative_path and _is_under(relative_path, other) for other, _, _ in found)]
+
+        trees = [path for path, is_dir in roots if is_dir]
+        if trash and trees:
+            trees = self._move_to_trash(trees)
+        for path, is_dir in roots:
+            if not is_dir:
                 os.remove(path)
+        if trees:
+            _remove_trees(trees)
+
+        for relative_path, path, _ in found:
+            self.writes.add(os.path.dirname(path))
+            self.profiler.count(path=relative_path)
             print(f"Deleted {relative_path}")
 
-    def delete_line(self, file_path, pattern):
+    def _move_to_trash(self, trees):
+        # Renames trees into the trash directory and reclaims it on a background
+        # thread (non-daemon, so the interpreter still waits for it on exit).
+        # Returns the trees that could not be moved, e.g. across filesystems.
+        trash_root = self.resolve_path(TRASH_PATH)
+        os.makedirs(trash_root, exist_ok=True)
+        # Leftovers of an interrupted run are reclaimed along with this batch
+        reclaim = [entry.path for entry in os.scandir(trash_root)]
+        batch = tempfile.mkdtemp(dir=trash_root)
+        remaining = []
+        for index, path in enumerate(trees):
+            try:
+                os.rename(path, os.path.join(batch, str(index)))
+            except OSError:
+                remaining.append(path)
+        reclaim.append(batch)
+        thread = threading.Thread(target=lambda: [shutil.rmtree(p, ignore_errors=True) for p in reclaim],
+                                  name='rebrand-trash')
+        thread.start()
+        self.reclaiming.append(thread)
+        return remaining
+
+    def _edit(self, file_path, edit, key, preserve_times=False, raw=False):
+        # edit(content) -> new content; content is None when the file is missing,
+        # and the file's bytes rather than decoded text for raw edits. key
+        # identifies the operation and its arguments for the manifest. Files
+        # are only written when their content actually changes.
+        if self.workspace is not None:
+            self.workspace.stage(file_path, edit, key, preserve_times, raw)
+            return
         path = self.resolve_path(file_path)
-        if not os.path.exists(path): return
-        with open(path, 'r') as f:
-            lines = f.readlines()
-        
-        new_lines = [l for l in lines if not re.search(pattern, l)]
-        if len(new_lines) != len(lines):
-            with open(path, 'w') as f:
-                f.writelines(new_lines)
-            print(f"Updated {file_path} (deleted lines matching '{pattern}')")
+        content = self._read(path, raw) if os.path.isfile(path) else None
+        new_content = edit(content)
+        if new_content is not None and new_content != content:
+            self._write(path, new_content, preserve_times=preserve_times)
 
-    def delete_block(self, file_path, start_pattern, end_pattern):
-        path = self.resolve_path(file_path)
-        if not os.path.exists(path): return
-        with open(path, 'r') as f:
-            content = f.read()
-        
-        pattern = re.escape(start_pattern) + r".*?" + re.escape(end_pattern)
-        new_content = re.sub(pattern, "", content, flags=re.DOTALL)
-        if new_content != content:
-            with open(path, 'w') as f:
-                f.write(new_content)
-            print(f"Updated {file_path} (deleted block)")
+    @_profiled('replace_in_file')
+    def replace_in_file(self, file_path, search_pattern, replacement, flags=re.DOTALL, skip_hint=None):
+        pattern = self.patterns.get(search_pattern, flags)
 
-    def comment_block(self, file_path, start_pattern, end_pattern):
+        # Idempotency check: if hint (or first non-empty line of replacement) is in file, skip
+        hint = skip_hint if skip_hint else (replacement.split('\n')[0].strip() if replacement.strip() else None)
+
+        def edit(content):
+            if content is None:
+                self._log(f"Warning: File {file_path} not found.")
+                return None
+
+            if hint and hint in content:
+                self._log(f"Skipping {file_path} - replacement (hint: '{hint}') already present.")
+                return content
+
+            with self.patterns.matching():
+                new_content, matches = pattern.subn(replacement, content)
+            self.profiler.count(matches=matches)
+            if new_content != content:
+                self._log(f"Updated {file_path}")
+            else:
+                self._log(f"No changes for {file_path} (pattern not found)")
+            return new_content
+
+        key = ('replace_in_file', search_pattern, replacement, flags, skip_hint)
         path = self.resolve_path(file_path)
-        if not os.path.exists(path): return
-        with open(path, 'r') as f:
-            content = f.read()
-        
-        if f'{{/* {start_pattern}' in content:
-            print(f"Skipping comment block in {file_path} - already commented.")
+        if self.workspace is None and _is_large(path, self.large_file_size) and self._streamable(path):
+            self._replace_large(file_path, path, search_pattern, replacement, flags, hint)
             return
+        self._edit(file_path, edit, key)
+
+    def _streamable(self, path):
+        # Matching the raw bytes only gives the text path's result when decoding
+        # would leave them alone: a byte-safe encoding and no newline rewrite
+        # ('lf' only rewrites files that contain a CR)
+        if not _byte_safe(self.encoding) or self.newline == 'crlf':
+            return False
+        if self.newline == 'keep':
+            return True
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return data.find(b'\r') == -1
+
+    def _replace_large(self, file_path, path, search_pattern, replacement, flags, hint):
+        if hint:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                present = data.find(hint.encode(self.encoding, 'surrogateescape')) != -1
+            if present:
+                self._log(f"Skipping {file_path} - replacement (hint: '{hint}') already present.")
+                return
+        pattern = self.patterns.get(search_pattern.encode(self.encoding), flags & ~re.UNICODE)
+        size = os.path.getsize(path)
+        with self.patterns.matching():
+            count, written = _mmap_sub(path, pattern, replacement.encode(self.encoding))
+        self.profiler.count(bytes_read=size, bytes_written=written, matches=count,
+                            path=file_path if count else None)
+        if count:
+            self.writes.add(path)
+            self._log(f"Updated {file_path}")
+        else:
+            self._log(f"No changes for {file_path} (pattern not found)")
 
-        def replacer(match):
-            return f"{{/* {match.group(0)} */}}"
-
-        pattern = re.escape(start_pattern) + r".*?" + re.escape(end_pattern)
-        new_content = re.sub(pattern, replacer, content, flags=re.DOTALL)
-        if new_content != content:
-            with open(path, 'w') as f:
-                f.write(new_content)
-            print(f"Updated {file_path} (commented block)")
-
-def run_rebrand():
-    tool = RebrandingTool()
-
-    print("--- Phase 1: Global Replacements ---")
-    tool.replace_global("emerald", "red")
-
-    print("\n--- Phase 2: File Deletion ---")
-    to_delete = [
-        "src/app/attachments", "src/app/authentication", "src/app/contacts", 
-        "src/app/conversations", "src/app/errors", "src/app/groups", 
-        "src/app/messages", "src/app/pagination", "src/app/quickstart", 
-        "src/app/sdks", "src/app/webhooks",
-        "src/components/Libraries.jsx", "src/components/Guides.jsx", 
-        "src/components/Resources.jsx", "src/components/Feedback.jsx",
-        "LICENSE.md", "CHANGELOG.md"
-    ]
-    for p in to_delete:
-        tool.delete_path(p)
-
-    print("\n--- Phase 3: Applying Customizations (Snapshot Restoration) ---")
-    
-    # 1. Page MDX
-    tool.write_file('src/app/page.mdx', """
-export const metadata = {
-  title: 'Your Gateway to Tech Excellence',
-  description:
-    'We offers a wealth of information, news, and insights into the ever-evolving world of technology. Whether you are a tech enthusiast, professional, or simply curious about the latest trends, TechnoBureau provides you with a one-stop hub to stay up-to-date and explore the fascinating realm of innovation.',
-}
-
-export const sections = []
-
-## Stay Informed, Stay Ahead
-
-Our commitment is to deliver comprehensive and engaging content that spans various areas of interest, including the latest devops tools, emerging technologies, software and apps, internet trends, cybersecurity, artificial intelligence, and much more. With a team of experienced writers and tech experts, we curate in-depth articles, insightful reviews, and thought-provoking analysis to ensure you have access to reliable and relevant information.
-
-## Mastering Kubernetes
-
-Unlock the full potential of container orchestration with our in-depth coverage of Kubernetes. Dive into the intricacies of Kubernetes architecture, deployment strategies, scalability, monitoring, and management techniques. TechnoBureau equips you with the knowledge and skills to confidently design, deploy, and manage scalable and resilient applications on Kubernetes, propelling your DevOps career to new heights.
-
-## Career Advancement
-
-TechnoBureau is dedicated to supporting your career advancement in the Linux and DevOps domains. Our comprehensive guides, career-focused articles, and expert advice offer practical insights and strategies to help you achieve your professional goals. Whether you're aiming to land your dream job, enhance your technical skills, or transition into a DevOps role, TechnoBureau provides the guidance and resources you need to succeed.
-""")
-    
-    # 2. Logo
-    tool.write_file('src/components/Logo.jsx', """export function Logo(props) {
-  return (
-    <svg viewBox="0 0 129 24" aria-hidden="true" {...props}>
-      <g>
-        <path
-          className="fill-red-400"
-          d="M16 8a5 5 0 0 0-5-5H5a5 5 0 0 0-5 5v13.927a1 1 0 0 0 1.623.782l3.684-2.93a4 4 0 0 1 2.49-.87H11a5 5 0 0 0 5-5V8Z"
-        />
-        <text x="25" y="15" dominantBaseline="middle" className="fill-red-400">TechnoBureau</text>
-      </g>
-    </svg>
-  );
-}
-""")
-    
-    # 3. Sidebar Store
-    tool.write_file('src/hooks/useSidebarStore.js', """'use client'
-import { create } from 'zustand'
-
-export const useSidebarStore = create()((set) => ({
-  isOpen: false,
-  open: () => set({ isOpen: true }),
-  close: () => set({ isOpen: false }),
-  toggle: () => set((state) => ({ isOpen: !state.isOpen })),
-}))
-""")
-
-    # 4. Navigation
-    # Replace the navigation array
-    tool.replace_in_file(
-        'src/components/Navigation.jsx',
-        r'export const navigation = \[[\s\S]*?\]',
-        """export const navigation = [
-  {
-    title: 'Guides',
-    links: [
-      { title: 'Introduction', href: '/' },
-      {
-        title: 'DevOps', href: '/devops',
-        links: [
-          { title: 'General', href: '/devops/general' },
-          { title: 'CI/CD', href: '/devops/ci-cd' },
-          { title: 'Terraform', href: '/devops/terraform' },
-          // { title: 'Ansible', href: '/devops/ansible' },
-        ]
-      },
-      {
-        title: 'Kubernetes', href: '/kubernetes',
-        links: [
-          { title: 'General', href: '/kubernetes/general' },
-          { title: 'Deployment', href: '/kubernetes/deployment' },
-          // { title: 'Services', href: '/kubernetes/services' },
-        ]
-      },
-      {
-        title: 'Linux',
-        href: '/linux',
-        links: [
-          { title: 'General', href: '/linux/general' },
-          { title: 'System Administration', href: '/linux/administration' },
-          { title: 'MySQL', href: '/linux/mysql' },
-        ]
-      },
-      {
-        title: 'Career',
-        href: '/career',
-        links: [
-          { title: 'General', href: '/career/general' },
-        ]
-      },
-    ],
-  },
-]"""
-    )
-
-    # Ensure navigation container is excluded from snippets
-    tool.replace_in_file(
-        'src/components/Navigation.jsx',
-        r'<nav \{\.\.\.props\}>',
-        """<nav data-nosnippet {...props}>"""
-    )
-
-    # 5. Mobile Navigation
-    # Replace the MobileNavigation component and store
-    tool.replace_in_file(
-        'src/components/MobileNavigation.jsx',
-        r'export const useMobileNavigationStore = create[\s\S]*?\)\)',
-        """export const useMobileNavigationStore = create()((set) => ({
-  isOpen: false,
-  open: () => set({ isOpen: true }),
-  close: () => set({ isOpen: false }),
-  toggle: () => set((state) => ({ isOpen: !state.isOpen })),
-}))"""
-    )
-    
-    # Replace MobileNavigation main component
-    tool.replace_in_file(
-        'src/components/MobileNavigation.jsx',
-        r'export function MobileNavigation\(\) \{[\s\S]*?\}',
-        """export function MobileNavigation() {
-  let isInsideMobileNavigation = useIsInsideMobileNavigation()
-  let { isOpen: mobileNavIsOpen, toggle: toggleMobileNav, close: closeMobileNav } = useMobileNavigationStore()
-  let { isOpen: sidebarIsOpen, toggle: toggleSidebar } = useSidebarStore()
-
-  // The toggle button icon reflects BOTH states
-  let isAnyOpen = mobileNavIsOpen || sidebarIsOpen
-  let ToggleIcon = isAnyOpen ? XIcon : MenuIcon
-
-  return (
-    <IsInsideMobileNavigationContext.Provider value={true}>
-      <button
-        type="button"
-        className="relative flex size-6 items-center justify-center rounded-md transition hover:bg-zinc-900/5 dark:hover:bg-white/5"
-        aria-label="Toggle navigation"
-        onClick={() => {
-          if (window.innerWidth >= 1024) {
-            toggleSidebar()
-          } else {
-            toggleMobileNav()
-          }
-        }}
-      >
-        <span className="absolute size-12 pointer-fine:hidden" />
-        <ToggleIcon className="w-2.5 stroke-zinc-900 dark:stroke-white" />
-      </button>
-      {!isInsideMobileNavigation && (
-        <Suspense fallback={null}>
-          <MobileNavigationDialog isOpen={mobileNavIsOpen} close={closeMobileNav} />
-        </Suspense>
-      )}
-    </IsInsideMobileNavigationContext.Provider>
-  )
-}"""
-    )
-    
-    # Ensure useSidebarStore is imported
-    tool.replace_in_file(
-        'src/components/MobileNavigation.jsx',
-        r'import \{ Navigation \} from \'@/components/Navigation\'',
-        """import { Navigation } from '@/components/Navigation'
-import { useSidebarStore } from '@/hooks/useSidebarStore'"""
-    )
-
-    # Ensure mobile navigation dialog/drawer text is excluded from snippets
-    tool.replace_in_file(
-        'src/components/MobileNavigation.jsx',
-        r'<Dialog\s+transition\s+open=\{isOpen\}\s+onClose=\{close\}',
-        """<Dialog
-      transition
-      open={isOpen}
-      onClose={close}
-      data-nosnippet"""
-    )
-    tool.replace_in_file(
-        'src/components/MobileNavigation.jsx',
-        r'<motion\.div\s+layoutScroll',
-        """<motion.div
-            layoutScroll
-            data-nosnippet"""
-    )
-
-
-    # 6. Header
-    # Replace the Header component
-    tool.replace_in_file(
-        'src/components/Header.jsx',
-        r'export const Header = forwardRef\([\s\S]*?\)\s*',
-        """export const Header = forwardRef(function Header({ className, ...props }, ref) {
-  let { isOpen: mobileNavIsOpen } = useMobileNavigationStore()
-  let isInsideMobileNavigation = useIsInsideMobileNavigation()
-
-  let { scrollY } = useScroll()
-  let bgOpacityLight = useTransform(scrollY, [0, 72], ['50%', '90%'])
-  let bgOpacityDark = useTransform(scrollY, [0, 72], ['20%', '80%'])
-
-
-  return (
-    <motion.div
-      {...props}
-      ref={ref}
-      data-nosnippet
-      className={clsx(
-        className,
-        'fixed inset-x-0 top-0 z-50 flex h-14 items-center justify-between gap-12 px-4 transition-all duration-300 sm:px-6 lg:px-8',
-        !isInsideMobileNavigation && 'backdrop-blur-xs dark:backdrop-blur-sm',
-        isInsideMobileNavigation
-          ? 'bg-white dark:bg-zinc-900'
-          : 'bg-white/(--bg-opacity-light) dark:bg-zinc-900/(--bg-opacity-dark)',
-      )}
-      style={{
-        '--bg-opacity-light': bgOpacityLight,
-        '--bg-opacity-dark': bgOpacityDark,
-      }}
-    >
-      <div
-        className={clsx(
-          'absolute inset-x-0 top-full h-px transition',
-          (isInsideMobileNavigation || !mobileNavIsOpen) &&
-          'bg-zinc-900/7.5 dark:bg-white/7.5',
-        )}
-      />
-      <div className="flex flex-auto items-center gap-5">
-        <Link href="/" aria-label="Home">
-          <Logo className="h-6" />
-        </Link>
-        <MobileNavigation />
-        <Search />
-      </div>
-      <div className="flex items-center gap-5">
-        {/* <nav className="hidden md:block">
-          <ul role="list" className="flex items-center gap-8">
-            <TopLevelNavItem href="/devops">DevOps</TopLevelNavItem>
-            <TopLevelNavItem href="/kubernetes">Kubernetes</TopLevelNavItem>
-            <TopLevelNavItem href="/linux">Linux</TopLevelNavItem>
-          </ul>
-        </nav> */}
-        <div className="hidden md:block md:h-5 md:w-px md:bg-zinc-900/10 md:dark:bg-white/15" />
-        <div className="flex gap-4">
-          <MobileSearch />
-          <ThemeToggle />
-        </div>
-      </div>
-    </motion.div>
-  )
-})
-"""
-    )
-    
-    # Ensure imports for Header logic
-    tool.replace_in_file(
-        'src/components/Header.jsx',
-        r'import \{ MobileNavigation, useIsInsideMobileNavigation \} from \'@/components/MobileNavigation\'',
-        """import {
-  MobileNavigation,
-  useIsInsideMobileNavigation,
-  useMobileNavigationStore,
-} from '@/components/MobileNavigation'"""
-    )
-    
-    tool.replace_in_file(
-        'src/components/Header.jsx',
-        r'import \{ ThemeToggle \} from \'@/components/ThemeToggle\'',
-        """import { ThemeToggle } from '@/components/ThemeToggle'
-import { useSidebarStore } from '@/hooks/useSidebarStore'"""
-    )
-
-
-    # 7. App Layout
-    # Replace metadata and root layout content
-    tool.replace_in_file(
-        'src/app/layout.jsx',
-        r'export const metadata = \{[\s\S]*?\}',
-        """export const metadata = {
-  metadataBase: new URL('https://technobureau.com'),
-  title: {
-    template: '%s - Your Gateway to Tech Excellence',
-    default: 'Your Gateway to Tech Excellence',
-  },
-  siteName: 'TechnoBureau',
-  generator: 'TechnoBureau',
-  locale: 'en_US',
-  type: 'article',
-  description: 'We offers a wealth of information, news, and insights into the ever-evolving world of technology. Whether you are a tech enthusiast, professional, or simply curious about the latest trends, TechnoBureau provides you with a one-stop hub to stay up-to-date and explore the fascinating realm of innovation',
-  keywords: "documentation,technical guides,development,programming",
-  authors: [{ name: 'Ganapathi Chidambaram', url: 'https://github.com/GanapathiChidambaram' }],
-  referrer: 'origin-when-cross-origin',
-  creator: 'Ganapathi Chidambaram',
-  publisher: 'TechnoBureau',
-  formatDetection: {
-    email: false,
-    address: false,
-    telephone: false,
-  },
-  openGraph: {
-    siteName: 'TechnoBureau',
-    locale: 'en_US',
-    type: 'article',
-    authors: ['Ganapathi Chidambaram'],
-  },
-  twitter: {
-    card: 'summary_large_image',
-    creator: '@ganapathirj',
-  },
-  robots: {
-    index: true,
-    follow: true,
-    nocache: false,
-    googleBot: {
-      index: true,
-      follow: true,
-      noimageindex: false,
-      'max-video-preview': -1,
-      'max-image-preview': 'large',
-      'max-snippet': -1,
-      },
-  },
-}"""
-    )
-    
-    # RootLayout Replacement - Inject HeroPattern and custom Layout attributes
-    # We aim to replace the return (...) block of RootLayout
-    tool.replace_in_file(
-        'src/app/layout.jsx',
-        r'return \(\s*<html[\s\S]*?</html>\s*\)',
-        """return (
-    <html lang="en" className="h-full" suppressHydrationWarning>
-      <body className="flex min-h-full bg-white antialiased dark:bg-zinc-900">
-        <Providers>
-          <div className="flex min-h-full w-full flex-col">
-            <HeroPattern />
-            <Layout allSections={allSections}>{children}</Layout>
-          </div>
-        </Providers>
-      </body>
-    </html>
-  )"""
-    )
-    
-    # Ensure HeroPattern is imported
-    tool.replace_in_file(
-        'src/app/layout.jsx',
-        r'import { Layout } from \'@/components/Layout\'',
-        """import { Layout } from '@/components/Layout'
-import { HeroPattern } from '@/components/HeroPattern'"""
-    )
-
-
-    # 8. Components Layout
-    # Replace the Layout component
-    tool.replace_in_file(
-        'src/components/Layout.jsx',
-        r'export function Layout\(\{[\s\S]*?\}',
-        """export function Layout({ children, allSections }) {
-  let pathname = usePathname()
-  let { isOpen } = useSidebarStore()
-
-  return (
-    <SectionProvider sections={allSections[pathname] ?? []}>
-      <div
-        className="group relative flex flex-auto flex-col"
-        data-sidebar-collapsed={!isOpen ? '' : undefined}
-      >
-        <Header />
-
-        <aside data-nosnippet className="fixed bottom-0 left-0 top-14 z-40 w-72 -translate-x-full overflow-y-auto border-r border-zinc-900/10 bg-white px-6 pt-6 pb-8 transition-transform duration-300 ease-in-out lg:not-group-data-sidebar-collapsed:translate-x-0 max-lg:hidden xl:w-80 lg:dark:border-white/10 dark:bg-zinc-900">
-          <Navigation />
-        </aside>
-
-        <div
-          className={clsx(
-            'flex flex-auto flex-col transition-all duration-300 ease-in-out',
-            'lg:pl-0 lg:not-group-data-sidebar-collapsed:pl-72 xl:not-group-data-sidebar-collapsed:pl-80',
-          )}
-        >
-          <div className="relative flex flex-auto flex-col px-4 pt-14 sm:px-6 lg:px-8">
-            <main className="flex-auto">{children}</main>
-            <Footer />
-          </div>
-        </div>
-      </div>
-    </SectionProvider>
-  )
-}"""
-    )
-    
-    # Ensure imports for Layout
-    tool.replace_in_file(
-        'src/components/Layout.jsx',
-        r'import \{ Navigation \} from \'@/components/Navigation\'',
-        """import { Navigation } from '@/components/Navigation'
-import { useSidebarStore } from '@/hooks/useSidebarStore'"""
-    )
-
-
-    # 9. Button
-    # Replace Button component and styles
-    tool.replace_in_file(
-        'src/components/Button.jsx',
-        r'const variantStyles = \{[\s\S]*?\}',
-        """const variantStyles = {
-  primary:
-    'rounded-full bg-zinc-900 py-1 px-3 text-white hover:bg-zinc-700 dark:bg-red-400/10 dark:text-red-400 dark:ring-1 dark:ring-inset dark:ring-red-400/20 dark:hover:bg-red-400/10 dark:hover:text-red-300 dark:hover:ring-red-300',
-  secondary:
-    'rounded-full bg-zinc-100 py-1 px-3 text-zinc-900 hover:bg-zinc-200 dark:bg-zinc-800/40 dark:text-zinc-400 dark:ring-1 dark:ring-inset dark:ring-zinc-800 dark:hover:bg-zinc-800 dark:hover:text-zinc-300',
-  filled:
-    'rounded-full bg-zinc-900 py-1 px-3 text-white hover:bg-zinc-700 dark:bg-red-500 dark:text-white dark:hover:bg-red-400',
-  outline:
-    'rounded-full py-1 px-3 text-zinc-700 ring-1 ring-inset ring-zinc-900/10 hover:bg-zinc-900/2.5 hover:text-zinc-900 dark:text-zinc-400 dark:ring-white/10 dark:hover:bg-white/5 dark:hover:text-white',
-  text: 'text-red-500 hover:text-red-600 dark:text-red-400 dark:hover:text-red-500',
-}"""
-    )
-    
-    tool.replace_in_file(
-        'src/components/Button.jsx',
-        r'export function Button\(\{[\s\S]*?\}',
-        """export function Button({
-  variant = 'primary',
-  className,
-  children,
-  arrow,
-  plain, // Destructure plain to prevent it from leaking to props
-  ...props
-}) {
-  className = clsx(
-    variant !== 'plain' && 'inline-flex gap-0.5 justify-center overflow-hidden text-sm font-medium transition',
-    variantStyles[variant],
-    className,
-  )
-
-  let arrowIcon = (
-    <ArrowIcon
-      className={clsx(
-        'mt-0.5 h-5 w-5',
-        variant === 'text' && 'relative top-px',
-        arrow === 'left' && '-ml-1 rotate-180',
-        arrow === 'right' && '-mr-1',
-      )}
-    />
-  )
-
-  let inner = (
-    <>
-      {arrow === 'left' && arrowIcon}
-      {children}
-      {arrow === 'right' && arrowIcon}
-    </>
-  )
-
-  if (props.href === undefined) {
-    return (
-      <button className={className} {...props}>
-        {inner}
-      </button>
-    )
-  }
-
-  return (
-    <Link className={className} {...props}>
-      {inner}
-    </Link>
-  )
-}"""
-    )
-
-
-    # 10. Search
-    # Replace Search components
-    tool.replace_in_file(
-        'src/components/Search.jsx',
-        r'function SearchDialog\(\{[\s\S]*?\n\}\)',
-        """function SearchDialog({ open, setOpen, className }) {
-  let formRef = useRef(null)
-  let panelRef = useRef(null)
-  let inputRef = useRef(null)
-  let { close } = useMobileNavigationStore()
-
-  let autocomplete = createAutocomplete({
-    onStateChange({ state }) {
-      if (state.status === 'stalled') {
-        if (state.collections.length > 0) {
-          setAutocompleteState(state)
-        }
-      } else {
-        setAutocompleteState(state)
-      }
-    },
-    onSubmit({ state }) {
-      if (state.collections.length > 0 && state.collections[0].items.length > 0) {
-        let { url } = state.collections[0].items[0]
-        close()
-        window.location.href = url
-      }
-    },
-    navigator: {
-      navigate({ itemUrl }) {
-        setOpen(false)
-        close()
-        window.location.href = itemUrl
-      },
-      navigateNewTab({ itemUrl }) {
-        let windowReference = window.open(itemUrl, '_blank', 'noopener')
-        if (windowReference) {
-          windowReference.focus()
-        }
-      },
-      navigateNewWindow({ itemUrl }) {
-        window.open(itemUrl, '_blank', 'noopener')
-      },
-    },
-    getSources({ query }) {
-      return import('@/mdx/search.mjs').then(({ search }) => {
-        return [
-          {
-            sourceId: 'documentation',
-            getItems() {
-              return search(query, { limit: 5 })
-            },
-            getItemUrl({ item }) {
-              return item.url
-            },
-            onSelect({ itemUrl }) {
-              setOpen(false)
-              close()
-              window.location.href = itemUrl
-            },
-          },
-        ]
-      })
-    },
-  })
-
-  let [autocompleteState, setAutocompleteState] = useState(
-    autocomplete.getState(),
-  )
-
-  useEffect(() => {
-    if (!open) {
-      return
-    }
+    def replace_global(self, search, replace, excludes=None):
+        self.replace_global_many({search: replace}, excludes)
 
-    function onKeyDown(event) {
-      if (event.key === 'k' && (event.metaKey || event.ctrlKey)) {
-        event.preventDefault()
-        setOpen(false)
-      }
-    }
+    @_profiled('replace_global')
+    def replace_global_many(self, replacements, excludes=None):
+        if excludes is None:
+            excludes = GLOBAL_EXCLUDE
+        replacements = {k: v for k, v in dict(replacements).items() if k}
+        if not replacements:
+            return
 
-    window.addEventListener('keydown', onKeyDown)
+        if len(replacements) == 1:
+            (search, replace), = replacements.items()
+            self._log(f"Global replacement: '{search}' -> '{replace}'")
+        else:
+            self._log(f"Global replacement: {len(replacements)} patterns")
 
-    return () => {
-      window.removeEventListener('keydown', onKeyDown)
-    }
-  }, [open, setOpen])
-
-  return (
-    <Dialog
-      data-nosnippet
-      open={open}
-      onClose={() => {
-        setOpen(false)
-        autocomplete.setQuery('')
-      }}
-      className={clsx('fixed inset-0 z-50', className)}
-    >
-      <DialogPanel className="fixed inset-0 bg-zinc-400/25 backdrop-blur-sm dark:bg-black/40" />
-
-      <div className="fixed inset-0 overflow-y-auto px-4 py-4 sm:px-6 sm:py-20 md:py-32 lg:px-8 lg:py-[15vh]">
-        <DialogPanel className="mx-auto transform-gpu overflow-hidden rounded-xl bg-white shadow-xl ring-1 ring-zinc-900/5 sm:max-w-xl dark:bg-zinc-900 dark:ring-zinc-800">
-          <div {...autocomplete.getRootProps({})}>
-            <form
-              ref={formRef}
-              {...autocomplete.getFormProps({
-                inputElement: inputRef.current,
-              })}
-            >
-              <div data-nosnippet className="flex h-12 items-center gap-2 border-b border-zinc-900/7.5 px-4 dark:border-white/7.5">
-                <SearchIcon className="h-5 w-5 fill-zinc-500 dark:fill-zinc-400" />
-                <input
-                  ref={inputRef}
-                  className="flex-auto appearance-none bg-transparent pl-2 text-zinc-900 placeholder:text-zinc-500 focus:outline-none dark:text-white dark:placeholder:text-zinc-400"
-                  {...autocomplete.getInputProps({
-                    placeholder: 'Find something...',
-                    autoFocus: true,
-                    onKeyDown(event) {
-                      if (
-                        event.key === 'Escape' &&
-                        inputRef.current?.value === ''
-                      ) {
-                        setOpen(false)
-                        event.preventDefault()
-                      }
-                    },
-                  })}
-                />
-              </div>
-              <div
-                ref={panelRef}
-                className="max-h-96 overflow-y-auto px-4 py-2 border-t border-zinc-100 dark:border-zinc-800 empty:hidden"
-                {...autocomplete.getPanelProps({})}
-              >
-                {autocompleteState.isOpen && (
-                  <SearchResults
-                    autocomplete={autocomplete}
-                    query={autocompleteState.query}
-                    collection={autocompleteState.collections[0]}
-                  />
-                )}
-              </div>
-            </form>
-          </div>
-        </DialogPanel>
-      </div>
-    </Dialog>
-  )
-}"""
-    )
-
-    tool.replace_in_file(
-        'src/components/Search.jsx',
-        r'export function Search\(\) \{[\s\S]*?\n\}',
-        """export function Search() {
-  let [modifierKey, setModifierKey] = useState()
-  let { buttonProps, dialogProps } = useSearchProps()
-
-  useEffect(() => {
-    setModifierKey(
-      /(Mac|iPhone|iPod|iPad)/i.test(navigator.platform) ? '⌘' : 'Ctrl ',
-    )
-  }, [])
-
-  return (
-    <div className="hidden lg:block lg:max-w-2xl lg:flex-auto" data-nosnippet>
-      <button
-        data-nosnippet
-        type="button"
-        className="hidden h-8 w-full items-center gap-2 rounded-full bg-white pr-3 pl-2 text-sm text-zinc-500 ring-1 ring-zinc-900/10 transition hover:ring-zinc-900/20 lg:flex dark:bg-white/5 dark:text-zinc-400 dark:ring-white/10 dark:ring-inset dark:hover:ring-white/20"
-        {...buttonProps}
-      >
-        <SearchIcon className="h-5 w-5 stroke-current" />
-        Find something...
-        <kbd className="ml-auto text-2xs text-zinc-400 dark:text-zinc-500" data-nosnippet>
-          <kbd className="font-sans">{modifierKey}</kbd>
-          <kbd className="font-sans">K</kbd>
-        </kbd>
-      </button>
-      <Suspense fallback={null}>
-        <SearchDialog className="hidden lg:block" {...dialogProps} />
-      </Suspense>
-    </div>
-  )
-}"""
-    )
-    
-    tool.replace_in_file(
-        'src/components/Search.jsx',
-        r'export function MobileSearch\(\) \{[\s\S]*?\n\}',
-        """export function MobileSearch() {
-  let { close } = useMobileNavigationStore()
-  let { buttonProps, dialogProps } = useSearchProps()
-
-  return (
-    <div className="contents lg:hidden" data-nosnippet>
-      <button
-        data-nosnippet
-        type="button"
-        className="relative flex size-6 items-center justify-center rounded-md transition hover:bg-zinc-900/5 lg:hidden dark:hover:bg-white/5"
-        aria-label="Find something..."
-        {...buttonProps}
-      >
-        <span className="absolute size-12 pointer-fine:hidden" />
-        <SearchIcon className="h-5 w-5 stroke-zinc-900 dark:stroke-white" />
-      </button>
-      <Suspense fallback={null}>
-        <SearchDialog
-          className="lg:hidden"
-          onNavigate={close}
-          {...dialogProps}
-        />
-      </Suspense>
-    </div>
-  )
-}"""
-    )
-
-    # 11. Footer
-    # Replace Footer components
-    tool.replace_in_file(
-        'src/components/Footer.jsx',
-        r'function SmallPrint\(\) \{[\s\S]*?\}',
-        """function SmallPrint() {
-  return (
-    <div className="flex flex-col items-center justify-between gap-5 border-t border-zinc-900/5 pt-2 sm:flex-row dark:border-white/5">
-      <p className="text-xs text-zinc-600 dark:text-zinc-400">
-        &copy; Copyright {new Date().getFullYear()}. All rights reserved.
-      </p>
-      <div className="flex gap-4">
-        <SocialLink href="#" icon={GitHubIcon}>
-          Follow us on GitHub
-        </SocialLink>
-      </div>
-    </div>
-  )
-}"""
-    )
-
-    tool.replace_in_file(
-        'src/components/Footer.jsx',
-        r'export function Footer\(\) \{[\s\S]*?\}',
-        """export function Footer() {
-  return (
-    <footer data-nosnippet className="mx-auto w-full max-w-2xl space-y-10 pb-2 lg:max-w-5xl group-data-sidebar-collapsed:lg:max-w-7xl">
-      <PageNavigation />
-      <SmallPrint />
-    </footer>
-  )
-}"""
-    )
-
-    # 12. Article Listing and Article Grid
-    tool.write_file(
-        'src/components/ArticleListing.jsx',
-        """import Link from 'next/link'
-import { formatDate } from '@/lib/formatDate'
-
-export function Article({ article, basePath }) {
-    const articleHref = `${basePath}/${article.slug}`
-    const parsedDate = new Date(`${article.date}T00:00:00`)
-    const month = parsedDate.toLocaleDateString('en-US', { month: 'short' }).toUpperCase()
-    const day = parsedDate.toLocaleDateString('en-US', { day: 'numeric' })
-    const year = parsedDate.toLocaleDateString('en-US', { year: 'numeric' })
-
-    return (
-        <article className="group relative">
-            <div className="relative overflow-hidden rounded-3xl border border-zinc-200 bg-zinc-50/70 p-6 shadow-sm ring-1 ring-zinc-900/5 dark:border-zinc-700 dark:bg-zinc-900/70 dark:ring-white/10 sm:p-8">
-                <div className="relative z-10 flex flex-col gap-5 sm:flex-row sm:items-start sm:gap-6">
-                    <div className="flex items-start sm:shrink-0">
-                        <time
-                            dateTime={article.date}
-                            title={formatDate(article.date)}
-                            className="inline-flex w-[4.5rem] flex-col overflow-hidden rounded-2xl border border-zinc-200 bg-white shadow-sm ring-1 ring-zinc-900/5 dark:border-zinc-700 dark:bg-zinc-900 dark:ring-white/10"
-                        >
-                            <span className="bg-red-500 px-2 py-1 text-center text-[0.62rem] font-bold tracking-[0.08em] text-white">
-                                {month}
-                            </span>
-                            <span className="px-2 pt-2 pb-1 text-center text-2xl font-bold leading-none text-zinc-900 dark:text-zinc-100">
-                                {day}
-                            </span>
-                            <span className="px-2 pb-2 text-center text-[0.62rem] font-semibold tracking-[0.08em] text-zinc-500 dark:text-zinc-400">
-                                {year}
-                            </span>
-                        </time>
-                    </div>
-
-                    <div className="min-w-0 flex-1">
-                        <h2 className="text-2xl font-semibold tracking-tight text-zinc-900 dark:text-zinc-100">
-                            <Link
-                                href={articleHref}
-                                className="outline-none"
-                            >
-                                {article.title}
-                            </Link>
-                        </h2>
-
-                        <p className="mt-4 text-base leading-8 text-zinc-600 dark:text-zinc-400">
-                            {article.description}
-                        </p>
-
-                        <div className="mt-6">
-                            <Link
-                                href={articleHref}
-                                className="inline-flex items-center gap-1.5 text-base font-semibold text-teal-600 dark:text-teal-400"
-                            >
-                                Read article
-                                <svg
-                                    viewBox="0 0 16 16"
-                                    fill="none"
-                                    aria-hidden="true"
-                                    className="h-4 w-4 stroke-current"
-                                >
-                                    <path
-                                        d="M6.75 5.75 9.25 8l-2.5 2.25"
-                                        strokeWidth="1.5"
-                                        strokeLinecap="round"
-                                        strokeLinejoin="round"
-                                    />
-                                </svg>
-                            </Link>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </article>
-    )
-}
-""")
-
-    tool.write_file(
-        'src/components/PaginatedArticles.jsx',
-        """'use client'
-
-import { useSearchParams } from 'next/navigation'
-import { Suspense } from 'react'
-import { ArticlesPagination } from '@/components/ArticlesPagination'
-import { Article } from '@/components/ArticleListing'
-
-function PaginatedArticlesInner({ allArticles, pageSize, basePath }) {
-    const searchParams = useSearchParams()
-    const currentPage = parseInt(searchParams.get('page') || '1', 10)
-
-    const totalArticles = allArticles.length
-    const articles = allArticles.slice(
-        (currentPage - 1) * pageSize,
-        currentPage * pageSize
-    )
-
-    return (
-        <>
-            <div className="flex w-full max-w-none flex-col gap-6 pb-8 sm:pb-10">
-                {articles.length > 0 ? (
-                    articles.map((article) => (
-                        <Article key={article.slug} article={article} basePath={basePath} />
-                    ))
-                ) : (
-                    <p className="rounded-2xl border border-zinc-200/80 bg-zinc-50/80 p-8 text-center text-zinc-600 dark:border-zinc-700 dark:bg-zinc-800/60 dark:text-zinc-400">
-                        No articles found.
-                    </p>
-                )}
-            </div>
-
-            <ArticlesPagination
-                totalArticles={totalArticles}
-                pageSize={pageSize}
-                currentPage={currentPage}
-                basePath={basePath}
-            />
-        </>
-    )
-}
-
-export function PaginatedArticles({ allArticles, pageSize, basePath }) {
-    return (
-        <Suspense
-            fallback={
-                <div className="rounded-2xl border border-zinc-200/80 bg-zinc-50/80 p-8 text-center text-zinc-600 dark:border-zinc-700 dark:bg-zinc-800/60 dark:text-zinc-400">
-                    Loading articles...
-                </div>
-            }
-        >
-            <PaginatedArticlesInner
-                allArticles={allArticles}
-                pageSize={pageSize}
-                basePath={basePath}
-            />
-        </Suspense>
-    )
-}
-""")
-
-    tool.write_file(
-        'src/components/SimpleLayout.jsx',
-        """import { Container } from '@/components/Container'
-
-export function SimpleLayout({ title, intro, children }) {
-  return (
-    <Container className="mt-2 sm:mt-2">
-      <header className="w-full max-w-none">
-        <h1 className="text-4xl font-bold tracking-tight text-zinc-800 sm:text-5xl dark:text-zinc-100">
-          {title}
-        </h1>
-        <p className="mt-2 text-base text-zinc-600 dark:text-zinc-400">
-          {intro}
-        </p>
-      </header>
-      {children && <div className="mt-8 sm:mt-4">{children}</div>}
-    </Container>
-  )
-}
-""")
-
-    # 13. Typography
-    # 13. Typography
-    # Replace the typography theme logic
-    tool.replace_in_file(
-        'typography.js',
-        r'typography: \(\{ theme \}\) => \(\{[\s\S]*?\}\)\,',
-        """typography: ({ theme }) => ({
-      DEFAULT: {
-        css: {
-          '--tw-prose-body': theme('colors.zinc.700'),
-          '--tw-prose-headings': theme('colors.zinc.900'),
-          '--tw-prose-links': theme('colors.red.500'),
-          '--tw-prose-links-hover': theme('colors.red.600'),
-          '--tw-prose-links-underline': theme('colors.red.500 / 0.3'),
-          '--tw-prose-bold': theme('colors.zinc.900'),
-          '--tw-prose-counters': theme('colors.zinc.500'),
-          '--tw-prose-bullets': theme('colors.zinc.300'),
-          '--tw-prose-hr': theme('colors.zinc.900 / 0.05'),
-          '--tw-prose-quotes': theme('colors.zinc.900'),
-          '--tw-prose-quote-borders': theme('colors.zinc.200'),
-          '--tw-prose-captions': theme('colors.zinc.500'),
-          '--tw-prose-code': theme('colors.zinc.900'),
-          '--tw-prose-code-bg': theme('colors.zinc.100'),
-          '--tw-prose-code-ring': theme('colors.zinc.300'),
-          '--tw-prose-th-borders': theme('colors.zinc.300'),
-          '--tw-prose-td-borders': theme('colors.zinc.200'),
-
-          '--tw-prose-invert-body': theme('colors.zinc.400'),
-          '--tw-prose-invert-headings': theme('colors.white'),
-          '--tw-prose-invert-links': theme('colors.red.400'),
-          '--tw-prose-invert-links-hover': theme('colors.red.500'),
-          '--tw-prose-invert-links-underline': theme(
-            'colors.red.500 / 0.3',
-          ),
-          '--tw-prose-invert-bold': theme('colors.white'),
-          '--tw-prose-invert-counters': theme('colors.zinc.400'),
-          '--tw-prose-invert-bullets': theme('colors.zinc.600'),
-          '--tw-prose-invert-hr': theme('colors.white / 0.05'),
-          '--tw-prose-invert-quotes': theme('colors.zinc.100'),
-          '--tw-prose-invert-quote-borders': theme('colors.zinc.700'),
-          '--tw-prose-invert-captions': theme('colors.zinc.400'),
-          '--tw-prose-invert-code': theme('colors.white'),
-          '--tw-prose-invert-code-bg': theme('colors.zinc.700 / 0.15'),
-          '--tw-prose-invert-code-ring': theme('colors.white / 0.1'),
-          '--tw-prose-invert-th-borders': theme('colors.zinc.600'),
-          '--tw-prose-invert-td-borders': theme('colors.zinc.700'),
-
-          // Base
-          color: 'var(--tw-prose-body)',
-          fontSize: theme('fontSize.sm')[0],
-          lineHeight: theme('lineHeight.7'),
-
-          // Text
-          p: {
-            marginTop: theme('spacing.6'),
-            marginBottom: theme('spacing.6'),
-          },
-          '[class~="lead"]': {
-            fontSize: theme('fontSize.base')[0],
-            ...theme('fontSize.base')[1],
-          },
-
-          // Lists
-          ol: {
-            listStyleType: 'decimal',
-            marginTop: theme('spacing.5'),
-            marginBottom: theme('spacing.5'),
-            paddingLeft: '1.625rem',
-          },
-          'ol[type="A"]': {
-            listStyleType: 'upper-alpha',
-          },
-          'ol[type="a"]': {
-            listStyleType: 'lower-alpha',
-          },
-          'ol[type="A" s]': {
-            listStyleType: 'upper-alpha',
-          },
-          'ol[type="a" s]': {
-            listStyleType: 'lower-alpha',
-          },
-          'ol[type="I"]': {
-            listStyleType: 'upper-roman',
-          },
-          'ol[type="i"]': {
-            listStyleType: 'lower-roman',
-          },
-          'ol[type="I" s]': {
-            listStyleType: 'upper-roman',
-          },
-          'ol[type="i" s]': {
-            listStyleType: 'lower-roman',
-          },
-          'ol[type="1"]': {
-            listStyleType: 'decimal',
-          },
-          ul: {
-            listStyleType: 'disc',
-            marginTop: theme('spacing.5'),
-            marginBottom: theme('spacing.5'),
-            paddingLeft: '1.625rem',
-          },
-          li: {
-            marginTop: theme('spacing.2'),
-            marginBottom: theme('spacing.2'),
-          },
-          ':is(ol, ul) > li': {
-            paddingLeft: theme('spacing[1.5]'),
-          },
-          'ol > li::marker': {
-            fontWeight: '400',
-            color: 'var(--tw-prose-counters)',
-          },
-          'ul > li::marker': {
-            color: 'var(--tw-prose-bullets)',
-          },
-          '> ul > li p': {
-            marginTop: theme('spacing.3'),
-            marginBottom: theme('spacing.3'),
-          },
-          '> ul > li > *:first-child': {
-            marginTop: theme('spacing.5'),
-          },
-          '> ul > li > *:last-child': {
-            marginBottom: theme('spacing.5'),
-          },
-          '> ol > li > *:first-child': {
-            marginTop: theme('spacing.5'),
-          },
-          '> ol > li > *:last-child': {
-            marginBottom: theme('spacing.5'),
-          },
-          'ul ul, ul ol, ol ul, ol ol': {
-            marginTop: theme('spacing.3'),
-            marginBottom: theme('spacing.3'),
-          },
-
-          // Horizontal rules
-          hr: {
-            borderColor: 'var(--tw-prose-hr)',
-            borderTopWidth: 1,
-            marginTop: theme('spacing.16'),
-            marginBottom: theme('spacing.16'),
-            maxWidth: 'none',
-            marginLeft: `calc(-1 * ${theme('spacing.4')})`,
-            marginRight: `calc(-1 * ${theme('spacing.4')})`,
-            '@screen sm': {
-              marginLeft: `calc(-1 * ${theme('spacing.6')})`,
-              marginRight: `calc(-1 * ${theme('spacing.6')})`,
-            },
-            '@screen lg': {
-              marginLeft: `calc(-1 * ${theme('spacing.8')})`,
-              marginRight: `calc(-1 * ${theme('spacing.8')})`,
-            },
-          },
-
-          // Quotes
-          blockquote: {
-            fontWeight: '500',
-            fontStyle: 'italic',
-            color: 'var(--tw-prose-quotes)',
-            borderLeftWidth: '0.25rem',
-            borderLeftColor: 'var(--tw-prose-quote-borders)',
-            quotes: '"\\\\201C""\\\\201D""\\\\2018""\\\\2019"',
-            marginTop: theme('spacing.8'),
-            marginBottom: theme('spacing.8'),
-            paddingLeft: theme('spacing.5'),
-          },
-          'blockquote p:first-of-type::before': {
-            content: 'open-quote',
-          },
-          'blockquote p:last-of-type::after': {
-            content: 'close-quote',
-          },
-
-          // Headings
-          h1: {
-            color: 'var(--tw-prose-headings)',
-            fontWeight: '700',
-            fontSize: theme('fontSize.2xl')[0],
-            ...theme('fontSize.2xl')[1],
-            marginBottom: theme('spacing.2'),
-          },
-          h2: {
-            color: 'var(--tw-prose-headings)',
-            fontWeight: '600',
-            fontSize: theme('fontSize.lg')[0],
-            ...theme('fontSize.lg')[1],
-            marginTop: theme('spacing.16'),
-            marginBottom: theme('spacing.2'),
-          },
-          h3: {
-            color: 'var(--tw-prose-headings)',
-            fontSize: theme('fontSize.base')[0],
-            ...theme('fontSize.base')[1],
-            fontWeight: '600',
-            marginTop: theme('spacing.10'),
-            marginBottom: theme('spacing.2'),
-          },
-
-          // Media
-          'img, video, figure': {
-            marginTop: theme('spacing.8'),
-            marginBottom: theme('spacing.8'),
-          },
-          'figure > *': {
-            marginTop: '0',
-            marginBottom: '0',
-          },
-          figcaption: {
-            color: 'var(--tw-prose-captions)',
-            fontSize: theme('fontSize.xs')[0],
-            ...theme('fontSize.xs')[1],
-            marginTop: theme('spacing.2'),
-          },
-
-          // Tables
-          table: {
-            width: '100%',
-            tableLayout: 'auto',
-            textAlign: 'left',
-            marginTop: theme('spacing.8'),
-            marginBottom: theme('spacing.8'),
-            lineHeight: theme('lineHeight.6'),
-          },
-          thead: {
-            borderBottomWidth: '1px',
-            borderBottomColor: 'var(--tw-prose-th-borders)',
-          },
-          'thead th': {
-            color: 'var(--tw-prose-headings)',
-            fontWeight: '600',
-            verticalAlign: 'bottom',
-            paddingRight: theme('spacing.2'),
-            paddingBottom: theme('spacing.2'),
-            paddingLeft: theme('spacing.2'),
-          },
-          'thead th:first-child': {
-            paddingLeft: '0',
-          },
-          'thead th:last-child': {
-            paddingRight: '0',
-          },
-          'tbody tr': {
-            borderBottomWidth: '1px',
-            borderBottomColor: 'var(--tw-prose-td-borders)',
-          },
-          'tbody tr:last-child': {
-            borderBottomWidth: '0',
-          },
-          'tbody td': {
-            verticalAlign: 'baseline',
-          },
-          tfoot: {
-            borderTopWidth: '1px',
-            borderTopColor: 'var(--tw-prose-th-borders)',
-          },
-          'tfoot td': {
-            verticalAlign: 'top',
-          },
-          ':is(tbody, tfoot) td': {
-            paddingTop: theme('spacing.2'),
-            paddingRight: theme('spacing.2'),
-            paddingBottom: theme('spacing.2'),
-            paddingLeft: theme('spacing.2'),
-          },
-          ':is(tbody, tfoot) td:first-child': {
-            paddingLeft: '0',
-          },
-          ':is(tbody, tfoot) td:last-child': {
-            paddingRight: '0',
-          },
-
-          // Inline elements
-          a: {
-            color: 'var(--tw-prose-links)',
-            textDecoration: 'underline transparent',
-            fontWeight: '500',
-            transitionProperty: 'color, text-decoration-color',
-            transitionDuration: theme('transitionDuration.DEFAULT'),
-            transitionTimingFunction: theme('transitionTimingFunction.DEFAULT'),
-            '&:hover': {
-              color: 'var(--tw-prose-links-hover)',
-              textDecorationColor: 'var(--tw-prose-links-underline)',
-            },
-          },
-          ':is(h1, h2, h3) a': {
-            fontWeight: 'inherit',
-          },
-          strong: {
-            color: 'var(--tw-prose-bold)',
-            fontWeight: '600',
-          },
-          ':is(a, blockquote, thead th) strong': {
-            color: 'inherit',
-            fontWeight: 'inherit',
-          },
-          code: {
-            color: 'var(--tw-prose-code)',
-            borderRadius: theme('borderRadius.lg'),
-            paddingTop: theme('padding.1'),
-            paddingRight: theme('padding[1.5]'),
-            paddingBottom: theme('padding.1'),
-            paddingLeft: theme('padding[1.5]'),
-            boxShadow: 'inset 0 0 0 1px var(--tw-prose-code-ring)',
-            backgroundColor: 'var(--tw-prose-code-bg)',
-            fontSize: theme('fontSize.2xs')[0],
-          },
-          ':is(a, h1, h2, h3, blockquote, thead th) code': {
-            color: 'inherit',
-            fontWeight: 'inherit',
-          },
-          'h2 code': {
-            fontSize: theme('fontSize.base')[0],
-            fontWeight: 'inherit',
-          },
-          'h3 code': {
-            fontSize: theme('fontSize.sm')[0],
-            fontWeight: 'inherit',
-          },
-
-          // Overrides
-          ':is(h1, h2, h3) + *': {
-            marginTop: '0',
-          },
-          '> :first-child': {
-            marginTop: '0 !important',
-          },
-          '> :last-child': {
-            marginBottom: '0 !important',
-          },
-        },
-      },
-      invert: {
-        css: {
-          '--tw-prose-body': 'var(--tw-prose-invert-body)',
-          '--tw-prose-headings': 'var(--tw-prose-invert-headings)',
-          '--tw-prose-links': 'var(--tw-prose-invert-links)',
-          '--tw-prose-links-hover': 'var(--tw-prose-invert-links-hover)',
-          '--tw-prose-links-underline':
-            'var(--tw-prose-invert-links-underline)',
-          '--tw-prose-bold': 'var(--tw-prose-invert-bold)',
-          '--tw-prose-counters': 'var(--tw-prose-invert-counters)',
-          '--tw-prose-bullets': 'var(--tw-prose-invert-bullets)',
-          '--tw-prose-hr': 'var(--tw-prose-invert-hr)',
-          '--tw-prose-quotes': 'var(--tw-prose-invert-quotes)',
-          '--tw-prose-quote-borders': 'var(--tw-prose-invert-quote-borders)',
-          '--tw-prose-captions': 'var(--tw-prose-invert-captions)',
-          '--tw-prose-code': 'var(--tw-prose-invert-code)',
-          '--tw-prose-code-bg': 'var(--tw-prose-invert-code-bg)',
-          '--tw-prose-code-ring': 'var(--tw-prose-invert-code-ring)',
-          '--tw-prose-th-borders': 'var(--tw-prose-invert-th-borders)',
-          '--tw-prose-td-borders': 'var(--tw-prose-invert-td-borders)',
-        },
-      },
-    }),"""
-    )
-
-
-    # 13. Hero Pattern (Updated Colors)
-    # Replace HeroPattern component
-    tool.replace_in_file(
-        'src/components/HeroPattern.jsx',
-        r'export function HeroPattern\(\) \{[\s\S]*?\}',
-        """export function HeroPattern() {
-  return (
-    <div className="absolute inset-0 -z-10 mx-0 max-w-none overflow-hidden">
-      <div className="absolute top-0 left-1/2 -ml-152 h-100 w-325 dark:mask-[linear-gradient(white,transparent)]">
-        <div className="absolute inset-0 bg-linear-to-r from-[#757272] to-[#4e5244] mask-[radial-gradient(farthest-side_at_top,white,transparent)] opacity-40 dark:from-[#757272]/30 dark:to-[#4e5244]/30 dark:opacity-100">
-          <GridPattern
-            width={72}
-            height={56}
-            x={-12}
-            y={4}
-            squares={[
-              [4, 3],
-              [2, 1],
-              [7, 3],
-              [10, 6],
-            ]}
-            className="absolute inset-x-0 inset-y-[-50%] h-[200%] w-full skew-y-[-18deg] fill-black/40 stroke-black/50 mix-blend-overlay dark:fill-white/2.5 dark:stroke-white/5"
-          />
-        </div>
-        <svg
-          viewBox="0 0 1113 440"
-          aria-hidden="true"
-          className="absolute top-0 left-1/2 -ml-76 w-278.25 fill-white blur-[26px] dark:hidden"
-        >
-          <path d="M.016 439.5s-9.5-300 434-300S882.516 20 882.516 20V0h230.004v439.5H.016Z" />
-        </svg>
-      </div>
-    </div>
-  )
-}"""
-    )
-
-
-    # 14. Dependencies
-    # Add remark-frontmatter and remark-mdx-frontmatter to package.json
-    tool.replace_in_file(
-        'package.json',
-        r'"dependencies": \{',
-        """"dependencies": {
-    "remark-frontmatter": "^5.0.0",
-    "remark-mdx-frontmatter": "^4.0.0","""
-    )
-
-    # 15. Frontmatter Mapping Plugin
-    # Create remark-frontmatter-metadata.mjs
-    tool.write_file('src/mdx/remark-frontmatter-metadata.mjs', """import { visit } from 'unist-util-visit'
-
-export function remarkMapFrontmatterMetadata() {
-    return (tree) => {
-        let hasMetadataExport = false
-        let frontmatterMetadataNode = null
-        let frontmatterMetadataIdentifier = null
-
-        // First pass: Check for existing metadata export and find the frontmatterMetadata identifier
-        visit(tree, 'mdxjsEsm', (node) => {
-            const program = node.data?.estree
-            if (!program || !program.body) return
-
-            for (const statement of program.body) {
-                if (
-                    statement.type === 'ExportNamedDeclaration' &&
-                    statement.declaration?.type === 'VariableDeclaration'
-                ) {
-                    for (const decl of statement.declaration.declarations) {
-                        if (decl.id?.type === 'Identifier') {
-                            if (decl.id.name === 'metadata') {
-                                hasMetadataExport = true
-                            }
-                            if (decl.id.name === 'frontmatterMetadata') {
-                                frontmatterMetadataNode = node
-                                frontmatterMetadataIdentifier = decl.id
-                            }
-                        }
-                    }
-                }
-            }
-        })
-
-        // Second pass: Rename if safe
-        if (!hasMetadataExport && frontmatterMetadataIdentifier) {
-            frontmatterMetadataIdentifier.name = 'metadata'
-            // Sync value string to ensure tools not using ESTree also see the change
-            if (frontmatterMetadataNode.value) {
-                frontmatterMetadataNode.value = frontmatterMetadataNode.value.replace(
-                    /\\bfrontmatterMetadata\\b/,
-                    'metadata'
-                )
-            }
-        }
-    }
-}
-""")
-
-    # 16. Auto-Metadata Plugin
-    # Create remark-auto-metadata.mjs plugin
-    tool.write_file('src/mdx/remark-auto-metadata.mjs', """import { visit } from 'unist-util-visit'
-import { toString } from 'mdast-util-to-string'
-import * as fs from 'node:fs'
-import * as path from 'node:path'
-
-export function remarkAutoMetadata() {
-  return (tree, file) => {
-    let title = null
-    let description = null
-    let metadataExportNode = null
-    
-    // 1. Find Title (H1) and Description (First Paragraph)
-    let foundH1 = false
-    visit(tree, (node) => {
-      if (!title && node.type === 'heading' && node.depth === 1) {
-        title = toString(node)
-        foundH1 = true
-        return 'skip'
-      }
-
-      if (foundH1 && !description && node.type === 'paragraph') {
-        description = toString(node).slice(0, 160).trim()
-        if (description.length === 160) description += '...'
-        return 'skip'
-      }
-      
-      // Check ESTree for exports
-      if (node.type === 'mdxjsEsm') {
-         const program = node.data?.estree
-         if (program?.body) {
-             for (const statement of program.body) {
-                 if (statement.type === 'ExportNamedDeclaration' && statement.declaration?.declarations) {
-                     for (const decl of statement.declaration.declarations) {
-                         if (decl.id.name === 'metadata' || decl.id.name === 'frontmatterMetadata') {
-                             metadataExportNode = node
-                         }
-                     }
-                 }
-             }
-         }
-      }
-    })
-    
-    // Get file dates from file.history or file.path
-    let filePath = file.history?.[0] || file.path
-    let dateCreated = null
-    let dateModified = null
-    
-    if (filePath && typeof filePath === 'string') {
-      // Ensure path is absolute for fs.statSync to avoid issues with different loaders
-      if (!path.isAbsolute(filePath)) {
-          filePath = path.resolve(process.cwd(), filePath)
-      }
-
-      try {
-        if (fs.existsSync(filePath)) {
-            const stats = fs.statSync(filePath)
-            dateCreated = stats.birthtime.toISOString().split('T')[0]
-            dateModified = stats.mtime.toISOString().split('T')[0]
-        }
-      } catch (e) {
-        // Silently fail if we can't read file stats
-      }
-    }
-    
-    // Use dateModified as the primary 'date' if available, otherwise dateCreated
-    const primaryDate = dateModified || dateCreated
-    
-    if (metadataExportNode) {
-        // We need to inject into the ESTree
-        const program = metadataExportNode.data?.estree
-        if (program?.body) {
-            for (const statement of program.body) {
-                if (statement.type === 'ExportNamedDeclaration' && statement.declaration?.declarations) {
-                     for (const decl of statement.declaration.declarations) {
-                        if (decl.id.name === 'metadata' || decl.id.name === 'frontmatterMetadata') {
-                            // Handle undefined or null init (empty frontmatter case)
-                            if (!decl.init || (decl.init.type === 'Identifier' && decl.init.name === 'undefined')) {
-                                decl.init = {
-                                    type: 'ObjectExpression',
-                                    properties: []
-                                }
-                            }
-                            
-                            if (decl.init?.type === 'ObjectExpression') {
-                                const properties = decl.init.properties
-                                
-                                const hasTitle = properties.some(p => (p.key?.name === 'title' || p.key?.value === 'title'))
-                                const hasDescription = properties.some(p => (p.key?.name === 'description' || p.key?.value === 'description'))
-                                const hasDate = properties.some(p => (p.key?.name === 'date' || p.key?.value === 'date'))
-                                const hasDateCreated = properties.some(p => (p.key?.name === 'dateCreated' || p.key?.value === 'dateCreated'))
-                                const hasDateModified = properties.some(p => (p.key?.name === 'dateModified' || p.key?.value === 'dateModified'))
-                                
-                                // Auto-infer title and description
-                                if (!hasTitle && title) {
-                                    properties.push({
-                                        type: 'Property',
-                                        key: { type: 'Identifier', name: 'title' },
-                                        value: { type: 'Literal', value: title },
-                                        kind: 'init'
-                                    })
-                                }
-                                
-                                if (!hasDescription && description) {
-                                     properties.push({
-                                        type: 'Property',
-                                        key: { type: 'Identifier', name: 'description' },
-                                        value: { type: 'Literal', value: description },
-                                        kind: 'init'
-                                    })
-                                }
-                                
-                                // Add file dates if available
-                                if (!hasDate && primaryDate) {
-                                    properties.push({
-                                        type: 'Property',
-                                        key: { type: 'Identifier', name: 'date' },
-                                        value: { type: 'Literal', value: primaryDate },
-                                        kind: 'init'
-                                    })
-                                }
-
-                                if (!hasDateCreated && dateCreated) {
-                                    properties.push({
-                                        type: 'Property',
-                                        key: { type: 'Identifier', name: 'dateCreated' },
-                                        value: { type: 'Literal', value: dateCreated },
-                                        kind: 'init'
-                                    })
-                                }
-                                
-                                if (!hasDateModified && dateModified) {
-                                    properties.push({
-                                        type: 'Property',
-                                        key: { type: 'Identifier', name: 'dateModified' },
-                                        value: { type: 'Literal', value: dateModified },
-                                        kind: 'init'
-                                    })
-                                }
-
-                                // Sync value string if possible
-                                if (metadataExportNode.value) {
-                                    // This is a naive sync, but better than nothing
-                                    if (!hasTitle && title && !metadataExportNode.value.includes('title:')) {
-                                        metadataExportNode.value = metadataExportNode.value.replace(/}\\s*$/, `, title: ${JSON.stringify(title)} }`)
-                                    }
-                                    if (!hasDescription && description && !metadataExportNode.value.includes('description:')) {
-                                        metadataExportNode.value = metadataExportNode.value.replace(/}\\s*$/, `, description: ${JSON.stringify(description)} }`)
-                                    }
-                                    if (!hasDate && primaryDate && !metadataExportNode.value.includes('date:')) {
-                                        metadataExportNode.value = metadataExportNode.value.replace(/}\\s*$/, `, date: ${JSON.stringify(primaryDate)} }`)
-                                    }
-                                    // Clean up potential ", }" at start of object
-                                    metadataExportNode.value = metadataExportNode.value.replace(/\\{\\s*,\\s*/, '{ ')
-                                }
-                            }
-                        }
-                     }
-                }
-            }
-        }
-    } else if (title || description || primaryDate) {
-         const properties = []
-         
-         if (title) {
-             properties.push({
-                 type: 'Property',
-                 key: { type: 'Identifier', name: 'title' },
-                 value: { type: 'Literal', value: title },
-                 kind: 'init'
-             })
-         }
-         
-         if (description) {
-             properties.push({
-                 type: 'Property',
-                 key: { type: 'Identifier', name: 'description' },
-                 value: { type: 'Literal', value: description },
-                 kind: 'init'
-             })
-         }
-
-         if (primaryDate) {
-            properties.push({
-                type: 'Property',
-                key: { type: 'Identifier', name: 'date' },
-                value: { type: 'Literal', value: primaryDate },
-                kind: 'init'
-            })
-         }
-         
-         if (dateCreated) {
-             properties.push({
-                 type: 'Property',
-                 key: { type: 'Identifier', name: 'dateCreated' },
-                 value: { type: 'Literal', value: dateCreated },
-                 kind: 'init'
-             })
-         }
-         
-         if (dateModified) {
-             properties.push({
-                 type: 'Property',
-                 key: { type: 'Identifier', name: 'dateModified' },
-                 value: { type: 'Literal', value: dateModified },
-                 kind: 'init'
-             })
-         }
-         
-         const valueString = properties.map(p => `${p.key.name}: ${JSON.stringify(p.value.value)}`).join(', ')
-         
-         tree.children.unshift({
-            type: 'mdxjsEsm',
-            value: `export const metadata = { ${valueString} }`,
-            data: {
-                estree: {
-                    type: 'Program',
-                    sourceType: 'module',
-                    body: [
-                        {
-                            type: 'ExportNamedDeclaration',
-                            specifiers: [],
-                            source: null,
-                            declaration: {
-                                type: 'VariableDeclaration',
-                                kind: 'const',
-                                declarations: [
-                                    {
-                                        type: 'VariableDeclarator',
-                                        id: { type: 'Identifier', name: 'metadata' },
-                                        init: {
-                                            type: 'ObjectExpression',
-                                            properties: properties
-                                        }
-                                    }
-                                ]
-                            }
-                        }
-                    ]
-                }
-            }
-         })
-    }
-  }
-}
-""")
-
-    # 17. MDX Config
-    # Update remark.mjs to use frontmatter and auto-metadata plugins
-    tool.write_file('src/mdx/remark.mjs', """import { mdxAnnotations } from 'mdx-annotations'
-import remarkFrontmatter from 'remark-frontmatter'
-import remarkMdxFrontmatter from 'remark-mdx-frontmatter'
-import { remarkMapFrontmatterMetadata } from './remark-frontmatter-metadata.mjs'
-import { remarkAutoMetadata } from './remark-auto-metadata.mjs'
-import remarkGfm from 'remark-gfm'
-
-export const remarkPlugins = [
-  mdxAnnotations.remark,
-  remarkFrontmatter,
-  [remarkMdxFrontmatter, { name: 'frontmatterMetadata' }],
-  remarkMapFrontmatterMetadata,
-  remarkAutoMetadata,
-  remarkGfm,
-]
-""")
+        pattern = _literal_pattern(replacements, self.patterns)
+        if self.jobs > 1 and self.workspace is None:
+            statuses = self._replace_global_parallel(replacements, excludes)
+        else:
+            statuses = [self._simple_replace(file_path, pattern, replacements)
+                        for file_path in sorted(self._global_targets(excludes))]
+        if self.workspace is None:
+            scanned = len(statuses)
+            candidates = scanned - statuses.count('skipped')
+            self._log(f"Scanned {scanned} file(s): {candidates} candidate(s), "
+                      f"{statuses.count('updated')} rewritten")
+
+    def _global_targets(self, excludes):
+        return Scanner(self.root_dir, GLOBAL_INCLUDE, excludes, cache_path=self.scan_cache).scan()
+
+    def _replace_global_parallel(self, replacements, excludes):
+        # The walk finishes before the pool starts: workers are forked, and
+        # forking while the scanner's threads hold locks can deadlock them.
+        # Results are reported in sorted path order
+        targets = list(self._global_targets(excludes))
+        results = {}
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            for start in range(0, len(targets), GLOBAL_BATCH_SIZE):
+                batch = tuple(targets[start:start + GLOBAL_BATCH_SIZE])
+                paths = [self.resolve_path(p) for p in batch]
+                results[batch] = pool.submit(_substitute_files, paths, replacements, self.encoding,
+                                             self.large_file_size)
+
+            statuses = {}
+            for batch, future in results.items():
+                for file_path, (status, read, written, matches) in zip(batch, future.result()):
+                    statuses[file_path] = status
+                    self.profiler.count(read, written, matches, file_path if status == 'updated' else None)
+                    if status == 'updated':
+                        self.writes.add(self.resolve_path(file_path))
+
+        for file_path in sorted(statuses):
+            if statuses[file_path] == 'updated':
+                self._log(f"Updated {file_path}")
+        return list(statuses.values())
+
+    def _simple_replace(self, file_path, pattern, replacements):
+        if self.workspace is None:
+            with self.patterns.matching():
+                status, read, written, matches = _substitute_file(self.resolve_path(file_path), replacements,
+                                                                  self.patterns, self.encoding, self.large_file_size)
+            self.profiler.count(read, written, matches, file_path if status == 'updated' else None)
+            if status == 'updated':
+                self.writes.add(self.resolve_path(file_path))
+                self._log(f"Updated {file_path}")
+            return status
+
+        # Staged, the same byte-level substitution runs on the staged bytes, so
+        # a dry run's patch matches what the direct path writes
+        def edit(data):
+            if data is None:
+                return None
+            with self.patterns.matching():
+                new_data, matches = _substitute_data(data, replacements, self.patterns, self.encoding)
+            self.profiler.count(matches=matches)
+            if new_data != data:
+                self._log(f"Updated {file_path}")
+            return new_data
+
+        self._edit(file_path, edit, ('replace_global', pattern.pattern, sorted(replacements.items())), raw=True)
+
+    @_profiled('write_file')
+    def write_file(self, file_path, content, preserve_times=False):
+        # preserve_times keeps an existing file's mtime when its content changes,
+        # for targets whose mtime feeds article dates or build caches
+        def edit(current):
+            if current == content:
+                self._log(f"Skipping {file_path} - content already up to date.")
+            else:
+                self._log(f"Created/Updated {file_path}")
+            return content
+
+        key = ('write_file', content_digest(content)) + (('preserve_times',) if preserve_times else ())
+        self._edit(file_path, edit, key, preserve_times)
 
-    print("\nRebranding complete!")
+    @_profiled('delete_path')
+    def delete_path(self, relative_path):
+        if self.workspace is not None:
+            self.workspace.delete(relative_path)
+        else:
+            self._remove([relative_path])
+
+    @_profiled('delete_path')
+    def delete_paths(self, relative_paths, trash=None):
+        # Bulk delete: trash=True moves directory trees aside and reclaims them
+        # in the background (defaults to the tool's trash setting)
+        if self.workspace is not None:
+            for relative_path in relative_paths:
+                self.workspace.delete(relative_path)
+        else:
+            self._remove(relative_paths, trash)
+
+    @_profiled('replace_declaration')
+    def replace_declaration(self, file_path, name, replacement, skip_hint=None):
+        # Replaces the whole top-level declaration of name (function, class or
+        # const/let/var, exported or not) as found by a token scan, so braces in
+        # strings, JSX or nested blocks cannot cut it short
+        replacement = replacement.rstrip()
+        hint = skip_hint if skip_hint else replacement.split('\n')[0].strip()
+
+        def edit(content):
+            if content is None:
+                self._log(f"Warning: File {file_path} not found.")
+                return None
+            declaration = SourceIndex(content).declaration(name)
+            if declaration is not None and content[declaration.start:declaration.end] == replacement:
+                self._log(f"Skipping {file_path} - {name} already up to date.")
+                return content
+            if hint and hint in content:
+                self._log(f"Skipping {file_path} - replacement (hint: '{hint}') already present.")
+                return content
+            if declaration is None:
+                self._log(f"No changes for {file_path} (declaration {name} not found)")
+                return content
+            self.profiler.count(matches=1)
+            self._log(f"Updated {file_path}")
+            return splice(content, [(declaration.start, declaration.end, replacement)])
+
+        self._edit(file_path, edit, ('replace_declaration', name, content_digest(replacement), skip_hint))
+
+    @_profiled('set_attribute')
+    def set_attribute(self, file_path, tag, attribute, after=None, before=None):
+        # Adds a JSX attribute ('data-nosnippet', 'role="note"', ...) to the first
+        # <tag> carrying the after/before anchor attribute, next to that anchor
+        name = attribute.split('=', 1)[0]
+
+        def edit(content):
+            if content is None:
+                self._log(f"Warning: File {file_path} not found.")
+                return None
+            index = SourceIndex(content)
+            element = index.find_tag(tag, after or before) or index.find_tag(tag, name)
+            if element is None:
+                self._log(f"No changes for {file_path} (<{tag}> not found)")
+                return content
+            existing = element.attribute(name)
+            if existing is not None:
+                if content[existing.start:existing.end] == attribute:
+                    self._log(f"Skipping {file_path} - <{tag}> already has {name}.")
+                    return content
+                change = (existing.start, existing.end, attribute)
+            else:
+                change = attribute_edit(content, element, attribute, after, before)
+            self.profiler.count(matches=1)
+            self._log(f"Updated {file_path} (<{tag}> {name})")
+            return splice(content, [change])
+
+        self._edit(file_path, edit, ('set_attribute', tag, attribute, after, before))
+
+    @_profiled('ensure_imports')
+    def ensure_imports(self, file_path, imports, after=None):
+        # imports maps a module to the specifiers ('name', 'name as alias',
+        # 'default as name') it must provide. The import block is parsed once;
+        # missing bindings are merged into the module's existing import (folding
+        # in duplicate imports of it) or added after the import of `after`, and
+        # the file is left alone when every binding is already imported
+        requests = [(source, [names] if isinstance(names, str) else list(names))
+                    for source, names in imports.items()]
+
+        def edit(content):
+            if content is None:
+                self._log(f"Warning: File {file_path} not found.")
+                return None
+            edits, changed, unparsed = import_edits(content, SourceIndex(content), requests, after)
+            if unparsed:
+                self._log(f"Warning: Skipping {file_path} - cannot parse its import of {', '.join(unparsed)}.")
+                return content
+            if not edits:
+                self._log(f"Skipping {file_path} - imports already present.")
+                return content
+            self.profiler.count(matches=len(changed))
+            self._log(f"Updated {file_path} (imports from {', '.join(changed)})")
+            return splice(content, edits)
+
+        self._edit(file_path, edit, ('ensure_imports', requests, after))
+
+    @_profiled('index_dates')
+    def index_dates(self, output, paths=('src/app/**/*.mdx',)):
+        # Writes {file: [first commit date, last commit date, blob id]} for the
+        # tracked files matching the paths globs, from a single streamed git log
+        # walk, so the MDX plugin does not stat every file for dates a fresh
+        # checkout has reset. Readers only trust an entry while the file still
+        # has that blob id, since nothing regenerates the index at build time.
+        try:
+            if subprocess.run(['git', 'rev-parse', '--is-shallow-repository'], cwd=self.root_dir,
+                              capture_output=True, text=True, check=True).stdout.strip() == 'true':
+                self._log("Warning: shallow clone; first-commit dates stop at the clone boundary.")
+            dates = _commit_dates(self.root_dir, paths)
+        except (OSError, subprocess.CalledProcessError):
+            self._log(f"Warning: {self.root_dir} is not a git checkout; {output} not written.")
+            return
+        self._log(f"Indexed commit dates of {len(dates)} file(s)")
+        self.commit_dates[os.path.normpath(output)] = dates
+        self.write_file(output, json.dumps(dates, sort_keys=True, separators=(',', ':')) + '\n')
+
+    def _source_files(self, root, include):
+        # Files under root matching the include globs, '/'-separated and
+        # relative to root, as they will be after the staged edits are flushed:
+        # returns (sorted paths, {path: staged bytes}) where staged bytes cover
+        # the files a workspace still has edits queued for
+        base = self.resolve_path(root)
+        files = {path.replace(os.sep, '/') for path in Scanner(base, include, GLOBAL_EXCLUDE).scan()}
+        staged = {}
+        if self.workspace is not None:
+            root_path, match = os.path.normpath(root), compile_globs(include).match
+            files.update(os.path.relpath(p, root_path).replace(os.sep, '/') for p in self.workspace.edits
+                         if _is_under(p, root_path) and p != root_path
+                         and match(os.path.relpath(p, root_path).replace(os.sep, '/')))
+            for name in list(files):
+                file_path = os.path.normpath(os.path.join(root_path, name))
+                if file_path in self.workspace.edits:
+                    content = self.workspace.read(file_path, raw=True)
+                    if content is not None:
+                        staged[name] = content
+                        continue
+                elif not any(_is_under(file_path, d) for d in self.workspace.deleted):
+                    continue
+                files.discard(name)
+        return sorted(files), staged
+
+    @_profiled('index_search')
+    def index_search(self, output, root='src/app'):
+        # Writes the search sections of every MDX page under root as one JSON
+        # shard per top-level section (output/<section>.json, a list of
+        # {url, sections}) plus output/manifest.json naming the shards and the
+        # git blob id of every page in them, so the search loader needs no
+        # remark pass for shards whose pages have not changed since and the
+        # client can load shards lazily. Sections are cached by page content
+        # hash across runs and extracted on the process pool when jobs > 1.
+        base = self.resolve_path(root)
+        pages, staged = self._source_files(root, ('*.mdx',))
+
+        cache = {}
+        if self.search_cache is not None:
+            try:
+                with open(self.search_cache, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == SEARCH_INDEX_VERSION:
+                    cache = data.get('pages', {})
+            except (OSError, ValueError):
+                pass
+
+        texts, hashes, blobs = {}, {}, {}
+        for page in pages:
+            if page in staged:
+                data = staged[page]
+            else:
+                with open(os.path.join(base, page), 'rb') as f:
+                    data = f.read()
+                self.profiler.count(bytes_read=len(data))
+            hashes[page] = content_digest(data)
+            blobs[page] = _git_blob_id(data)
+            if hashes[page] not in cache:
+                texts[page] = data.decode('utf-8', 'replace')
+        misses = list(texts)
+        if self.jobs > 1 and len(misses) > 1:
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                extracted = list(pool.map(_page_sections, [texts[page] for page in misses],
+                                          chunksize=max(1, len(misses) // (self.jobs * 4))))
+        else:
+            extracted = [_page_sections(texts[page]) for page in misses]
+        for page, sections in zip(misses, extracted):
+            cache[hashes[page]] = sections
+        self._log(f"Indexed search sections of {len(pages)} page(s) ({len(pages) - len(misses)} cached)")
+
+        shards, shard_pages = {}, {}
+        for page in pages:
+            url = '/' + re.sub(r'(^|/)page\.mdx$', '', page)
+            sections = cache[hashes[page]]
+            shards.setdefault(_search_shard(page), []).append({'url': url, 'sections': sections or []})
+            # A page this cannot extract exactly gets no blob id, so the
+            # loader parses its shard itself
+            shard_pages.setdefault(_search_shard(page), {})[page] = blobs[page] if sections is not None else None
+        manifest = {}
+        for name in sorted(shards):
+            text = json.dumps(shards[name], ensure_ascii=False, separators=(',', ':')) + '\n'
+            manifest[name] = {'file': f"{name}.json", 'pages': shard_pages[name], 'hash': content_digest(text)[:16]}
+            self.write_file(os.path.join(output, f"{name}.json"), text)
+        self.write_file(os.path.join(output, 'manifest.json'),
+                        json.dumps({'version': SEARCH_INDEX_VERSION, 'shards': manifest}, indent=2) + '\n')
+
+        if self.search_cache is not None:
+            # Only the pages seen this run are kept
+            used = set(hashes.values())
+            os.makedirs(os.path.dirname(self.search_cache), exist_ok=True)
+            with replacing(self.search_cache, 'w') as f:
+                json.dump({'version': SEARCH_INDEX_VERSION, 'pages': {k: v for k, v in cache.items() if k in used}},
+                          f, separators=(',', ':'))
+                f.write('\n')
+                f.changed = True
+
+    @_profiled('index_articles')
+    def index_articles(self, root='src/app', output='articles.json', dates=None):
+        # Precomputes getAllArticles(folder) for every section, i.e. every
+        # directory with page.mdx articles below it: output in that directory
+        # maps each page (relative to it) to its git blob id and article, or
+        # null when only importing the page gives the article exactly. The
+        # build uses an entry while the page still has that blob id and
+        # imports the page otherwise. Pages are parsed on the process pool
+        # when jobs > 1. dates is the index_dates output the build reads.
+        base = self.resolve_path(root)
+        pages, staged = self._source_files(root, ('page.mdx',))
+        paths = [os.path.join(base, page) for page in pages]
+        commit_dates = {}
+        if dates is not None and os.path.normpath(dates) in self.commit_dates:
+            commit_dates = self.commit_dates[os.path.normpath(dates)]
+        elif dates is not None:
+            try:
+                with open(self.resolve_path(dates), 'r', encoding='utf-8') as f:
+                    commit_dates = json.load(f)
+            except (OSError, ValueError):
+                self._log(f"Warning: {dates} not readable; every page is left to the build.")
+        spans = [commit_dates.get(f"{root}/{page}") for page in pages]
+        texts = [staged.get(page) for page in pages]
+        if self.jobs > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                found = list(pool.map(_article_metadata, paths, spans, texts,
+                                      chunksize=max(1, len(paths) // (self.jobs * 4))))
+        else:
+            found = [_article_metadata(*args) for args in zip(paths, spans, texts)]
+        self.profiler.count(bytes_read=sum(os.path.getsize(path) for path, text in zip(paths, texts)
+                                           if text is None))
+
+        sections, nested = {}, set()
+        for page, (blob, metadata) in zip(pages, found):
+            parts = page.split('/')[:-1]
+            for depth in range(1, len(parts) + 1):
+                section, rest = '/'.join(parts[:depth]), parts[depth:]
+                if rest:
+                    nested.add(section)
+                # Keyed by the glob match getAllArticles derives the slug from
+                article = None if metadata is None else {'slug': '/'.join(rest) or 'page', **metadata}
+                sections.setdefault(section, {})['/'.join(rest + ['page.mdx'])] = {'blob': blob, 'article': article}
+        sections = {name: entries for name, entries in sections.items() if name in nested}
+        unindexed = sum(metadata is None for blob, metadata in found)
+        self._log(f"Indexed {len(pages) - unindexed} of {len(pages)} article(s) into {len(sections)} section(s)")
+        for name in sorted(sections):
+            index = {'version': ARTICLE_INDEX_VERSION, 'pages': dict(sorted(sections[name].items()))}
+            self.write_file(os.path.join(root, *name.split('/'), output),
+                            json.dumps(index, indent=2, ensure_ascii=False) + '\n')
+
+    @_profiled('delete_line')
+    def delete_line(self, file_path, pattern):
+        search = self.patterns.get(pattern).search
+
+        def edit(content):
+            if content is None:
+                return None
+            lines = content.splitlines(keepends=True)
+            with self.patterns.matching():
+                new_lines = [l for l in lines if not search(l)]
+            self.profiler.count(matches=len(lines) - len(new_lines))
+            if len(new_lines) != len(lines):
+                self._log(f"Updated {file_path} (deleted lines matching '{pattern}')")
+                return ''.join(new_lines)
+            return content
+
+        self._edit(file_path, edit, ('delete_line', pattern))
+
+    @_profiled('delete_block')
+    def delete_block(self, file_path, start_pattern, end_pattern):
+        pattern = self.patterns.get(re.escape(start_pattern) + r".*?" + re.escape(end_pattern), re.DOTALL)
+
+        def edit(content):
+            if content is None:
+                return None
+            with self.patterns.matching():
+                new_content, matches = pattern.subn("", content)
+            self.profiler.count(matches=matches)
+            if new_content != content:
+                self._log(f"Updated {file_path} (deleted block)")
+            return new_content
+
+        self._edit(file_path, edit, ('delete_block', start_pattern, end_pattern))
+
+    @_profiled('comment_block')
+    def comment_block(self, file_path, start_pattern, end_pattern):
+        pattern = self.patterns.get(re.escape(start_pattern) + r".*?" + re.escape(end_pattern), re.DOTALL)
+
+        def edit(content):
+            if content is None:
+                return None
+            if f'{{/* {start_pattern}' in content:
+                self._log(f"Skipping comment block in {file_path} - already commented.")
+                return content
+
+            def replacer(match):
+                return f"{{/* {match.group(0)} */}}"
+
+            with self.patterns.matching():
+                new_content, matches = pattern.subn(replacer, content)
+            self.profiler.count(matches=matches)
+            if new_content != content:
+                self._log(f"Updated {file_path} (commented block)")
+            return new_content
+
+        self._edit(file_path, edit, ('comment_block', start_pattern, end_pattern))
+
+# One RebrandingTool call produced by a recipe step
+class Operation:
+    def __init__(self, step, kind, path=None, source=None, **args):
+        self.step = step
+        self.kind = kind
+        self.path = os.path.normpath(path) if path is not None else None
+        self.source = source
+        self.args = args
+
+    def apply(self, tool):
+        method = getattr(tool, 'replace_global_many' if self.kind == 'replace_global' else self.kind)
+        tool.step = self.step
+        try:
+            if tool.workspace is not None:
+                self._call(method)
+            else:
+                # Staged steps are timed as scheduler units on flush
+                with tool.profiler.span(self.step.name, 'step', self.step.name):
+                    self._call(method)
+        finally:
+            tool.step = None
+
+    def _call(self, method):
+        if self.path is None:
+            method(**self.args)
+        else:
+            method(self.path, **self.args)
+
+    def describe(self):
+        if self.kind == 'replace_global':
+            detail = f"{len(self.args['replacements'])} pattern(s)"
+        elif self.kind == 'delete_path':
+            detail = ''
+        elif self.kind == 'ensure_imports':
+            detail = ', '.join(self.args['imports'])
+        elif self.kind == 'index_search':
+            detail = f"{self.args['root']}/**/*.mdx"
+        elif self.kind == 'index_dates':
+            detail = ', '.join(self.args['paths'])
+        elif self.kind == 'index_articles':
+            detail = f"{self.args['root']}/**/{self.args['output']}"
+        else:
+            detail = (self.source or self.args.get('search_pattern') or self.args.get('pattern')
+                      or self.args.get('name') or self.args.get('attribute') or self.args.get('start_pattern', ''))
+        if len(detail) > 60:
+            detail = detail[:57] + '...'
+        return f"{self.kind:<16} {self.path or '':<42} {detail}".rstrip()
+
+class Step:
+    def __init__(self, number, name, title, phase, reads=(), writes=()):
+        self.number = number
+        self.name = name
+        self.title = title
+        self.phase = phase
+        # Files the step depends on or changes beyond the targets of its ops
+        self.reads = [os.path.normpath(p) for p in reads]
+        self.writes = [os.path.normpath(p) for p in writes]
+        self.ops = []
+
+# A recipe that cannot be loaded as written, or a step selection that does not
+# match it; the CLI reports these as usage errors
+class RecipeError(ValueError):
+    pass
+
+class Recipe:
+    def __init__(self, path, phases, steps):
+        self.path = path
+        self.phases = phases
+        self.steps = steps
+
+def _recipe_flags(names):
+    flags = 0
+    for name in names:
+        flags |= getattr(re, name)
+    return flags
+
+def _parse_operation(step, data, template_dir):
+    data = dict(data)
+    kind = data.pop('op', None)
+    source = data.get('template')
+
+    def body(inline_key, fragment):
+        if 'template' in data:
+            with open(os.path.join(template_dir, data.pop('template')), 'r', encoding='utf-8', newline='') as f:
+                text = f.read()
+            if fragment and text.endswith('\n'):
+                text = text[:-1]
+            return text
+        return data.pop(inline_key)
+
+    try:
+        if kind == 'replace_global':
+            ops = [Operation(step, kind, replacements=data.pop('replacements'), excludes=data.pop('excludes', None))]
+        elif kind == 'delete_path':
+            ops = [Operation(step, kind, path) for path in data.pop('paths')]
+        elif kind == 'write_file':
+            ops = [Operation(step, kind, data.pop('path'), source, content=body('content', False),
+                             preserve_times=data.pop('preserve_times', False))]
+        elif kind == 'replace_in_file':
+            # Recipe bodies are literal text, so escape them for re.sub
+            replacement = body('replacement', True).replace('\\', '\\\\')
+            ops = [Operation(step, kind, data.pop('path'), source,
+                             search_pattern=data.pop('pattern'), replacement=replacement,
+                             flags=_recipe_flags(data.pop('flags', ['DOTALL'])),
+                             skip_hint=data.pop('skip_hint', None))]
+        elif kind == 'replace_declaration':
+            ops = [Operation(step, kind, data.pop('path'), source, name=data.pop('name'),
+                             replacement=body('replacement', True), skip_hint=data.pop('skip_hint', None))]
+        elif kind == 'set_attribute':
+            ops = [Operation(step, kind, data.pop('path'), tag=data.pop('tag'), attribute=data.pop('attribute'),
+                             after=data.pop('after', None), before=data.pop('before', None))]
+        elif kind == 'ensure_imports':
+            ops = [Operation(step, kind, data.pop('path'), imports=data.pop('imports'), after=data.pop('after', None))]
+        elif kind == 'index_articles':
+            ops = [Operation(step, kind, root=data.pop('root', 'src/app'), output=data.pop('output', 'articles.json'),
+                             dates=data.pop('dates', None))]
+        elif kind == 'index_search':
+            ops = [Operation(step, kind, data.pop('path'), root=data.pop('root', 'src/app'))]
+        elif kind == 'index_dates':
+            ops = [Operation(step, kind, data.pop('path'), paths=data.pop('paths', ['src/app/**/*.mdx']))]
+        elif kind == 'delete_line':
+            ops = [Operation(step, kind, data.pop('path'), pattern=data.pop('pattern'))]
+        elif kind in ('delete_block', 'comment_block'):
+            ops = [Operation(step, kind, data.pop('path'), start_pattern=data.pop('start'), end_pattern=data.pop('end'))]
+        else:
+            raise RecipeError(f"step '{step.name}': unknown operation {kind!r}")
+    except KeyError as e:
+        raise RecipeError(f"step '{step.name}': {kind} is missing {e}") from None
+    except OSError as e:
+        raise RecipeError(f"step '{step.name}': template {e.filename}: {e.strerror}") from None
+    if data:
+        raise RecipeError(f"step '{step.name}': unexpected keys for {kind}: {', '.join(sorted(data))}")
+    return ops
+
+def load_recipe(path=RECIPE_PATH):
+    # Every problem with the recipe file itself is a RecipeError naming it
+    try:
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
+    except OSError as e:
+        raise RecipeError(f"{path}: {e.strerror or e}") from None
+    except tomllib.TOMLDecodeError as e:
+        raise RecipeError(f"{path}: invalid TOML: {e}") from None
+    template_dir = os.path.join(os.path.dirname(path), 'templates')
+
+    phases = []
+    for number, p in enumerate(data.get('phase', []), 1):
+        if 'title' not in p:
+            raise RecipeError(f"{path}: phase {number} is missing 'title'")
+        phases.append({'title': p['title'], 'staged': p.get('staged', False)})
+    steps = []
+    try:
+        for number, entry in enumerate(data.get('step', []), 1):
+            for key in ('name', 'phase'):
+                if key not in entry:
+                    raise RecipeError(f"step {entry.get('name', number)!r} is missing '{key}'")
+            step = Step(number, entry['name'], entry.get('title', entry['name']), entry['phase'] - 1,
+                        entry.get('reads', ()), entry.get('writes', ()))
+            if not 0 <= step.phase < len(phases):
+                raise RecipeError(f"step '{step.name}': unknown phase {entry['phase']}")
+            if any(s.name == step.name for s in steps):
+                raise RecipeError(f"duplicate step name '{step.name}'")
+            for op in entry.get('ops', []):
+                step.ops.extend(_parse_operation(step, op, template_dir))
+            steps.append(step)
+    except RecipeError as e:
+        raise RecipeError(f"{path}: {e}") from None
+    return Recipe(path, phases, steps)
+
+def select_steps(recipe, only=None, skip=None):
+    # Steps to run, picked by name or recipe number; values may be lists or
+    # comma-separated strings
+    def resolve(values):
+        if isinstance(values, str):
+            values = [values]
+        names = set()
+        for value in values or ():
+            for item in str(value).split(','):
+                item = item.strip()
+                if not item:
+                    continue
+                step = next((s for s in recipe.steps if item in (s.name, str(s.number))), None)
+                if step is None:
+                    raise RecipeError(f"unknown step '{item}'")
+                names.add(step.name)
+        return names
+
+    only_names, skip_names = resolve(only), resolve(skip)
+    return [step for step in recipe.steps
+            if (not only_names or step.name in only_names) and step.name not in skip_names]
+
+# Execution plan for a recipe. Staged phases are optimized as a whole: edits that
+# a later delete_path or write_file makes pointless are dropped, and the rest are
+# grouped by target file so the workspace sees each file's edits back to back.
+class Plan:
+    def __init__(self, recipe, steps=None):
+        self.recipe = recipe
+        self.phases = [(phase, []) for phase in recipe.phases]
+        for step in (recipe.steps if steps is None else steps):
+            self.phases[step.phase][1].extend(step.ops)
+        self.dropped = []
+        self._drop_redundant()
+        self._group_by_file()
+
+    def _drop_redundant(self):
+        staged = [op for phase, ops in self.phases if phase['staged'] for op in ops]
+        deleted_later, written_later, redundant = [], set(), set()
+        for op in reversed(staged):
+            if op.kind == 'delete_path':
+                if op.path in deleted_later:
+                    redundant.add(id(op))
+                    self.dropped.append((op, 'deleted again later'))
+                else:
+                    deleted_later.append(op.path)
+                continue
+            covering = next((d for d in deleted_later if _is_under(op.path, d)), None)
+            if covering is not None:
+                redundant.add(id(op))
+                self.dropped.append((op, f"removed later by delete_path {covering}"))
+            elif op.path in written_later:
+                redundant.add(id(op))
+                self.dropped.append((op, 'overwritten later by write_file'))
+            elif op.kind == 'write_file':
+                written_later.add(op.path)
+        self.dropped.reverse()
+        for phase, ops in self.phases:
+            ops[:] = [op for op in ops if id(op) not in redundant]
+
+    def _group_by_file(self):
+        for phase, ops in self.phases:
+            if phase['staged']:
+                first = {}
+                for index, op in enumerate(ops):
+                    first.setdefault(op.path, index)
+                ops.sort(key=lambda op: first[op.path])
+
+    def dump(self, out=None):
+        out = out or sys.stdout
+        print(f"Plan for {os.path.relpath(self.recipe.path)}", file=out)
+        for index, (phase, ops) in enumerate(self.phases, 1):
+            if not ops:
+                continue
+            staged = ' (staged)' if phase['staged'] else ''
+            print(f"\nPhase {index}: {phase['title']}{staged}", file=out)
+            for op in ops:
+                print(f"  {op.step.number:>2} {op.step.name:<22} {op.describe()}", file=out)
+        if self.dropped:
+            print(f"\nDropped {len(self.dropped)} redundant operation(s):", file=out)
+            for op, reason in self.dropped:
+                print(f"  {op.step.number:>2} {op.step.name:<22} {op.kind} {op.path}: {reason}", file=out)
+
+    def run(self, tool):
+        first = True
+        for index, (phase, ops) in enumerate(self.phases, 1):
+            if not ops:
+                continue
+            if not phase['staged']:
+                # Unstaged phases see what earlier staged phases wrote
+                tool.flush()
+            print(f"{'' if first else chr(10)}--- Phase {index}: {phase['title']} ---")
+            first = False
+            if phase['staged']:
+                tool.stage()
+            with tool.profiler.span(phase['title'], 'phase'):
+                for op in ops:
+                    op.apply(tool)
+            if not phase['staged']:
+                tool.sync()
+        tool.flush()
+
+def run_rebrand(root_dir='.', jobs=1, incremental=True, recipe_path=RECIPE_PATH, plan_only=False,
+                profile=None, trace=None, trash=False, dry_run=False, patch=None,
+                only=None, skip=None, quiet=False, json_output=False, encoding=ENCODING, newline=NEWLINE,
+                large_file_size=LARGE_FILE_SIZE, recipe=None):
+    # recipe, when given, is an already loaded recipe_path
+    if recipe is None:
+        recipe = load_recipe(recipe_path)
+    steps = select_steps(recipe, only, skip)
+    plan = Plan(recipe, steps)
+    if plan_only:
+        plan.dump()
+        return None
+
+    # A dry run's patch goes to stdout unless written to a file, in which case
+    # the progress messages move to stderr. --quiet and --json capture them.
+    out = sys.stdout
+    console = sys.stderr if dry_run and patch is None else sys.stdout
+    log = io.StringIO() if quiet or json_output else console
+    tool = RebrandingTool(root_dir, jobs=jobs, incremental=incremental, trash=trash, dry_run=dry_run,
+                          encoding=encoding, newline=newline, large_file_size=large_file_size)
+    changed = None
+    with redirect_stdout(log):
+        plan.run(tool)
+        if dry_run:
+            if patch:
+                with open(patch, 'w', encoding='utf-8', newline='') as f:
+                    changed = tool.write_diff(f)
+            else:
+                changed = tool.write_diff(out)
+        tool.patterns.report()
+        tool.profiler.report()
+        if profile:
+            tool.profiler.write_json(profile)
+        if trace:
+            tool.profiler.write_trace(trace)
+
+    if dry_run:
+        done = f"Dry run complete: {changed} file(s) would change."
+    else:
+        done = "Rebranding complete!"
+    summary = {
+        'version': 1,
+        'root': os.path.abspath(root_dir),
+        'steps': [step.name for step in steps],
+        'dry_run': dry_run,
+        'changed': changed,
+        'seconds': round(sum(s.duration for s in tool.profiler.spans if s.category == 'phase'), 6),
+        'log': log.getvalue().splitlines() if log is not console else None,
+        'hotspots': tool.profiler.hotspots(),
+    }
+    if json_output:
+        json.dump(summary, out, indent=2)
+        out.write('\n')
+    elif quiet:
+        print(done, file=console)
+    else:
+        print(f"\n{done}", file=console)
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply the rebrand recipe to a documentation tree.')
+    parser.add_argument('--root', default='.', help='tree to rebrand (default: current directory)')
+    parser.add_argument('--recipe', default=RECIPE_PATH, help='recipe file (default: recipe/rebrand.toml)')
+    parser.add_argument('--only', action='append', metavar='STEP',
+                        help='run only these steps, by name or number (repeatable, comma-separated)')
+    parser.add_argument('--skip', action='append', metavar='STEP', help='steps to leave out, by name or number')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='parallel workers; 0 means one per CPU')
+    parser.add_argument('--plan', action='store_true', help='print the execution plan and exit')
+    parser.add_argument('--dry-run', action='store_true', help='write nothing; emit a git-applicable patch')
+    parser.add_argument('--patch', metavar='FILE', help='write the dry-run patch here instead of stdout')
+    parser.add_argument('--no-incremental', dest='incremental', action='store_false',
+                        help='ignore the manifest and file list cache from earlier runs')
+    parser.add_argument('--trash', action='store_true', help='move deleted trees aside and reclaim them in the background')
+    parser.add_argument('--encoding', default=ENCODING, help=f'encoding of the edited files (default: {ENCODING})')
+    parser.add_argument('--newline', choices=NEWLINES, default=NEWLINE,
+                        help=f'line endings of rewritten files; keep leaves them as found (default: {NEWLINE})')
+    parser.add_argument('--large-file-size', type=int, default=LARGE_FILE_SIZE, metavar='BYTES',
+                        help=f'stream direct edits of files at least this large (default: {LARGE_FILE_SIZE})')
+    parser.add_argument('--profile', metavar='FILE', help='write per-operation timings as JSON')
+    parser.add_argument('--trace', metavar='FILE', help='write timings in Chrome trace format')
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('-q', '--quiet', action='store_true', help='print only the final summary line')
+    output.add_argument('--json', action='store_true', help='print a JSON summary instead of progress messages')
+    args = parser.parse_args(argv)
+    if args.patch and not args.dry_run:
+        parser.error('--patch requires --dry-run')
+    if args.json and args.dry_run and not args.patch:
+        parser.error('--json with --dry-run requires --patch FILE')
+    if args.large_file_size <= 0:
+        parser.error('--large-file-size must be a positive number of bytes')
+    try:
+        codecs.lookup(args.encoding)
+    except LookupError as e:
+        parser.error(str(e))
+
+    try:
+        recipe = load_recipe(args.recipe)
+        select_steps(recipe, args.only, args.skip)
+    except RecipeError as e:
+        parser.error(str(e))
+
+    run_rebrand(args.root, jobs=args.jobs, incremental=args.incremental, recipe_path=args.recipe,
+                plan_only=args.plan, profile=args.profile, trace=args.trace, trash=args.trash,
+                dry_run=args.dry_run, patch=args.patch, only=args.only, skip=args.skip,
+                quiet=args.quiet, json_output=args.json, encoding=args.encoding, newline=args.newline,
+                large_file_size=args.large_file_size, recipe=recipe)
 
 if __name__ == "__main__":
-    run_rebrand()
+    main()
@@ -0,0 +1,12 @@
+return (
+    <html lang="en" className="h-full" suppressHydrationWarning>
+      <body className="flex min-h-full bg-white antialiased dark:bg-zinc-900">
+        <Providers>
+          <div className="flex min-h-full w-full flex-col">
+            <HeroPattern />
+            <Layout allSections={allSections}>{children}</Layout>
+          </div>
+        </Providers>
+      </body>
+    </html>
+  )
@@ -0,0 +1,62 @@
+import glob from 'fast-glob'
+import { createHash } from 'node:crypto'
+import { readFile } from 'node:fs/promises'
+import * as path from 'node:path'
+
+const ARTICLE_INDEX_VERSION = 2
+
+async function importArticle(articleFilename, folder) {
+  let { metadata } = await import(`../app/${folder}/${articleFilename}`)
+
+  return {
+    slug: articleFilename.replace(/(\/page)?\.mdx$/, ''),
+    ...metadata,
+  }
+}
+
+function blobId(data) {
+  return createHash('sha1').update(`blob ${data.length}\0`).update(data).digest('hex')
+}
+
+// { "<page>.mdx": { blob, article } } written by `scripts/rebrand.py`
+// (index_articles). Only rebrand.py regenerates it, so an entry is used while
+// the page still has the git blob id it was indexed at; new and edited pages,
+// and pages whose article is null, are imported as before.
+async function readArticleIndex(folder) {
+  try {
+    let index = path.join(process.cwd(), 'src/app', folder, 'articles.json')
+    let { version, pages } = JSON.parse(await readFile(index, 'utf8'))
+    return version === ARTICLE_INDEX_VERSION ? pages : {}
+  } catch {
+    return {}
+  }
+}
+
+async function indexedArticle(entry, folder, articleFilename) {
+  if (!entry?.article) return null
+  let data = await readFile(path.join(process.cwd(), 'src/app', folder, articleFilename))
+  return blobId(data) === entry.blob ? entry.article : null
+}
+
+export async function getAllArticles(folder) {
+  let articleFilenames = await glob('**/page.mdx', {
+    cwd: `./src/app/${folder}`,
+  })
+  let indexed = await readArticleIndex(folder)
+
+  let articles = await Promise.all(
+    articleFilenames.map(
+      async (filename) =>
+        (await indexedArticle(indexed[filename], folder, filename)) ?? importArticle(filename, folder),
+    ),
+  )
+
+  return articles.sort((a, z) => {
+    // Primary sort: by date (newest first)
+    const dateDiff = +new Date(z.date) - +new Date(a.date)
+    if (dateDiff !== 0) return dateDiff
+
+    // Secondary sort: by slug (alphabetical) for stable ordering when dates match
+    return a.slug.localeCompare(z.slug)
+  })
+}
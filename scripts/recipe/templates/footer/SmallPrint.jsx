@@ -0,0 +1,14 @@
+function SmallPrint() {
+  return (
+    <div className="flex flex-col items-center justify-between gap-5 border-t border-zinc-900/5 pt-2 sm:flex-row dark:border-white/5">
+      <p className="text-xs text-zinc-600 dark:text-zinc-400">
+        &copy; Copyright {new Date().getFullYear()}. All rights reserved.
+      </p>
+      <div className="flex gap-4">
+        <SocialLink href="#" icon={GitHubIcon}>
+          Follow us on GitHub
+        </SocialLink>
+      </div>
+    </div>
+  )
+}
@@ -0,0 +1,59 @@
+export const Header = forwardRef(function Header({ className, ...props }, ref) {
+  let { isOpen: mobileNavIsOpen } = useMobileNavigationStore()
+  let isInsideMobileNavigation = useIsInsideMobileNavigation()
+
+  let { scrollY } = useScroll()
+  let bgOpacityLight = useTransform(scrollY, [0, 72], ['50%', '90%'])
+  let bgOpacityDark = useTransform(scrollY, [0, 72], ['20%', '80%'])
+
+
+  return (
+    <motion.div
+      {...props}
+      ref={ref}
+      data-nosnippet
+      className={clsx(
+        className,
+        'fixed inset-x-0 top-0 z-50 flex h-14 items-center justify-between gap-12 px-4 transition-all duration-300 sm:px-6 lg:px-8',
+        !isInsideMobileNavigation && 'backdrop-blur-xs dark:backdrop-blur-sm',
+        isInsideMobileNavigation
+          ? 'bg-white dark:bg-zinc-900'
+          : 'bg-white/(--bg-opacity-light) dark:bg-zinc-900/(--bg-opacity-dark)',
+      )}
+      style={{
+        '--bg-opacity-light': bgOpacityLight,
+        '--bg-opacity-dark': bgOpacityDark,
+      }}
+    >
+      <div
+        className={clsx(
+          'absolute inset-x-0 top-full h-px transition',
+          (isInsideMobileNavigation || !mobileNavIsOpen) &&
+          'bg-zinc-900/7.5 dark:bg-white/7.5',
+        )}
+      />
+      <div className="flex flex-auto items-center gap-5">
+        <Link href="/" aria-label="Home">
+          <Logo className="h-6" />
+        </Link>
+        <MobileNavigation />
+        <Search />
+      </div>
+      <div className="flex items-center gap-5">
+        {/* <nav className="hidden md:block">
+          <ul role="list" className="flex items-center gap-8">
+            <TopLevelNavItem href="/devops">DevOps</TopLevelNavItem>
+            <TopLevelNavItem href="/kubernetes">Kubernetes</TopLevelNavItem>
+            <TopLevelNavItem href="/linux">Linux</TopLevelNavItem>
+          </ul>
+        </nav> */}
+        <div className="hidden md:block md:h-5 md:w-px md:bg-zinc-900/10 md:dark:bg-white/15" />
+        <div className="flex gap-4">
+          <MobileSearch />
+          <ThemeToggle />
+        </div>
+      </div>
+    </motion.div>
+  )
+})
+
@@ -0,0 +1,34 @@
+export function MobileNavigation() {
+  let isInsideMobileNavigation = useIsInsideMobileNavigation()
+  let { isOpen: mobileNavIsOpen, toggle: toggleMobileNav, close: closeMobileNav } = useMobileNavigationStore()
+  let { isOpen: sidebarIsOpen, toggle: toggleSidebar } = useSidebarStore()
+
+  // The toggle button icon reflects BOTH states
+  let isAnyOpen = mobileNavIsOpen || sidebarIsOpen
+  let ToggleIcon = isAnyOpen ? XIcon : MenuIcon
+
+  return (
+    <IsInsideMobileNavigationContext.Provider value={true}>
+      <button
+        type="button"
+        className="relative flex size-6 items-center justify-center rounded-md transition hover:bg-zinc-900/5 dark:hover:bg-white/5"
+        aria-label="Toggle navigation"
+        onClick={() => {
+          if (window.innerWidth >= 1024) {
+            toggleSidebar()
+          } else {
+            toggleMobileNav()
+          }
+        }}
+      >
+        <span className="absolute size-12 pointer-fine:hidden" />
+        <ToggleIcon className="w-2.5 stroke-zinc-900 dark:stroke-white" />
+      </button>
+      {!isInsideMobileNavigation && (
+        <Suspense fallback={null}>
+          <MobileNavigationDialog isOpen={mobileNavIsOpen} close={closeMobileNav} />
+        </Suspense>
+      )}
+    </IsInsideMobileNavigationContext.Provider>
+  )
+}
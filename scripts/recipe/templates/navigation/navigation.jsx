@@ -0,0 +1,41 @@
+export const navigation = [
+  {
+    title: 'Guides',
+    links: [
+      { title: 'Introduction', href: '/' },
+      {
+        title: 'DevOps', href: '/devops',
+        links: [
+          { title: 'General', href: '/devops/general' },
+          { title: 'CI/CD', href: '/devops/ci-cd' },
+          { title: 'Terraform', href: '/devops/terraform' },
+          // { title: 'Ansible', href: '/devops/ansible' },
+        ]
+      },
+      {
+        title: 'Kubernetes', href: '/kubernetes',
+        links: [
+          { title: 'General', href: '/kubernetes/general' },
+          { title: 'Deployment', href: '/kubernetes/deployment' },
+          // { title: 'Services', href: '/kubernetes/services' },
+        ]
+      },
+      {
+        title: 'Linux',
+        href: '/linux',
+        links: [
+          { title: 'General', href: '/linux/general' },
+          { title: 'System Administration', href: '/linux/administration' },
+          { title: 'MySQL', href: '/linux/mysql' },
+        ]
+      },
+      {
+        title: 'Career',
+        href: '/career',
+        links: [
+          { title: 'General', href: '/career/general' },
+        ]
+      },
+    ],
+  },
+]
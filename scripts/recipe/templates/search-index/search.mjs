@@ -0,0 +1,206 @@
+import { slugifyWithCounter } from '@sindresorhus/slugify'
+import { createHash } from 'crypto'
+import glob from 'fast-glob'
+import * as fs from 'fs'
+import { toString } from 'mdast-util-to-string'
+import * as path from 'path'
+import { remark } from 'remark'
+import remarkMdx from 'remark-mdx'
+import { createLoader } from 'simple-functional-loader'
+import { filter } from 'unist-util-filter'
+import { SKIP, visit } from 'unist-util-visit'
+import * as url from 'url'
+
+const __filename = url.fileURLToPath(import.meta.url)
+const processor = remark().use(remarkMdx).use(extractSections)
+const slugify = slugifyWithCounter()
+
+function isObjectExpression(node) {
+  return (
+    node.type === 'mdxTextExpression' &&
+    node.data?.estree?.body?.[0]?.expression?.type === 'ObjectExpression'
+  )
+}
+
+function excludeObjectExpressions(tree) {
+  return filter(tree, (node) => !isObjectExpression(node))
+}
+
+function extractSections() {
+  return (tree, { sections }) => {
+    slugify.reset()
+
+    visit(tree, (node) => {
+      if (node.type === 'heading' || node.type === 'paragraph') {
+        let content = toString(excludeObjectExpressions(node))
+        if (node.type === 'heading' && node.depth <= 2) {
+          let hash = node.depth === 1 ? null : slugify(content)
+          sections.push([content, hash, []])
+        } else {
+          sections.at(-1)?.[2].push(content)
+        }
+        return SKIP
+      }
+    })
+  }
+}
+
+// Shards written by scripts/rebrand.py (index_search): one {url, sections}
+// list per top-level section, named by manifest.json along with the git blob
+// id of every page they were extracted from
+const shardDir = path.join(path.dirname(__filename), 'search')
+const SHARD_VERSION = 3
+
+function readManifest() {
+  try {
+    let manifest = JSON.parse(fs.readFileSync(path.join(shardDir, 'manifest.json'), 'utf8'))
+    return manifest.version === SHARD_VERSION ? manifest.shards : null
+  } catch (e) {
+    return null
+  }
+}
+
+function blobId(data) {
+  return createHash('sha1').update(`blob ${data.length}\0`).update(data).digest('hex')
+}
+
+// A shard is only used while its pages are exactly the ones it was built from
+function isFresh(shard, files, contents) {
+  return (
+    shard !== undefined &&
+    Object.keys(shard.pages).length === files.length &&
+    files.every((file, i) => shard.pages[file] === blobId(contents[i]))
+  )
+}
+
+function shardName(file) {
+  let parts = file.split('/')
+  return parts.length > 1 ? parts[0] : 'index'
+}
+
+export default function Search(nextConfig = {}) {
+  let cache = new Map()
+
+  return Object.assign({}, nextConfig, {
+    webpack(config, options) {
+      config.module.rules.push({
+        test: __filename,
+        use: [
+          createLoader(function () {
+            // Each precomputed shard whose pages are unchanged becomes a
+            // lazily imported chunk. Shards with a new, edited or removed page
+            // (all of them without a manifest) are parsed here and inlined.
+            let appDir = path.resolve('./src/app')
+            this.addContextDependency(appDir)
+            let manifest = readManifest()
+            if (manifest) {
+              this.addContextDependency(shardDir)
+            }
+
+            let files = {}
+            for (let file of glob.sync('**/*.mdx', { cwd: appDir })) {
+              ;(files[shardName(file)] ??= []).push(file)
+            }
+
+            let loaders = {}
+            for (let [name, shardFiles] of Object.entries(files)) {
+              let contents = shardFiles.map((file) => fs.readFileSync(path.join(appDir, file)))
+              if (isFresh(manifest?.[name], shardFiles, contents)) {
+                loaders[name] = `() => import(${JSON.stringify('./search/' + manifest[name].file)})`
+                continue
+              }
+
+              let data = shardFiles.map((file, i) => {
+                let url = '/' + file.replace(/(^|\/)page\.mdx$/, '')
+                let mdx = contents[i].toString('utf8')
+
+                let sections = []
+
+                if (cache.get(file)?.[0] === mdx) {
+                  sections = cache.get(file)[1]
+                } else {
+                  let vfile = { value: mdx, sections }
+                  processor.runSync(processor.parse(vfile), vfile)
+                  cache.set(file, [mdx, sections])
+                }
+
+                return { url, sections }
+              })
+              loaders[name] = `() => Promise.resolve({ default: ${JSON.stringify(data)} })`
+            }
+
+            // When this file is imported within the application
+            // the following module is loaded:
+            return `
+              import FlexSearch from 'flexsearch'
+
+              let sectionIndex = new FlexSearch.Document({
+                tokenize: 'full',
+                document: {
+                  id: 'url',
+                  index: 'content',
+                  store: ['title', 'pageTitle'],
+                },
+                context: {
+                  resolution: 9,
+                  depth: 2,
+                  bidirectional: true
+                }
+              })
+
+              let shards = {
+                ${Object.entries(loaders)
+                  .map(([name, load]) => `${JSON.stringify(name)}: ${load},`)
+                  .join('\n')}
+              }
+              let loaded = new Map()
+
+              function loadShard(name) {
+                if (!loaded.has(name)) {
+                  loaded.set(name, shards[name]().then(({ default: data }) => {
+                    for (let { url, sections } of data) {
+                      for (let [title, hash, content] of sections) {
+                        sectionIndex.add({
+                          url: url + (hash ? ('#' + hash) : ''),
+                          title,
+                          content: [title, ...content].join('\\n'),
+                          pageTitle: hash ? sections[0][0] : undefined,
+                        })
+                      }
+                    }
+                  }))
+                }
+                return loaded.get(name)
+              }
+
+              // options.shards limits the search (and what gets loaded) to
+              // those sections; by default every shard is loaded on first use
+              export async function search(query, options = {}) {
+                let { shards: names = Object.keys(shards), ...rest } = options
+                await Promise.all(names.filter((name) => name in shards).map(loadShard))
+                let result = sectionIndex.search(query, {
+                  ...rest,
+                  enrich: true,
+                })
+                if (result.length === 0) {
+                  return []
+                }
+                return result[0].result.map((item) => ({
+                  url: item.id,
+                  title: item.doc.title,
+                  pageTitle: item.doc.pageTitle,
+                }))
+              }
+            `
+          }),
+        ],
+      })
+
+      if (typeof nextConfig.webpack === 'function') {
+        return nextConfig.webpack(config, options)
+      }
+
+      return config
+    },
+  })
+}
@@ -0,0 +1,26 @@
+export function MobileSearch() {
+  let { close } = useMobileNavigationStore()
+  let { buttonProps, dialogProps } = useSearchProps()
+
+  return (
+    <div className="contents lg:hidden" data-nosnippet>
+      <button
+        data-nosnippet
+        type="button"
+        className="relative flex size-6 items-center justify-center rounded-md transition hover:bg-zinc-900/5 lg:hidden dark:hover:bg-white/5"
+        aria-label="Find something..."
+        {...buttonProps}
+      >
+        <span className="absolute size-12 pointer-fine:hidden" />
+        <SearchIcon className="h-5 w-5 stroke-zinc-900 dark:stroke-white" />
+      </button>
+      <Suspense fallback={null}>
+        <SearchDialog
+          className="lg:hidden"
+          onNavigate={close}
+          {...dialogProps}
+        />
+      </Suspense>
+    </div>
+  )
+}
@@ -0,0 +1,31 @@
+export function Search() {
+  let [modifierKey, setModifierKey] = useState()
+  let { buttonProps, dialogProps } = useSearchProps()
+
+  useEffect(() => {
+    setModifierKey(
+      /(Mac|iPhone|iPod|iPad)/i.test(navigator.platform) ? '⌘' : 'Ctrl ',
+    )
+  }, [])
+
+  return (
+    <div className="hidden lg:block lg:max-w-2xl lg:flex-auto" data-nosnippet>
+      <button
+        data-nosnippet
+        type="button"
+        className="hidden h-8 w-full items-center gap-2 rounded-full bg-white pr-3 pl-2 text-sm text-zinc-500 ring-1 ring-zinc-900/10 transition hover:ring-zinc-900/20 lg:flex dark:bg-white/5 dark:text-zinc-400 dark:ring-white/10 dark:ring-inset dark:hover:ring-white/20"
+        {...buttonProps}
+      >
+        <SearchIcon className="h-5 w-5 stroke-current" />
+        Find something...
+        <kbd className="ml-auto text-2xs text-zinc-400 dark:text-zinc-500" data-nosnippet>
+          <kbd className="font-sans">{modifierKey}</kbd>
+          <kbd className="font-sans">K</kbd>
+        </kbd>
+      </button>
+      <Suspense fallback={null}>
+        <SearchDialog className="hidden lg:block" {...dialogProps} />
+      </Suspense>
+    </div>
+  )
+}
@@ -0,0 +1,145 @@
+function SearchDialog({ open, setOpen, className }) {
+  let formRef = useRef(null)
+  let panelRef = useRef(null)
+  let inputRef = useRef(null)
+  let { close } = useMobileNavigationStore()
+
+  let autocomplete = createAutocomplete({
+    onStateChange({ state }) {
+      if (state.status === 'stalled') {
+        if (state.collections.length > 0) {
+          setAutocompleteState(state)
+        }
+      } else {
+        setAutocompleteState(state)
+      }
+    },
+    onSubmit({ state }) {
+      if (state.collections.length > 0 && state.collections[0].items.length > 0) {
+        let { url } = state.collections[0].items[0]
+        close()
+        window.location.href = url
+      }
+    },
+    navigator: {
+      navigate({ itemUrl }) {
+        setOpen(false)
+        close()
+        window.location.href = itemUrl
+      },
+      navigateNewTab({ itemUrl }) {
+        let windowReference = window.open(itemUrl, '_blank', 'noopener')
+        if (windowReference) {
+          windowReference.focus()
+        }
+      },
+      navigateNewWindow({ itemUrl }) {
+        window.open(itemUrl, '_blank', 'noopener')
+      },
+    },
+    getSources({ query }) {
+      return import('@/mdx/search.mjs').then(({ search }) => {
+        return [
+          {
+            sourceId: 'documentation',
+            getItems() {
+              return search(query, { limit: 5 })
+            },
+            getItemUrl({ item }) {
+              return item.url
+            },
+            onSelect({ itemUrl }) {
+              setOpen(false)
+              close()
+              window.location.href = itemUrl
+            },
+          },
+        ]
+      })
+    },
+  })
+
+  let [autocompleteState, setAutocompleteState] = useState(
+    autocomplete.getState(),
+  )
+
+  useEffect(() => {
+    if (!open) {
+      return
+    }
+
+    function onKeyDown(event) {
+      if (event.key === 'k' && (event.metaKey || event.ctrlKey)) {
+        event.preventDefault()
+        setOpen(false)
+      }
+    }
+
+    window.addEventListener('keydown', onKeyDown)
+
+    return () => {
+      window.removeEventListener('keydown', onKeyDown)
+    }
+  }, [open, setOpen])
+
+  return (
+    <Dialog
+      data-nosnippet
+      open={open}
+      onClose={() => {
+        setOpen(false)
+        autocomplete.setQuery('')
+      }}
+      className={clsx('fixed inset-0 z-50', className)}
+    >
+      <DialogPanel className="fixed inset-0 bg-zinc-400/25 backdrop-blur-sm dark:bg-black/40" />
+
+      <div className="fixed inset-0 overflow-y-auto px-4 py-4 sm:px-6 sm:py-20 md:py-32 lg:px-8 lg:py-[15vh]">
+        <DialogPanel className="mx-auto transform-gpu overflow-hidden rounded-xl bg-white shadow-xl ring-1 ring-zinc-900/5 sm:max-w-xl dark:bg-zinc-900 dark:ring-zinc-800">
+          <div {...autocomplete.getRootProps({})}>
+            <form
+              ref={formRef}
+              {...autocomplete.getFormProps({
+                inputElement: inputRef.current,
+              })}
+            >
+              <div data-nosnippet className="flex h-12 items-center gap-2 border-b border-zinc-900/7.5 px-4 dark:border-white/7.5">
+                <SearchIcon className="h-5 w-5 fill-zinc-500 dark:fill-zinc-400" />
+                <input
+                  ref={inputRef}
+                  className="flex-auto appearance-none bg-transparent pl-2 text-zinc-900 placeholder:text-zinc-500 focus:outline-none dark:text-white dark:placeholder:text-zinc-400"
+                  {...autocomplete.getInputProps({
+                    placeholder: 'Find something...',
+                    autoFocus: true,
+                    onKeyDown(event) {
+                      if (
+                        event.key === 'Escape' &&
+                        inputRef.current?.value === ''
+                      ) {
+                        setOpen(false)
+                        event.preventDefault()
+                      }
+                    },
+                  })}
+                />
+              </div>
+              <div
+                ref={panelRef}
+                className="max-h-96 overflow-y-auto px-4 py-2 border-t border-zinc-100 dark:border-zinc-800 empty:hidden"
+                {...autocomplete.getPanelProps({})}
+              >
+                {autocompleteState.isOpen && (
+                  <SearchResults
+                    autocomplete={autocomplete}
+                    query={autocompleteState.query}
+                    collection={autocompleteState.collections[0]}
+                  />
+                )}
+              </div>
+            </form>
+          </div>
+        </DialogPanel>
+      </div>
+    </Dialog>
+  )
+}
@@ -0,0 +1,9 @@
+'use client'
+import { create } from 'zustand'
+
+export const useSidebarStore = create()((set) => ({
+  isOpen: false,
+  open: () => set({ isOpen: true }),
+  close: () => set({ isOpen: false }),
+  toggle: () => set((state) => ({ isOpen: !state.isOpen })),
+}))
@@ -0,0 +1,26 @@
+import json
+
+from bench_rebrand import RESULT_VERSION, TOKEN, generate_tree, main
+
+def test_generated_trees_are_reproducible(tmp_path):
+    trees = []
+    for name in ('a', 'b'):
+        components = generate_tree(str(tmp_path / name), 30, 0.5, seed=7)
+        files = sorted((tmp_path / name).rglob('*.*'))
+        trees.append((components, [(p.relative_to(tmp_path / name), p.read_text()) for p in files]))
+    assert trees[0] == trees[1]
+    assert len(trees[0][1]) == 30
+    assert any(TOKEN in text for _, text in trees[0][1])
+
+def test_report_has_one_result_per_benchmark_and_mode(tmp_path):
+    output = tmp_path / 'report.json'
+    main(['--files', '20', '--repeat', '1', '--jobs', '2', '--only', 'replace_global', 'delete_line',
+          '--output', str(output)])
+    report = json.loads(output.read_text())
+    assert report['version'] == RESULT_VERSION
+    assert [(r['name'], r['mode'], r['files']) for r in report['results']] == [
+        ('replace_global', 'sequential', 20),
+        ('replace_global', 'parallel-2', 20),
+        ('delete_line', 'sequential', 20),
+    ]
+    assert all(0 <= r['min_s'] <= r['mean_s'] for r in report['results'])
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from deploy_manifest import deploy_manifest, diff_manifests, main
+
+def _entry(digest):
+    return {'sha256': digest, 'size': 1}
+
+def test_diff_manifests():
+    previous = {'same': _entry('1'), 'edited': _entry('2'), 'gone': _entry('3')}
+    current = {'same': _entry('1'), 'edited': _entry('9'), 'new': _entry('4')}
+    assert diff_manifests(previous, current) == {'added': ['new'], 'changed': ['edited'], 'removed': ['gone']}
+
+def _export(root, files):
+    if root.exists():
+        for path in sorted(root.rglob('*'), reverse=True):
+            path.unlink() if path.is_file() else path.rmdir()
+    for name, text in files.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(text)
+
+def _args(tmp_path):
+    return ['--manifest', str(tmp_path / 'manifest.json'), '--pending', str(tmp_path / 'pending.json')]
+
+def test_only_commit_replaces_the_manifest(tmp_path):
+    out = tmp_path / 'out'
+    _export(out, {'a.html': 'A'})
+    main([str(out), *_args(tmp_path)])
+    assert not (tmp_path / 'manifest.json').exists()
+    # Not committed: the next run still lists the file
+    changes = deploy_manifest(str(out), previous_path=str(tmp_path / 'manifest.json'),
+                              pending_path=str(tmp_path / 'pending.json'))
+    assert changes['added'] == ['a.html']
+    main(['--commit', *_args(tmp_path)])
+    assert not (tmp_path / 'pending.json').exists()
+    changes = deploy_manifest(str(out), previous_path=str(tmp_path / 'manifest.json'),
+                              pending_path=str(tmp_path / 'pending.json'))
+    assert changes == {'added': [], 'changed': [], 'removed': []}
+
+def test_commit_without_a_pending_manifest_is_a_usage_error(tmp_path):
+    with pytest.raises(SystemExit):
+        main(['--commit', *_args(tmp_path)])
+
+def test_stage_matches_the_export_after_an_uncommitted_run(tmp_path):
+    out, stage = tmp_path / 'out', tmp_path / 'stage'
+    _export(out, {'a.html': 'C', 'keep/b.html': 'B'})
+    main([str(out), *_args(tmp_path), '--stage', str(stage)])
+    main(['--commit', *_args(tmp_path)])
+    # Run A is staged but never committed
+    _export(out, {'a.html': 'A', 'keep/b.html': 'B', 'x/x.html': 'X'})
+    main([str(out), *_args(tmp_path), '--stage', str(stage)])
+    # Run B goes back to what was committed
+    _export(out, {'a.html': 'C', 'keep/b.html': 'B'})
+    main([str(out), *_args(tmp_path), '--stage', str(stage)])
+    assert (stage / 'a.html').read_text() == 'C'
+    assert (stage / 'keep' / 'b.html').read_text() == 'B'
+    assert not (stage / 'x').exists()
+
+def test_changes_are_listed_with_slash_separated_keys(tmp_path, capsys):
+    out = tmp_path / 'out'
+    _export(out, {'index.html': 'A', 'docs/a/index.html': 'B', 'docs/old.html': 'C'})
+    main([str(out), '-j', '2', *_args(tmp_path)])
+    main(['--commit', *_args(tmp_path)])
+    _export(out, {'index.html': 'A', 'docs/a/index.html': 'B2', 'docs/new.html': 'D'})
+    capsys.readouterr()
+    main([str(out), '-j', '2', '--changes', str(tmp_path / 'changes.json'), *_args(tmp_path)])
+    expected = {'added': ['docs/new.html'], 'changed': ['docs/a/index.html'], 'removed': ['docs/old.html']}
+    assert json.loads((tmp_path / 'changes.json').read_text()) == expected
+    assert '1 added, 1 changed, 1 removed, 1 unchanged' in capsys.readouterr().out
+
+def test_outdated_manifest_counts_every_file_as_added(tmp_path, capsys):
+    out = tmp_path / 'out'
+    _export(out, {'a.html': 'A'})
+    (tmp_path / 'manifest.json').write_text(json.dumps({'version': 0, 'files': {'a.html': {}}}))
+    changes = deploy_manifest(str(out), previous_path=str(tmp_path / 'manifest.json'),
+                              pending_path=str(tmp_path / 'pending.json'))
+    assert changes['added'] == ['a.html']
+    assert 'every file counts as added' in capsys.readouterr().err
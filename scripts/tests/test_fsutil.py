@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from fsutil import Scanner, compile_globs
+
+def _tree(root, files):
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+def _scan(scanner):
+    return sorted(p.replace(os.sep, '/') for p in scanner.scan())
+
+@pytest.mark.parametrize('pattern, matches, misses', [
+    ('*.mdx', ['page.mdx', 'a/b/page.mdx'], ['page.mdx.bak', 'a/page.md']),
+    ('src/*.js', ['src/a.js'], ['src/a/b.js', 'x/src/a.js']),
+    ('src/**/*.js', ['src/a.js', 'src/a/b/c.js'], ['lib/a.js']),
+    ('node_modules/', ['node_modules', 'a/node_modules'], ['node_modules_x']),
+    ('file[0-9].[!j]s', ['file1.ts'], ['file1.js', 'filex.ts']),
+])
+def test_globs_follow_gitignore_syntax(pattern, matches, misses):
+    regex = compile_globs([pattern])
+    assert [p for p in matches if not regex.match(p)] == []
+    assert [p for p in misses if regex.match(p)] == []
+
+def test_scanner_applies_nested_gitignores_negation_and_excludes(tmp_path):
+    _tree(tmp_path, {
+        '.gitignore': '# build output\nout/\n*.log\n!keep.log\n/top.js\n',
+        'top.js': '', 'src/top.js': '', 'debug.log': '', 'keep.log': '',
+        'out/page.js': '', 'src/out': 'a file, not a directory',
+        'src/.gitignore': 'generated/\n!important.js\n*.js\n',
+        'src/app.jsx': '', 'src/skip.js': '', 'src/important.js': '', 'src/generated/x.jsx': '',
+        'src/vendor/lib.js': '', 'node_modules/pkg/index.js': '', '.git/config.js': '',
+    })
+    (tmp_path / 'linked').symlink_to(tmp_path / 'src', target_is_directory=True)
+    scanner = Scanner(str(tmp_path), ['*.js', '*.jsx', '*.log', 'out'], ['node_modules', 'src/vendor'])
+    assert _scan(scanner) == ['keep.log', 'src/app.jsx', 'src/out']
+    assert _scan(Scanner(str(tmp_path), ['*.js'], gitignore=False)) == [
+        'node_modules/pkg/index.js', 'out/page.js', 'src/important.js', 'src/skip.js', 'src/top.js',
+        'src/vendor/lib.js', 'top.js']
+
+def test_scanner_cache_relists_only_changed_directories(tmp_path):
+    _tree(tmp_path, {'a/one.js': '', 'b/two.js': '', 'c/three.js': ''})
+    cache = tmp_path / '.cache' / 'files.json'
+    cache.parent.mkdir()
+
+    def scan():
+        scanner = Scanner(str(tmp_path), ['*.js'], ['.cache'], cache_path=str(cache))
+        return _scan(scanner), scanner.listed, scanner.reused
+
+    assert scan() == (['a/one.js', 'b/two.js', 'c/three.js'], 4, 0)
+    assert scan() == (['a/one.js', 'b/two.js', 'c/three.js'], 0, 4)
+    (tmp_path / 'b' / 'new.js').write_text('')
+    (tmp_path / 'c' / 'three.js').unlink()
+    assert scan() == (['a/one.js', 'b/new.js', 'b/two.js'], 2, 2)
+    # A different configuration never reuses the cache
+    assert len(_scan(Scanner(str(tmp_path), ['*.js', '*.json'], ['.cache'], cache_path=str(cache)))) == 3
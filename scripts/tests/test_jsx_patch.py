@@ -0,0 +1,103 @@
+import pytest
+
+from jsx_patch import SourceIndex, import_edits, splice
+
+def _span(text, name):
+    declaration = SourceIndex(text).declaration(name)
+    assert declaration is not None, name
+    return text[declaration.start:declaration.end]
+
+def test_arrow_function_const_keeps_closing_brace():
+    text = ("export const Card = ({ title }) => {\n"
+            "  const label = title.trim()\n"
+            "  return <div>{label}</div>\n"
+            "}\n"
+            "\n"
+            "export const Other = 1\n")
+    assert _span(text, 'Card') == text[:text.index('}\n\n') + 1]
+    assert _span(text, 'Other') == 'export const Other = 1'
+
+def test_object_without_trailing_comma():
+    text = "const conf = {\n  a: 1,\n  b: [\n    2\n  ]\n}\nconst next = 2\n"
+    assert _span(text, 'conf') == "const conf = {\n  a: 1,\n  b: [\n    2\n  ]\n}"
+    assert _span(text, 'next') == 'const next = 2'
+
+def test_call_spanning_lines():
+    text = "const x = compose(\n  a,\n  b\n)\nlet y\n"
+    assert _span(text, 'x') == "const x = compose(\n  a,\n  b\n)"
+    assert _span(text, 'y') == 'let y'
+
+def test_regex_versus_division():
+    text = ("const ratio = total / count / 2\n"
+            "const pattern = /[/}]+\\//g\n"
+            "const after = 1\n")
+    assert _span(text, 'ratio') == 'const ratio = total / count / 2'
+    assert _span(text, 'pattern') == 'const pattern = /[/}]+\\//g'
+    assert _span(text, 'after') == 'const after = 1'
+
+def test_jsx_text_with_braces_and_quotes():
+    text = ("export function Note() {\n"
+            "  return (\n"
+            "    <p title=\"}\">\n"
+            "      Don't {'{'} \"quoted\" {\"}\"}\n"
+            "    </p>\n"
+            "  )\n"
+            "}\n"
+            "export const tail = 1\n")
+    assert _span(text, 'Note') == text[:text.index('\nexport const')]
+    assert _span(text, 'tail') == 'export const tail = 1'
+
+def test_replace_arrow_declaration_leaves_no_stray_brace():
+    text = "const Card = () => {\n  return null\n}\n\nexport default Card\n"
+    declaration = SourceIndex(text).declaration('Card')
+    out = splice(text, [(declaration.start, declaration.end, 'const Card = () => null')])
+    assert out == "const Card = () => null\n\nexport default Card\n"
+
+def test_splice_rejects_overlaps():
+    with pytest.raises(ValueError):
+        splice('abcdef', [(0, 3, 'x'), (2, 4, 'y')])
+
+def _ensure(text, requests, after=None):
+    edits, changed, unparsed = import_edits(text, SourceIndex(text), requests, after)
+    return splice(text, edits), changed, unparsed
+
+def test_import_merges_into_existing_statement():
+    text = "import { a } from 'x'\nimport y from 'y'\n"
+    out, changed, unparsed = _ensure(text, [('x', ['c']), ('z', ['d'])])
+    assert out == "import { a, c } from 'x'\nimport y from 'y'\nimport { d } from 'z'\n"
+    assert changed == ['x', 'z'] and unparsed == []
+
+def test_import_already_present_is_left_alone():
+    text = "import { a, b as c } from 'x'\n"
+    assert _ensure(text, [('x', ['a', 'b as c'])]) == (text, [], [])
+
+def test_import_with_comment_is_reported_not_duplicated():
+    text = "import {\n  a, // don't drop\n  c,\n} from 'x'\n"
+    out, changed, unparsed = _ensure(text, [('x', ['c'])])
+    assert out == text
+    assert unparsed == ['x']
+
+def test_side_effect_import_does_not_block_merge():
+    text = "import 'x'\nimport { a } from 'x'\n"
+    out, _, unparsed = _ensure(text, [('x', ['b'])])
+    assert out == "import 'x'\nimport { a, b } from 'x'\n"
+    assert unparsed == []
+
+def test_duplicate_imports_of_a_module_are_folded_together():
+    text = "import { a } from 'x'\nimport { b } from 'x'\nimport z from 'z'\n"
+    assert _ensure(text, [('x', ['c'])]) == ("import { a, b, c } from 'x'\nimport z from 'z'\n", ['x'], [])
+
+def test_new_import_follows_after_and_the_file_style():
+    text = 'import a from "a";\nimport b from "b";\n'
+    out, _, _ = _ensure(text, [('n', ['q'])], after='a')
+    assert out == 'import a from "a";\nimport { q } from "n";\nimport b from "b";\n'
+
+@pytest.mark.parametrize('text, specifiers, expected', [
+    ("import * as ns from 'x'\n", ['c'], "import * as ns from 'x'\nimport { c } from 'x'\n"),
+    ("import { a } from 'x'\n", ['default as X'], "import X, { a } from 'x'\n"),
+    ("'use client'\n\nexport const a = 1\n", ['c'], "'use client'\n\nimport { c } from 'x'\n\nexport const a = 1\n"),
+    ("import { alpha } from 'x'\n", ['betaLongName', 'gammaLongName', 'deltaLongName', 'epsilonLongName'],
+     "import {\n  alpha,\n  betaLongName,\n  gammaLongName,\n  deltaLongName,\n  epsilonLongName,\n} from 'x'\n"),
+])
+def test_import_shapes(text, specifiers, expected):
+    assert _ensure(text, [('x', specifiers)])[0] == expected
@@ -0,0 +1,68 @@
+import gzip
+import json
+import os
+import random
+
+from precompress import precompress
+
+def _run(tmp_path, **kwargs):
+    return precompress(str(tmp_path / 'out'), encodings=('gz',), cache_dir=str(tmp_path / 'cache'), **kwargs)
+
+def _write(tmp_path, name, data):
+    path = tmp_path / 'out' / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+def _noise(size):
+    return random.Random(size).randbytes(size)
+
+def test_rebuild_reuses_stored_outputs(tmp_path):
+    page = _write(tmp_path, 'a/index.html', b'<p>hello</p>' * 500)
+    assert _run(tmp_path)['written'] == 1
+    os.remove(f"{page}.gz")
+    stats = _run(tmp_path)
+    assert (stats['written'], stats['reused']) == (0, 1)
+    assert gzip.decompress((tmp_path / 'out' / 'a' / 'index.html.gz').read_bytes()) == page.read_bytes()
+
+def test_poor_ratios_are_remembered_and_retried_with_a_looser_max_ratio(tmp_path):
+    _write(tmp_path, 'noise.js', _noise(4096))
+    assert _run(tmp_path)['poor'] == 1
+    poor = json.loads((tmp_path / 'cache' / 'index.json').read_text())['poor']
+    assert len(poor) == 1 and list(poor.values())[0] > 0.9
+    assert _run(tmp_path)['poor'] == 1
+    assert _run(tmp_path, max_ratio=1.5)['written'] == 1
+
+def test_stale_outputs_and_store_entries_are_removed(tmp_path):
+    page = _write(tmp_path, 'app.css', b'a{color:red}' * 500)
+    _run(tmp_path)
+    stored = set(os.listdir(tmp_path / 'cache' / 'store'))
+    page.write_bytes(_noise(4096))
+    _run(tmp_path)
+    assert not os.path.exists(f"{page}.gz")
+    assert not stored & set(os.listdir(tmp_path / 'cache' / 'store'))
+
+def test_small_files_and_sitemaps_are_left_alone(tmp_path):
+    _write(tmp_path, 'tiny.json', b'{}')
+    sitemap = _write(tmp_path, 'sitemap-0.xml', b'<url></url>' * 500)
+    stats = _run(tmp_path)
+    assert (stats['files'], stats['small']) == (1, 1)
+    assert not os.path.exists(f"{sitemap}.gz")
+
+def test_parallel_run_writes_the_same_outputs(tmp_path):
+    outputs = []
+    for jobs in (1, 2):
+        root = tmp_path / str(jobs)
+        for n in range(12):
+            _write(root, f"s{n % 3}/page{n}.html", b'<li>item</li>' * (200 + n))
+        stats = _run(root, jobs=jobs)
+        assert (stats['files'], stats['written']) == (12, 12)
+        outputs.append({p.relative_to(root): p.read_bytes() for p in (root / 'out').rglob('*.gz')})
+    assert outputs[0] == outputs[1]
+
+def test_missing_brotli_falls_back_to_gzip(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr('precompress.brotli', None)
+    page = _write(tmp_path, 'index.html', b'<p>hello</p>' * 500)
+    precompress(str(tmp_path / 'out'), cache_dir=str(tmp_path / 'cache'))
+    assert 'brotli is not installed' in capsys.readouterr().err
+    assert os.path.exists(f"{page}.gz") and not os.path.exists(f"{page}.br")
@@ -0,0 +1,716 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+import pytest
+
+import rebrand
+from rebrand import Plan, PatternRegistry, Profiler, RebrandingTool, StepScheduler, WriteBatch, _article_metadata, _git_blob_id, _page_sections, _slug_counter, load_recipe, main
+
+def test_failing_staged_edit_leaves_tree_untouched(tmp_path):
+    (tmp_path / 'gone').mkdir()
+    (tmp_path / 'gone' / 'page.mdx').write_text('old\n')
+    (tmp_path / 'file.txt').write_text('hello\n')
+    tool = RebrandingTool(str(tmp_path), incremental=False)
+    tool.stage()
+    tool.delete_path('gone')
+    tool.replace_in_file('file.txt', 'hello', r'\9')
+    with pytest.raises(Exception):
+        tool.flush()
+    assert (tmp_path / 'gone' / 'page.mdx').read_text() == 'old\n'
+    assert (tmp_path / 'file.txt').read_text() == 'hello\n'
+
+def test_patterns_compile_once_per_pattern_and_flags(tmp_path):
+    (tmp_path / 'a.txt').write_text('foo\nbar\n')
+    (tmp_path / 'b.txt').write_text('foo\n')
+    patterns = PatternRegistry()
+    tool = RebrandingTool(str(tmp_path), patterns=patterns)
+    for name in ('a.txt', 'b.txt', 'a.txt'):
+        tool.replace_in_file(name, 'foo', 'baz')
+    tool.delete_line('a.txt', '^bar')
+    assert sorted(patterns.patterns) == [('^bar', 0), ('foo', re.DOTALL)]
+    assert patterns.get('foo', 0) is patterns.get('foo')
+    assert patterns.get('foo', 0) is not patterns.get('foo', re.DOTALL)
+    assert (tmp_path / 'a.txt').read_text() == 'baz\n'
+
+def test_staged_edits_reach_disk_only_on_flush(tmp_path, capsys):
+    (tmp_path / 'a.txt').write_text('one\n')
+    tool = RebrandingTool(str(tmp_path), incremental=False)
+    tool.stage()
+    tool.replace_in_file('a.txt', 'one', 'two')
+    tool.replace_in_file('a.txt', 'two', 'three')
+    tool.write_file('b.txt', 'new\n')
+    assert (tmp_path / 'a.txt').read_text() == 'one\n'
+    assert not (tmp_path / 'b.txt').exists()
+    assert tool.workspace.read('a.txt') == 'three\n'
+    tool.flush()
+    assert (tmp_path / 'a.txt').read_text() == 'three\n'
+    assert (tmp_path / 'b.txt').read_text() == 'new\n'
+    assert 'Flushed 2 staged file(s)' in capsys.readouterr().out
+
+def test_staged_write_under_a_deleted_tree_survives_the_delete(tmp_path):
+    (tmp_path / 'app' / 'old').mkdir(parents=True)
+    (tmp_path / 'app' / 'old' / 'page.mdx').write_text('old\n')
+    (tmp_path / 'app' / 'stale.mdx').write_text('stale\n')
+    tool = RebrandingTool(str(tmp_path), incremental=False)
+    tool.stage()
+    tool.replace_in_file('app/stale.mdx', 'stale', 'edited')
+    tool.delete_path('app')
+    tool.write_file('app/new/page.mdx', 'new\n')
+    assert tool.workspace.read('app/stale.mdx') is None
+    tool.flush()
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in (tmp_path / 'app').rglob('*')) == \
+        ['app/new', 'app/new/page.mdx']
+
+@pytest.mark.parametrize('staged', [False, True])
+def test_global_replacements_run_in_one_pass_longest_first(tmp_path, staged):
+    (tmp_path / 'a.md').write_text('Emerald emerald-500 ruby\n')
+    (tmp_path / 'b.css').write_text('nothing here\n')
+    tool = RebrandingTool(str(tmp_path), incremental=False)
+    if staged:
+        tool.stage()
+    # A replacement is never fed to another pattern, and the longer of two
+    # overlapping tokens wins
+    tool.replace_global_many({'emerald': 'ruby', 'ruby': 'gold', 'emerald-500': 'red-600', 'Emerald': 'Ruby'})
+    tool.flush()
+    assert (tmp_path / 'a.md').read_text() == 'Ruby red-600 gold\n'
+    assert (tmp_path / 'b.css').read_text() == 'nothing here\n'
+
+@pytest.mark.parametrize('staged', [False, True])
+def test_global_replacement_keeps_line_endings(tmp_path, staged):
+    (tmp_path / 'a.jsx').write_bytes(b'a\r\ntext-emerald-500\r\n')
+    tool = RebrandingTool(str(tmp_path), incremental=False)
+    if staged:
+        tool.stage()
+    tool.replace_global('emerald', 'red')
+    tool.flush()
+    assert (tmp_path / 'a.jsx').read_bytes() == b'a\r\ntext-red-500\r\n'
+
+def test_global_replacement_leaves_files_without_tokens_untouched(tmp_path, capsys):
+    (tmp_path / 'hit.jsx').write_text('emerald\n')
+    (tmp_path / 'miss.jsx').write_text('nothing\n')
+    (tmp_path / 'binary.json').write_bytes(b'\xff\xfe not utf-8')
+    (tmp_path / 'same.md').write_text('emerald\n')
+    before = {name: (tmp_path / name).stat() for name in ('miss.jsx', 'binary.json', 'same.md')}
+    tool = RebrandingTool(str(tmp_path))
+    tool.replace_global_many({'emerald': 'red'}, excludes=['same.md'])
+    assert 'Scanned 3 file(s): 1 candidate(s), 1 rewritten' in capsys.readouterr().out
+    for name, st in before.items():
+        after = (tmp_path / name).stat()
+        assert (after.st_ino, after.st_mtime_ns) == (st.st_ino, st.st_mtime_ns)
+    assert (tmp_path / 'hit.jsx').read_text() == 'red\n'
+
+def test_parallel_global_replacement_matches_serial(tmp_path):
+    trees = []
+    for jobs in (1, 2):
+        root = tmp_path / str(jobs)
+        for i in range(150):
+            (root / 'src' / str(i % 7)).mkdir(parents=True, exist_ok=True)
+            (root / 'src' / str(i % 7) / f'{i}.jsx').write_text(f'text-emerald-{i}\n' if i % 3 else 'plain\n')
+        RebrandingTool(str(root), jobs=jobs, incremental=False).replace_global('emerald', 'red')
+        trees.append({p.relative_to(root): p.read_text() for p in root.rglob('*.jsx')})
+    assert trees[0] == trees[1]
+    assert trees[1][Path('src/1/1.jsx')] == 'text-red-1\n'
+
+def test_text_edit_after_global_replacement_normalizes_once(tmp_path):
+    (tmp_path / 'a.jsx').write_bytes(b'emerald\r\nkeep\r\n')
+    tool = RebrandingTool(str(tmp_path), incremental=False)
+    tool.stage()
+    tool.replace_global('emerald', 'red')
+    tool.delete_line('a.jsx', r'^keep')
+    tool.flush()
+    assert (tmp_path / 'a.jsx').read_bytes() == b'red\n'
+
+def test_index_ops_see_pages_that_only_exist_in_staging(tmp_path):
+    (tmp_path / 'src' / 'app' / 'devops').mkdir(parents=True)
+    tool = RebrandingTool(str(tmp_path), dry_run=True)
+    tool.write_file('src/app/devops/new/page.mdx', '# New\n\nFirst paragraph.\n')
+    tool.index_articles('src/app')
+    tool.index_search('src/mdx/search', 'src/app')
+    patch = ''.join(tool.diff())
+    assert 'src/app/devops/articles.json' in patch
+    assert '"devops/new/page.mdx"' in patch
+
+def _metadata(text):
+    data = text.encode()
+    return _article_metadata('page.mdx', ['2024-01-01', '2024-02-01', _git_blob_id(data)], data)[1]
+
+def test_article_metadata_reads_only_top_level_properties():
+    metadata = _metadata("export const metadata = {\n  title: 'Real',\n  openGraph: { title: 'OG', images: [`a.png`, 2] },\n"
+                         "  draft: false,\n}\n\n# Heading\n\nBody text.\n")
+    assert metadata == {'title': 'Real', 'openGraph': {'title': 'OG', 'images': ['a.png', 2]}, 'draft': False,
+                        'description': 'Body text.', 'date': '2024-02-01', 'dateCreated': '2024-01-01',
+                        'dateModified': '2024-02-01'}
+
+def test_article_metadata_reads_frontmatter():
+    metadata = _metadata("---\nauthor: 'It''s me'\nsummary:\nkeywords:\n  - a\n  - 2\n---\n\n# Title\n\nBody.\n")
+    assert metadata['author'] == "It's me"
+    assert metadata['summary'] is None
+    assert metadata['keywords'] == ['a', 2]
+    assert metadata['title'] == 'Title'
+
+@pytest.mark.parametrize('text', [
+    "export const metadata = { ...base, title: 'x' }\n",
+    "export const metadata = { title: name }\n",
+    "export const metadata = { title: `${name}` }\n",
+    "export const metadata = { [key]: 'x' }\n",
+    "---\ntags: [a, b]\n---\n",
+    "# Title\n\n<Note>\n  Inside JSX.\n</Note>\n",
+    "# Title &amp; more\n\nBody.\n",
+])
+def test_article_metadata_skips_what_it_cannot_reproduce(text):
+    assert _metadata(text) is None
+
+def test_article_metadata_needs_current_commit_dates():
+    data = b'# Title\n\nBody.\n'
+    assert _article_metadata('page.mdx', ['2024-01-01', '2024-02-01', 'stale'], data)[1] is None
+    assert _article_metadata('page.mdx', None, data) == (_git_blob_id(data), None)
+
+def test_rerun_of_delete_then_write_keeps_the_written_file(tmp_path):
+    (tmp_path / 'sec').mkdir()
+    (tmp_path / 'sec' / 'old.mdx').write_text('old\n')
+    for _ in range(2):
+        tool = RebrandingTool(str(tmp_path), incremental=True)
+        tool.stage()
+        tool.delete_path('sec')
+        tool.write_file('sec/page.mdx', 'new\n')
+        tool.flush()
+        assert (tmp_path / 'sec' / 'page.mdx').read_text() == 'new\n'
+    assert not (tmp_path / 'sec' / 'old.mdx').exists()
+
+def test_rerun_skips_unchanged_files_and_redoes_edited_ones(tmp_path, capsys):
+    (tmp_path / 'a.jsx').write_text('emerald\n')
+
+    def run():
+        tool = RebrandingTool(str(tmp_path), incremental=True)
+        tool.stage()
+        tool.replace_in_file('a.jsx', 'emerald', 'red')
+        tool.flush()
+
+    run()
+    assert (tmp_path / 'a.jsx').read_text() == 'red\n'
+    capsys.readouterr()
+    run()
+    assert 'Skipped 1 file(s)' in capsys.readouterr().out
+    (tmp_path / 'a.jsx').write_text('emerald again\n')
+    run()
+    assert (tmp_path / 'a.jsx').read_text() == 'red again\n'
+
+def test_rerun_redoes_files_whose_recipe_changed_or_that_were_removed(tmp_path):
+    (tmp_path / 'a.jsx').write_text('emerald\n')
+
+    def run(replacement):
+        tool = RebrandingTool(str(tmp_path), incremental=True)
+        tool.stage()
+        tool.replace_in_file('a.jsx', 'emerald|red', replacement)
+        tool.write_file('gen.txt', 'generated\n')
+        tool.flush()
+
+    run('red')
+    run('ruby')
+    assert (tmp_path / 'a.jsx').read_text() == 'ruby\n'
+    (tmp_path / 'gen.txt').unlink()
+    run('ruby')
+    assert (tmp_path / 'gen.txt').read_text() == 'generated\n'
+
+def test_unreadable_manifest_is_ignored(tmp_path, capsys):
+    (tmp_path / '.rebrand').mkdir()
+    (tmp_path / '.rebrand' / 'manifest.json').write_text('{not json')
+    (tmp_path / 'a.jsx').write_text('emerald\n')
+    tool = RebrandingTool(str(tmp_path), incremental=True)
+    tool.stage()
+    tool.replace_in_file('a.jsx', 'emerald', 'red')
+    tool.flush()
+    assert 'Warning: ignoring unreadable manifest' in capsys.readouterr().out
+    assert (tmp_path / 'a.jsx').read_text() == 'red\n'
+
+@pytest.mark.parametrize('encoding, newline, data', [
+    ('utf-8', 'lf', b'first\r\na\r\nline\r\n'),
+    ('utf-8', 'keep', b'first\na\nline\n'),
+    ('utf-8', 'crlf', b'first\na\nline\n'),
+    ('utf-16', 'lf', 'first\na\nline\n'.encode('utf-16')),
+])
+def test_replace_in_file_gives_the_same_result_at_any_size(tmp_path, encoding, newline, data):
+    results = []
+    for large_file_size in (1, 1 << 20):
+        (tmp_path / 'a.txt').write_bytes(data)
+        tool = RebrandingTool(str(tmp_path), encoding=encoding, newline=newline, large_file_size=large_file_size)
+        tool.replace_in_file('a.txt', r'a\nline', 'b\nline')
+        tool.flush()
+        results.append((tmp_path / 'a.txt').read_bytes())
+    assert results[0] == results[1]
+    assert b'b' in results[0].replace(b'\x00', b'')
+
+@pytest.mark.parametrize('chunk', [1, 3, 5, 7, 64])
+def test_streamed_replacement_finds_tokens_split_across_chunks(tmp_path, monkeypatch, chunk):
+    monkeypatch.setattr(rebrand, 'STREAM_CHUNK_SIZE', chunk)
+    data = b'emerald-500 \xff emeraldemerald x emerald' * 3
+    (tmp_path / 'a.css').write_bytes(data)
+    tool = RebrandingTool(str(tmp_path), large_file_size=1)
+    tool.replace_global_many({'emerald': 'red', 'emerald-500': 'ruby-600'})
+    assert (tmp_path / 'a.css').read_bytes() == data.replace(b'emerald-500', b'ruby-600').replace(b'emerald', b'red')
+
+def test_large_file_paths_leave_empty_files_alone(tmp_path):
+    (tmp_path / 'empty.jsx').write_bytes(b'')
+    (tmp_path / 'a.jsx').write_bytes(b'emerald\n')
+    tool = RebrandingTool(str(tmp_path), large_file_size=0)
+    tool.replace_global('emerald', 'red')
+    tool.replace_in_file('empty.jsx', 'emerald', 'red')
+    tool.replace_in_file('a.jsx', 'red', 'blue')
+    tool.flush()
+    assert (tmp_path / 'empty.jsx').read_bytes() == b''
+    assert (tmp_path / 'a.jsx').read_bytes() == b'blue\n'
+
+def test_cli_rejects_a_non_positive_large_file_size(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main(['--root', str(tmp_path), '--large-file-size', '0'])
+    assert '--large-file-size must be' in capsys.readouterr().err
+
+# Expected ids are what @sindresorhus/slugify's slugifyWithCounter gives,
+# i.e. the heading ids rehype assigns
+@pytest.mark.parametrize('headings, slugs', [
+    (['HAProxy', 'Method 1: Disable IPv6 Using sysctl'], ['ha-proxy', 'method-1-disable-i-pv6-using-sysctl']),
+    (['fooBar 123 $#%', 'XMLHttpRequest', 'APIs', "Don't panic"], ['foo-bar-123', 'xml-http-request', 'apis', 'dont-panic']),
+    (['I \u2665 Dogs', '  D\u00e9j\u00e0 Vu!  ', 'Q&A'], ['i-love-dogs', 'deja-vu', 'q-and-a']),
+    (['foo bar', 'foo bar', 'Foo Bar', 'foo-bar-2'], ['foo-bar', 'foo-bar-2', 'foo-bar-3', 'foo-bar-2-1']),
+    (['!!!', 'Setup'], ['', 'setup']),
+])
+def test_slugs_match_slugify_with_counter(headings, slugs):
+    slugify = _slug_counter()
+    assert [slugify(heading) for heading in headings] == slugs
+
+def test_page_sections_defer_headings_that_need_transliteration():
+    assert _page_sections('## HAProxy\n\nText.\n') == [['HAProxy', 'ha-proxy', ['Text.']]]
+    assert _page_sections('## \u041f\u0440\u0438\u0432\u0435\u0442\n') is None
+
+@pytest.mark.parametrize('text, message', [
+    (None, 'No such file'),
+    ('[[step]\n', 'invalid TOML'),
+    ('[[phase]]\nstaged = true\n', "phase 1 is missing 'title'"),
+    ('[[phase]]\ntitle = "P"\n[[step]]\nname = "s"\n', "step 's' is missing 'phase'"),
+    ('[[phase]]\ntitle = "P"\n[[step]]\nname = "s"\nphase = 1\n[[step.ops]]\nop = "delete_line"\npath = "a"\n',
+     "delete_line is missing 'pattern'"),
+])
+def test_recipe_problems_are_usage_errors_naming_the_file(tmp_path, capsys, text, message):
+    recipe = tmp_path / 'recipe.toml'
+    if text is not None:
+        recipe.write_text(text)
+    with pytest.raises(SystemExit) as e:
+        main(['--root', str(tmp_path), '--recipe', str(recipe)])
+    assert e.value.code == 2
+    err = capsys.readouterr().err
+    assert str(recipe) in err and message in err
+
+PLAN_RECIPE = """
+[[phase]]
+title = "Edits"
+staged = true
+
+[[step]]
+name = "footer"
+phase = 1
+ops = [
+  { op = "replace_in_file", path = "src/a.jsx", pattern = "old", template = "new.txt" },
+  { op = "replace_in_file", path = "src/gone/b.jsx", pattern = "x", replacement = "y" },
+  { op = "write_file", path = "src/c.txt", content = "first\\n" },
+]
+
+[[step]]
+name = "cleanup"
+phase = 1
+ops = [
+  { op = "delete_line", path = "src/a.jsx", pattern = "^drop" },
+  { op = "delete_path", paths = ["src/gone"] },
+  { op = "write_file", path = "src/c.txt", content = "second\\n" },
+]
+"""
+
+def _plan_tree(tmp_path):
+    (tmp_path / 'recipe' / 'templates').mkdir(parents=True)
+    (tmp_path / 'recipe' / 'rebrand.toml').write_text(PLAN_RECIPE)
+    (tmp_path / 'recipe' / 'templates' / 'new.txt').write_text('new\\1\n')
+    (tmp_path / 'src' / 'gone').mkdir(parents=True)
+    (tmp_path / 'src' / 'a.jsx').write_text('old\ndrop\n')
+    (tmp_path / 'src' / 'gone' / 'b.jsx').write_text('x\n')
+    return str(tmp_path / 'recipe' / 'rebrand.toml')
+
+def test_plan_drops_redundant_edits_and_groups_them_by_file(tmp_path):
+    recipe = load_recipe(_plan_tree(tmp_path))
+    plan = Plan(recipe)
+    assert [(op.step.name, op.kind, op.path) for op, _ in plan.dropped] == [
+        ('footer', 'replace_in_file', 'src/gone/b.jsx'),
+        ('footer', 'write_file', 'src/c.txt'),
+    ]
+    assert [(op.kind, op.path) for op in plan.phases[0][1]] == [
+        ('replace_in_file', 'src/a.jsx'), ('delete_line', 'src/a.jsx'),
+        ('delete_path', 'src/gone'), ('write_file', 'src/c.txt'),
+    ]
+    plan.run(RebrandingTool(str(tmp_path)))
+    # Template bodies are literal replacement text
+    assert (tmp_path / 'src' / 'a.jsx').read_text() == 'new\\1\n'
+    assert (tmp_path / 'src' / 'c.txt').read_text() == 'second\n'
+    assert not (tmp_path / 'src' / 'gone').exists()
+
+@pytest.mark.parametrize('selection, steps', [
+    (['--only', 'footer'], ['footer']),
+    (['--only', '2,footer'], ['footer', 'cleanup']),
+    (['--skip', '1'], ['cleanup']),
+    (['--only', 'footer', '--only', 'cleanup', '--skip', 'cleanup'], ['footer']),
+])
+def test_cli_runs_only_the_selected_steps(tmp_path, capsys, selection, steps):
+    recipe = _plan_tree(tmp_path)
+    main(['--root', str(tmp_path), '--recipe', recipe, '--json'] + selection)
+    summary = json.loads(capsys.readouterr().out)
+    assert summary['steps'] == steps
+    assert (tmp_path / 'src' / 'gone').exists() == ('cleanup' not in steps)
+
+@pytest.mark.parametrize('args, message', [
+    (['--only', 'nope'], "unknown step 'nope'"),
+    (['--skip', '3'], "unknown step '3'"),
+    (['--patch', 'out.diff'], '--patch requires --dry-run'),
+    (['--dry-run', '--json'], '--json with --dry-run requires --patch FILE'),
+    (['--encoding', 'no-such-codec'], 'unknown encoding'),
+])
+def test_cli_reports_bad_selections_as_usage_errors(tmp_path, capsys, args, message):
+    recipe = _plan_tree(tmp_path)
+    with pytest.raises(SystemExit) as exc:
+        main(['--root', str(tmp_path), '--recipe', recipe] + args)
+    assert exc.value.code == 2
+    assert message in capsys.readouterr().err
+    assert (tmp_path / 'src' / 'a.jsx').read_text() == 'old\ndrop\n'
+
+def test_scheduler_orders_conflicting_steps_and_overlaps_the_rest():
+    order = []
+    independent_ran = threading.Event()
+
+    def task(label, wait=None, signal=None):
+        def run():
+            if wait is not None:
+                assert wait.wait(5), f"{label} never overlapped with an independent step"
+            order.append(label)
+            if signal is not None:
+                signal.set()
+        return run
+
+    scheduler = StepScheduler()
+    # header only finishes once footer has run, so they must run concurrently
+    scheduler.add('header', (), ['src/a.jsx'], task('header', wait=independent_ran))
+    scheduler.add('footer', (), ['src/b.jsx'], task('footer', signal=independent_ran))
+    scheduler.add('index', ['src'], ['src/index.json'], task('index'))
+    scheduler.add('header-2', (), ['src/a.jsx'], task('header-2'))
+    assert scheduler.deps == [set(), set(), {0, 1}, {0, 2}]
+    scheduler.run(2)
+    assert order[:2] == ['footer', 'header']
+    assert order.index('header-2') > order.index('index')
+    scheduler.durations = [3.0, 1.0, 1.0, 0.5]
+    assert scheduler.critical_path() == (['header', 'index', 'header-2'], 4.5)
+
+def test_profiler_charges_counters_to_every_open_span(tmp_path):
+    profiler = Profiler()
+    with profiler.span('Phase', 'phase'):
+        with profiler.span('replace_in_file', step='footer'):
+            profiler.count(bytes_read=10, bytes_written=4, matches=2, path='a.jsx')
+        with profiler.span('replace_in_file', step='footer'):
+            profiler.count(bytes_read=5, path='b.jsx')
+    rows = {(row['category'], row['name']): row for row in profiler.hotspots()}
+    op, phase = rows['op', 'replace_in_file'], rows['phase', 'Phase']
+    assert (op['calls'], op['bytes_read'], op['bytes_written'], op['matches'], op['files']) == (2, 15, 4, 2, 2)
+    assert (phase['calls'], phase['bytes_read'], phase['files']) == (1, 15, 2)
+    assert phase['seconds'] >= op['seconds']
+
+    profiler.write_json(tmp_path / 'profile.json')
+    profiler.write_trace(tmp_path / 'trace.json')
+    spans = json.loads((tmp_path / 'profile.json').read_text())['spans']
+    assert [s['name'] for s in spans] == ['Phase', 'replace_in_file', 'replace_in_file']
+    events = json.loads((tmp_path / 'trace.json').read_text())['traceEvents']
+    assert [(e['name'], e['ph'], e['args']['files']) for e in events] == [
+        ('Phase', 'X', 2), ('replace_in_file', 'X', 1), ('replace_in_file', 'X', 1)]
+
+def test_staged_operations_are_profiled_when_flushed(tmp_path):
+    (tmp_path / 'a.jsx').write_text('emerald\n')
+    tool = RebrandingTool(str(tmp_path))
+    tool.replace_in_file('a.jsx', 'emerald', 'red')
+    tool.stage()
+    tool.delete_line('a.jsx', '^red')
+    tool.flush()
+    rows = {(row['name'], row['step']): row for row in tool.profiler.hotspots()}
+    assert rows['replace_in_file', None]['matches'] == 1
+    assert rows['delete_line', None]['files'] == 1
+    assert rows['staged edits', 'staged edits']['matches'] == 1
+    assert rows['flush', None]['files'] == 1
+
+def test_write_batch_renames_deferred_writes_only_on_commit(tmp_path):
+    (tmp_path / 'a.txt').write_text('old\n')
+    (tmp_path / 'a.txt').chmod(0o600)
+    batch = WriteBatch()
+    batch.write(tmp_path / 'a.txt', b'new\n', defer=True)
+    batch.write(tmp_path / 'b.txt', 'created\n', defer=True)
+    assert (tmp_path / 'a.txt').read_text() == 'old\n'
+    assert not (tmp_path / 'b.txt').exists()
+    batch.commit()
+    assert (tmp_path / 'a.txt').read_text() == 'new\n'
+    assert (tmp_path / 'a.txt').stat().st_mode & 0o777 == 0o600
+    assert (tmp_path / 'b.txt').read_text() == 'created\n'
+    batch.sync()
+    batch.sync()
+    assert batch.barriers == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['a.txt', 'b.txt']
+
+def test_write_batch_discard_and_failed_writes_leave_no_temp_files(tmp_path):
+    (tmp_path / 'a.txt').write_text('old\n')
+    batch = WriteBatch(durable=False)
+    batch.write(tmp_path / 'a.txt', b'new\n', defer=True)
+    batch.discard()
+    batch.commit()
+    with pytest.raises(TypeError):
+        batch.write(tmp_path / 'a.txt', 42)
+    assert (tmp_path / 'a.txt').read_text() == 'old\n'
+    assert [p.name for p in tmp_path.iterdir()] == ['a.txt']
+
+def test_failing_flush_write_discards_every_staged_temp_file(tmp_path, monkeypatch):
+    for name in ('a.txt', 'b.txt'):
+        (tmp_path / name).write_text('emerald\n')
+    tool = RebrandingTool(str(tmp_path))
+    tool.stage()
+    tool.replace_in_file('a.txt', 'emerald', 'red')
+    tool.replace_in_file('b.txt', 'emerald', 'red')
+    write = WriteBatch.write
+
+    def fail_second(self, path, *args, **kwargs):
+        if self.pending:
+            raise OSError(28, 'No space left on device')
+        return write(self, path, *args, **kwargs)
+
+    monkeypatch.setattr(WriteBatch, 'write', fail_second)
+    with pytest.raises(OSError):
+        tool.flush()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['a.txt', 'b.txt']
+    assert (tmp_path / 'a.txt').read_text() == 'emerald\n'
+
+@pytest.mark.parametrize('staged', [False, True])
+def test_write_file_skips_identical_content_and_can_keep_mtimes(tmp_path, staged):
+    for name in ('same.txt', 'kept.txt', 'touched.txt'):
+        (tmp_path / name).write_text('old\n')
+        os.utime(tmp_path / name, ns=(1_000_000_000, 1_000_000_000))
+    before = (tmp_path / 'same.txt').stat()
+    tool = RebrandingTool(str(tmp_path))
+    if staged:
+        tool.stage()
+    tool.write_file('same.txt', 'old\n')
+    tool.write_file('kept.txt', 'new\n', preserve_times=True)
+    tool.write_file('touched.txt', 'new\n')
+    tool.flush()
+    after = (tmp_path / 'same.txt').stat()
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+    assert (tmp_path / 'kept.txt').read_text() == 'new\n'
+    assert (tmp_path / 'kept.txt').stat().st_mtime_ns == 1_000_000_000
+    assert (tmp_path / 'touched.txt').stat().st_mtime_ns > 1_000_000_000
+
+@pytest.mark.parametrize('trash', [False, True])
+def test_delete_paths_removes_each_tree_once_and_never_follows_links(tmp_path, capsys, trash):
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    (outside / 'keep.txt').write_text('keep\n')
+    root = tmp_path / 'root'
+    for d in ('app/a/deep', 'app/b', 'other'):
+        (root / d).mkdir(parents=True)
+    for f in ('app/a/deep/1.mdx', 'app/b/2.mdx', 'app/top.mdx', 'other/3.mdx', 'single.txt'):
+        (root / f).write_text('x\n')
+    (root / 'app' / 'link').symlink_to(outside, target_is_directory=True)
+    (root / 'linked').symlink_to(outside, target_is_directory=True)
+    tool = RebrandingTool(str(root), trash=trash)
+    tool.delete_paths(['app/a', 'app', 'missing', 'single.txt', 'linked', 'app/b/2.mdx'])
+    for thread in tool.reclaiming:
+        thread.join()
+    out = capsys.readouterr().out
+    assert sorted(p.relative_to(root).as_posix() for p in root.rglob('*')
+                  if not p.relative_to(root).as_posix().startswith('.rebrand')) == ['other', 'other/3.mdx']
+    assert (outside / 'keep.txt').read_text() == 'keep\n'
+    assert 'Deleted missing' not in out
+    assert out.count('Deleted app\n') == 1
+    if trash:
+        assert list((root / '.rebrand' / 'trash').iterdir()) == []
+
+def test_dry_run_patch_applies_to_the_same_tree_a_real_run_leaves(tmp_path):
+    source = tmp_path / 'source'
+    for name, data in {
+        'a.jsx': b'emerald\r\nkeep\r\n', 'no-eol.md': b'emerald', 'latin.css': b'emerald \xe9\n',
+        'bin.json': b'\x00\x01emerald\x02', 'gone/page.mdx': b'old\n', 'gone/deep/x.md': b'x\n',
+        'same.txt': b'same\n',
+    }.items():
+        (source / name).parent.mkdir(parents=True, exist_ok=True)
+        (source / name).write_bytes(data)
+    trees = {}
+    for mode in ('real', 'dry'):
+        shutil.copytree(source, tmp_path / mode)
+        tool = RebrandingTool(str(tmp_path / mode), dry_run=mode == 'dry')
+        tool.stage()
+        tool.replace_global('emerald', 'red')
+        tool.delete_line('a.jsx', '^keep')
+        tool.delete_path('gone')
+        tool.write_file('new/page.mdx', 'new\n')
+        tool.write_file('same.txt', 'same\n')
+        if mode == 'dry':
+            patch = ''.join(tool.diff())
+            assert 'same.txt' not in patch
+            assert (tmp_path / mode / 'a.jsx').read_bytes() == b'emerald\r\nkeep\r\n'
+            subprocess.run(['git', 'apply', '--binary', '-'], cwd=tmp_path / mode, input=patch.encode(),
+                           check=True)
+        else:
+            tool.flush()
+        trees[mode] = {p.relative_to(tmp_path / mode): p.read_bytes()
+                       for p in (tmp_path / mode).rglob('*') if p.is_file() and '.rebrand' not in p.parts}
+    assert trees['dry'] == trees['real']
+    assert (tmp_path / 'dry' / 'a.jsx').read_bytes() == b'red\n'
+    assert not (tmp_path / 'dry' / 'gone').exists()
+
+def test_ensure_imports_leaves_files_with_unparsable_imports_alone(tmp_path, capsys):
+    text = "import {\n  a, // keep\n} from 'x'\n"
+    (tmp_path / 'a.jsx').write_text(text)
+    (tmp_path / 'b.jsx').write_text("import { a } from 'x'\n")
+    tool = RebrandingTool(str(tmp_path))
+    tool.ensure_imports('a.jsx', {'x': 'b'})
+    tool.ensure_imports('b.jsx', {'x': ['a', 'b'], 'y': 'default as Y'})
+    tool.ensure_imports('b.jsx', {'x': ['a', 'b'], 'y': 'default as Y'})
+    out = capsys.readouterr().out
+    assert (tmp_path / 'a.jsx').read_text() == text
+    assert "Warning: Skipping a.jsx - cannot parse its import of x." in out
+    assert (tmp_path / 'b.jsx').read_text() == "import { a, b } from 'x'\nimport Y from 'y'\n"
+    assert 'Skipping b.jsx - imports already present.' in out
+
+@pytest.mark.parametrize('encoding, data, expected', [
+    ('utf-8', b'caf\xc3\xa9 emerald \xff\xfe\n', b'caf\xc3\xa9 ruby \xff\xfe\n'),
+    ('latin-1', 'émerald émeraude\n'.encode('latin-1'), 'rubis émeraude\n'.encode('latin-1')),
+    ('utf-16', 'émerald\n'.encode('utf-16'), 'rubis\n'.encode('utf-16')),
+])
+@pytest.mark.parametrize('staged', [False, True])
+def test_edits_keep_bytes_they_do_not_touch(tmp_path, encoding, data, expected, staged):
+    (tmp_path / 'a.md').write_bytes(data)
+    (tmp_path / 'b.md').write_bytes(data)
+    tool = RebrandingTool(str(tmp_path), encoding=encoding)
+    if staged:
+        tool.stage()
+    replacements = {'emerald': 'ruby'} if encoding == 'utf-8' else {'émerald': 'rubis'}
+    tool.replace_global_many(replacements, excludes=['b.md'])
+    (search, replace), = replacements.items()
+    tool.replace_in_file('b.md', search, replace)
+    tool.flush()
+    assert (tmp_path / 'a.md').read_bytes() == expected
+    assert (tmp_path / 'b.md').read_bytes() == expected
+
+def test_unknown_newline_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='unknown newline policy'):
+        RebrandingTool(str(tmp_path), newline='cr')
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_index_articles_writes_one_index_per_section(tmp_path, jobs):
+    pages = {
+        'src/app/page.mdx': '# Home\n',
+        'src/app/devops/a/page.mdx': '# Alpha\n\nFirst paragraph.\n',
+        'src/app/devops/b/page.mdx': '# Beta\n\nNo dates for this one.\n',
+        'src/app/devops/c/deep/page.mdx': '# Deep\n\nNested.\n',
+    }
+    dates = {}
+    for name, text in pages.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(text)
+        dates[name] = ['2024-01-01', '2024-03-01', _git_blob_id(text.encode())]
+    del dates['src/app/devops/b/page.mdx']
+    (tmp_path / 'dates.json').write_text(json.dumps(dates))
+    RebrandingTool(str(tmp_path), jobs=jobs).index_articles('src/app', dates='dates.json')
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob('articles.json')) == [
+        'src/app/devops/articles.json', 'src/app/devops/c/articles.json']
+    index = json.loads((tmp_path / 'src/app/devops/articles.json').read_text())
+    assert index['version'] == 2
+    assert index['pages']['a/page.mdx'] == {
+        'blob': dates['src/app/devops/a/page.mdx'][2],
+        'article': {'slug': 'a', 'title': 'Alpha', 'description': 'First paragraph.', 'date': '2024-03-01',
+                    'dateCreated': '2024-01-01', 'dateModified': '2024-03-01'},
+    }
+    assert index['pages']['b/page.mdx'] == {'blob': _git_blob_id(pages['src/app/devops/b/page.mdx'].encode()),
+                                            'article': None}
+    assert index['pages']['c/deep/page.mdx']['article']['slug'] == 'c/deep'
+    nested = json.loads((tmp_path / 'src/app/devops/c/articles.json').read_text())
+    assert nested['pages']['deep/page.mdx']['article']['slug'] == 'deep'
+
+def _git(root, *args, date=None):
+    env = dict(os.environ, GIT_AUTHOR_NAME='a', GIT_AUTHOR_EMAIL='a@example.com', GIT_COMMITTER_NAME='a',
+               GIT_COMMITTER_EMAIL='a@example.com')
+    if date is not None:
+        env['GIT_AUTHOR_DATE'] = env['GIT_COMMITTER_DATE'] = date
+    subprocess.run(['git', *args], cwd=root, env=env, check=True, capture_output=True)
+
+def test_index_dates_reads_first_and_last_commit_of_tracked_pages(tmp_path, capsys):
+    repo = tmp_path / 'repo'
+    (repo / 'src' / 'app' / 'a b').mkdir(parents=True)
+    _git(repo, 'init', '-q')
+    (repo / 'src/app/a b/page.mdx').write_text('one\n')
+    (repo / 'src/app/notes.txt').write_text('not an article\n')
+    _git(repo, 'add', '.')
+    _git(repo, 'commit', '-qm', 'first', date='2024-01-02T23:30:00+00:00')
+    (repo / 'src/app/a b/page.mdx').write_text('two\n')
+    (repo / 'src/app/new.mdx').write_text('new\n')
+    _git(repo, 'add', '.')
+    _git(repo, 'commit', '-qm', 'second', date='2024-02-03T01:00:00+02:00')
+    (repo / 'src/app/untracked.mdx').write_text('x\n')
+    tool = RebrandingTool(str(repo))
+    tool.index_dates('dates.json')
+    assert json.loads((repo / 'dates.json').read_text()) == {
+        'src/app/a b/page.mdx': ['2024-01-02', '2024-02-02', _git_blob_id(b'two\n')],
+        'src/app/new.mdx': ['2024-02-02', '2024-02-02', _git_blob_id(b'new\n')],
+    }
+
+    (tmp_path / 'plain').mkdir()
+    RebrandingTool(str(tmp_path / 'plain')).index_dates('dates.json')
+    assert 'is not a git checkout; dates.json not written' in capsys.readouterr().out
+    assert not (tmp_path / 'plain' / 'dates.json').exists()
+
+def test_page_sections_follow_headings_and_skip_code_and_esm():
+    text = ("---\ntitle: x\n---\nimport { A } from 'a'\nexport const m = 1\n\n"
+            "# Install *HAProxy*\n\nIntro text.\n\n```sh\n# not a heading\n```\n\n"
+            "## Setup\n\n- first\n- second\n\n### Details\n\n<Note>\n\n| a | b |\n\n## Setup\n")
+    assert _page_sections(text) == [
+        ['Install HAProxy', None, ['Intro text.']],
+        ['Setup', 'setup', ['first', 'second', 'Details']],
+        ['Setup', 'setup-2', []],
+    ]
+
+def test_index_search_shards_pages_by_section_and_caches_them(tmp_path, capsys):
+    pages = {
+        'src/app/page.mdx': '# Home\n\n## Start\n\nWelcome.\n',
+        'src/app/linux/a/page.mdx': '# A\n\n## Kernel\n\nText.\n',
+        'src/app/linux/b/page.mdx': '# B\n\n## Привет\n',
+        'src/app/devops/page.mdx': '# DevOps\n',
+    }
+    for name, text in pages.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(text)
+
+    def run():
+        RebrandingTool(str(tmp_path), incremental=True).index_search('search', 'src/app')
+        return capsys.readouterr().out
+
+    assert 'Indexed search sections of 4 page(s) (0 cached)' in run()
+    manifest = json.loads((tmp_path / 'search' / 'manifest.json').read_text())
+    assert manifest['version'] == 3
+    assert sorted(manifest['shards']) == ['devops', 'index', 'linux']
+    assert manifest['shards']['linux']['pages'] == {
+        'linux/a/page.mdx': _git_blob_id(pages['src/app/linux/a/page.mdx'].encode()),
+        'linux/b/page.mdx': None,
+    }
+    assert json.loads((tmp_path / 'search' / 'linux.json').read_text()) == [
+        {'url': '/linux/a', 'sections': [['A', None, []], ['Kernel', 'kernel', ['Text.']]]},
+        {'url': '/linux/b', 'sections': []},
+    ]
+    assert json.loads((tmp_path / 'search' / 'index.json').read_text())[0]['url'] == '/'
+
+    (tmp_path / 'src/app/linux/a/page.mdx').write_text('# A\n\n## Modules\n')
+    assert 'Indexed search sections of 4 page(s) (3 cached)' in run()
+    shard = json.loads((tmp_path / 'search' / 'linux.json').read_text())
+    assert shard[0]['sections'][1] == ['Modules', 'modules', []]
+    hash_ = json.loads((tmp_path / 'search' / 'manifest.json').read_text())['shards']['linux']['hash']
+    assert hash_ != manifest['shards']['linux']['hash']